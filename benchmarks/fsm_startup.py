@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""FSM startup benchmark — launcher + cached engine vs. monolithic script.
+
+Before: .beads/bin/fsm.py held the whole engine and ran as __main__, so
+every call recompiled it. After: the launcher imports beads.fsm from
+.beads/lib/, whose bytecode is cached in __pycache__/.
+
+Usage:
+    python benchmarks/fsm_startup.py [--runs 50]
+
+Builds a throwaway project in a temp dir, then times `fsm.py status`
+both ways and prints the per-call gain. The monolithic baseline is the
+last self-contained template fsm.py in git history, so this needs a git
+checkout of the repository.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+TEMPLATE_FSM = "src/beads/templates/project_init/.beads/bin/fsm.py"
+MONOLITH_MIN_LINES = 500  # the launcher is a few lines; the monolith held the whole engine
+
+from beads.sync import sync_project  # noqa: E402
+
+
+def _time_call(argv: list[str], cwd: Path) -> float:
+    """Wall-clock milliseconds for one invocation."""
+    start = time.perf_counter()
+    subprocess.run(argv, cwd=cwd, check=True, capture_output=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def _monolith_source() -> str:
+    """The newest template fsm.py that still held the whole engine."""
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, check=True, capture_output=True, text=True
+        ).stdout
+
+    for rev in git("log", "--format=%H", "--", TEMPLATE_FSM).split():
+        try:
+            source = git("show", f"{rev}:{TEMPLATE_FSM}")
+        except subprocess.CalledProcessError:
+            continue
+        if source.count("\n") >= MONOLITH_MIN_LINES:
+            return source
+    sys.exit("No monolithic fsm.py found in git history")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="beads-bench-") as tmp:
+        project = Path(tmp)
+        (project / ".beads").mkdir()
+        (project / ".beads" / "ledger.json").write_text(json.dumps({"beads": {}}))
+        sync_project(project)
+
+        # Monolithic baseline: the pre-split engine run directly as a script (never cached)
+        monolith = project / "fsm_monolith.py"
+        monolith.write_text(_monolith_source())
+
+        launcher = [sys.executable, ".beads/bin/fsm.py", "status"]
+        script = [sys.executable, str(monolith), "status"]
+
+        # Interleaved so machine noise hits both variants alike
+        cached, uncached = [], []
+        for _ in range(args.runs):
+            cached.append(_time_call(launcher, project))
+            uncached.append(_time_call(script, project))
+
+    cached_ms, uncached_ms = statistics.median(cached), statistics.median(uncached)
+    print(f"runs per variant:        {args.runs}")
+    print(f"monolithic script:       {uncached_ms:7.2f} ms (median)")
+    print(f"launcher + cached .pyc:  {cached_ms:7.2f} ms (median)")
+    print(f"gain per call:           {uncached_ms - cached_ms:7.2f} ms "
+          f"({(uncached_ms - cached_ms) / uncached_ms:.0%})")
+
+
+if __name__ == "__main__":
+    main()
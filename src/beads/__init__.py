@@ -4,6 +4,7 @@ __version__ = "1.1.0"
 __author__ = "Beads Contributors"
 __license__ = "MIT"
 
+from .engine import BeadsError, Engine
 from .fsm import BeadFSM, FSMContext, State
 
-__all__ = ["BeadFSM", "FSMContext", "State", "__version__"]
+__all__ = ["BeadFSM", "BeadsError", "Engine", "FSMContext", "State", "__version__"]
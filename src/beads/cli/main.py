@@ -5,6 +5,7 @@ Claude Beads CLI
 Commands:
   beads init    Initialize Beads in current project
   beads status  Show project status
+  beads hooks   Hook latency telemetry (enable, disable, stats)
   beads help    Show help and workflow guide
 """
 
@@ -42,7 +43,9 @@ def cli():
 @click.option('--vision', prompt='What is this project? (describe it fully — what it does, who it\'s for, why it matters)', help='Full project description')
 @click.option('--goals', prompt='What does "done" look like? (end goal / MVP target)', help='Success criteria and deliverables')
 @click.option('--yes', '-y', is_flag=True, default=False, help='Skip confirmation prompts (for non-interactive use)')
-def init(project_name: str, vision: str, goals: str, yes: bool):
+@click.option('--link', is_flag=True, default=False,
+              help='Link framework files to the shared install instead of copying')
+def init(project_name: str, vision: str, goals: str, yes: bool, link: bool):
     """Initialize Beads framework in current directory."""
     from beads.init import initialize_project
 
@@ -61,7 +64,7 @@ def init(project_name: str, vision: str, goals: str, yes: bool):
     ))
 
     try:
-        initialize_project(project_root, project_name, vision, goals)
+        initialize_project(project_root, project_name, vision, goals, link=link)
         console.print("\n[green]✅ Beads initialized successfully![/green]")
         console.print("\n[bold]Next steps:[/bold]")
         console.print("  1. Run [cyan]claude[/cyan] to open Claude Code in this directory")
@@ -151,16 +154,45 @@ def ui(port: int, no_browser: bool):
 
 
 @cli.command()
-def sync():
+@click.option('--fleet', 'fleet_root',
+              type=click.Path(exists=True, file_okay=False, path_type=Path),
+              help='Sync every Beads project found under this directory')
+@click.option('--fleet-manifest', type=click.Path(exists=True, dir_okay=False, path_type=Path),
+              help='Sync the projects listed in this file (one path per line)')
+@click.option('--jobs', '-j', default=8, show_default=True, help='Projects synced concurrently')
+@click.option('--dry-run', is_flag=True, default=False,
+              help='Report what would change without writing')
+@click.option('--link/--copy', default=None,
+              help='Link framework files to the shared install, or copy them '
+                   '(default: keep current mode)')
+def sync(fleet_root: Path | None, fleet_manifest: Path | None, jobs: int, dry_run: bool,
+         link: bool | None):
     """Sync framework files (hooks, FSM, settings) to current project."""
-    from beads.sync import sync_project
+    from beads.sync import sync_project, preview_sync
 
     _warn_if_outdated()
+
+    if fleet_root or fleet_manifest:
+        _sync_fleet(fleet_root, fleet_manifest, jobs, dry_run, link)
+        return
+
     project_root = Path.cwd()
     _verify_initialized(project_root)
 
     try:
-        updated = sync_project(project_root)
+        if dry_run:
+            changes = preview_sync(project_root, link=link)
+            if changes:
+                console.print(f"\n[yellow]Would sync {len(changes)} file(s):[/yellow]")
+                for f, (added, removed) in changes.items():
+                    console.print(
+                        f"  [cyan]{f}[/cyan] [green]+{added}[/green] [red]-{removed}[/red]"
+                    )
+            else:
+                console.print("[green]✅ Already up to date[/green]")
+            return
+
+        updated = sync_project(project_root, link=link)
         if updated:
             console.print(f"\n[green]✅ Synced {len(updated)} file(s):[/green]")
             for f in updated:
@@ -172,6 +204,118 @@ def sync():
         raise click.Abort()
 
 
+def _sync_fleet(
+    fleet_root: Path | None,
+    fleet_manifest: Path | None,
+    jobs: int,
+    dry_run: bool,
+    link: bool | None,
+):
+    """Sync many projects concurrently and print one consolidated report."""
+    import sys
+    from rich.table import Table
+    from beads.sync import discover_projects, load_fleet_manifest, sync_fleet
+
+    projects: list[Path] = []
+    if fleet_root:
+        projects += discover_projects(fleet_root)
+    if fleet_manifest:
+        projects += load_fleet_manifest(fleet_manifest)
+    projects = sorted({p.resolve() for p in projects})
+
+    if not projects:
+        console.print("[yellow]⚠️  No Beads projects found[/yellow]")
+        return
+
+    verb = 'Previewing' if dry_run else 'Syncing'
+    console.print(f"{verb} {len(projects)} project(s) with {jobs} worker(s)...")
+    results = sync_fleet(projects, jobs=jobs, dry_run=dry_run, link=link)
+
+    table = Table(title="Fleet sync (dry run)" if dry_run else "Fleet sync")
+    table.add_column("Project", style="cyan")
+    table.add_column("Result")
+    table.add_column("Files")
+    for r in results:
+        if r.error:
+            table.add_row(str(r.project), "[red]failed[/red]", r.error)
+        elif not r.updated:
+            table.add_row(str(r.project), "[green]up to date[/green]", "")
+        elif dry_run:
+            files = "\n".join(f"{f} +{a} -{d}" for f, (a, d) in r.diffstat.items())
+            table.add_row(str(r.project), "[yellow]would change[/yellow]", files)
+        else:
+            table.add_row(str(r.project), "[green]synced[/green]", "\n".join(r.updated))
+    console.print(table)
+
+    failed = [r for r in results if r.error]
+    changed = sum(1 for r in results if r.updated)
+    console.print(
+        f"\n{len(results)} project(s): {changed} {'to change' if dry_run else 'updated'}, "
+        f"{len(failed)} failed"
+    )
+    if failed:
+        sys.exit(1)
+
+
+@cli.group()
+def hooks():
+    """State Guard hook telemetry."""
+    pass
+
+
+@hooks.command(name='stats')
+def hooks_stats():
+    """Show hook latency percentiles per hook and tool."""
+    from rich.table import Table
+    from beads.telemetry import load_records, summarize, TELEMETRY_DIR, HOOKS_LOG
+
+    project_root = Path.cwd()
+    _verify_initialized(project_root)
+
+    rows = summarize(load_records(project_root))
+    if not rows:
+        console.print(f"[yellow]No hook records in {TELEMETRY_DIR / HOOKS_LOG}[/yellow]")
+        console.print("\nEnable recording: [cyan]beads hooks enable[/cyan]")
+        return
+
+    table = Table(title="Hook latency (µs)")
+    table.add_column("Hook", style="cyan")
+    table.add_column("Tool")
+    table.add_column("Calls", justify="right")
+    table.add_column("Denied", justify="right")
+    for col in ("p50", "p95", "p99"):
+        table.add_column(col, justify="right")
+    for row in rows:
+        table.add_row(
+            row["hook"], row["tool"], str(row["count"]), str(row["denied"]),
+            *(f"{row[col]:,.0f}" for col in ("p50", "p95", "p99")),
+        )
+    console.print(table)
+
+
+@hooks.command(name='enable')
+def hooks_enable():
+    """Start recording hook decisions to .beads/telemetry/hooks.jsonl."""
+    from beads.telemetry import TELEMETRY_DIR
+
+    project_root = Path.cwd()
+    _verify_initialized(project_root)
+    (project_root / TELEMETRY_DIR).mkdir(parents=True, exist_ok=True)
+    console.print(f"[green]✅ Hook telemetry enabled ({TELEMETRY_DIR})[/green]")
+
+
+@hooks.command(name='disable')
+def hooks_disable():
+    """Stop recording hook decisions (existing logs are removed)."""
+    import shutil
+    from beads.telemetry import TELEMETRY_DIR
+
+    project_root = Path.cwd()
+    _verify_initialized(project_root)
+    shutil.rmtree(project_root / TELEMETRY_DIR, ignore_errors=True)
+    console.print("[green]✅ Hook telemetry disabled[/green]")
+
+
 @cli.command(name='help')
 def show_help():
     """Show available commands and workflow guide."""
@@ -198,8 +342,11 @@ def show_help():
 
 - `beads init` - Initialize framework in current project
 - `beads sync` - Sync latest hooks/FSM/skills to current project
+- `beads sync --fleet <dir>` - Sync every Beads project under a directory in parallel
+- `beads init --link` / `beads sync --link` - Symlink framework files to ~/.claude/beads
 - `beads update` - Upgrade package + sync framework files
 - `beads status` - Show project status and active bead
+- `beads hooks stats` - Hook latency p50/p95/p99 (after `beads hooks enable`)
 - `beads help` - Show this help
 
 ## Claude Commands (in Claude Code)
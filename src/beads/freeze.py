@@ -0,0 +1,151 @@
+"""
+Frozen phases.
+
+close-phase freezes the phase's planning tree: a manifest lists every
+bead (title, final status, depends_on, content hash) and every file's
+hash, the directory is added to a managed .claudeignore block, and
+optionally the tree is packed into one archive and removed:
+
+    .beads/frozen/phase-01.json      manifest
+    .beads/frozen/phase-01.tar.gz    archive (close-phase --archive)
+
+Scanners (scheduler, dashboard, validators) answer frozen phases from the
+manifest and never walk .planning/phases/01-*/ again.
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from beads.locking import atomic_write_text
+from beads.scheduler import parse_depends_on
+
+FROZEN_DIR = Path(".beads/frozen")
+PLANNING_DIR = Path(".planning/phases")
+CLAUDEIGNORE = Path(".claudeignore")
+
+_IGNORE_BEGIN = "# >>> beads: frozen phases (managed by fsm.py close-phase) >>>"
+_IGNORE_END = "# <<< beads: frozen phases <<<"
+
+_BEAD_ID = re.compile(r'(\d{2}-\d{2})')
+_TITLE = re.compile(r'^#[ \t]+Bead[ \t]+[\w-]+:[ \t]+(.+)', re.MULTILINE)
+
+
+def manifest_path(root: Path, phase: str) -> Path:
+    return root / FROZEN_DIR / f"phase-{phase}.json"
+
+
+def frozen_manifests(root: Path) -> dict[str, dict]:
+    """phase -> manifest for every frozen phase (unreadable manifests are skipped)."""
+    manifests: dict[str, dict] = {}
+    frozen_dir = root / FROZEN_DIR
+    if not frozen_dir.is_dir():
+        return manifests
+    for path in sorted(frozen_dir.glob("phase-*.json")):
+        try:
+            manifest = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            continue
+        if manifest.get("phase"):
+            manifests[manifest["phase"]] = manifest
+    return manifests
+
+
+def frozen_dir_names(manifests: dict[str, dict]) -> set[str]:
+    """Planning directory names (e.g. 01-poc) covered by manifests."""
+    return {m["name"] for m in manifests.values() if m.get("name")}
+
+
+def freeze_phase(
+    root: Path,
+    phase: str,
+    statuses: dict[str, Optional[str]],
+    archive: bool = False,
+) -> dict:
+    """
+    Write the phase's manifest, refresh .claudeignore and optionally archive
+    the planning tree. Returns the manifest. Raises FileNotFoundError when
+    the phase has no planning directory.
+    """
+    import hashlib  # close-phase only; keeps scanner imports light
+    import shutil
+    import tarfile
+
+    phase_dir = next(
+        (d for d in sorted((root / PLANNING_DIR).glob(f"{phase}-*")) if d.is_dir()), None
+    )
+    existing = frozen_manifests(root).get(phase)
+    if phase_dir is None:
+        if existing:
+            return existing  # already frozen and archived
+        raise FileNotFoundError(f"No planning directory for phase {phase}")
+
+    rel_dir = phase_dir.relative_to(root)
+    files, beads = {}, {}
+    for path in sorted(p for p in phase_dir.rglob("*") if p.is_file()):
+        rel = str(path.relative_to(root))
+        files[rel] = hashlib.sha256(path.read_bytes()).hexdigest()
+        match = _BEAD_ID.match(path.stem)
+        if path.parent.name == "beads" and path.suffix == ".md" and match:
+            content = path.read_text(errors="replace")
+            title = _TITLE.search(content)
+            bid = match.group(1)
+            beads[bid] = {
+                "title": title.group(1).strip() if title else None,
+                "status": statuses.get(bid),
+                "depends_on": [d for d in parse_depends_on(content) if d != bid],
+                "file": rel,
+                "sha256": files[rel],
+            }
+
+    manifest = {
+        "_warning": "Frozen phase — managed by fsm.py close-phase, never edited",
+        "phase": phase,
+        "name": phase_dir.name,
+        "dir": str(rel_dir),
+        "frozen_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "beads": beads,
+        "files": files,
+        "archive": None,
+    }
+
+    if archive:
+        archive_path = root / FROZEN_DIR / f"phase-{phase}.tar.gz"
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = archive_path.with_name(f".{archive_path.name}.{os.getpid()}.tmp")
+        with tarfile.open(tmp, "w:gz") as tar:
+            tar.add(phase_dir, arcname=str(rel_dir))
+        os.replace(tmp, archive_path)
+        manifest["archive"] = str(archive_path.relative_to(root))
+
+    path = manifest_path(root, phase)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(manifest, indent=2))
+    if archive:
+        shutil.rmtree(phase_dir)  # only once the manifest points at the archive
+    update_claudeignore(root)
+    return manifest
+
+
+def update_claudeignore(root: Path) -> None:
+    """Rewrite the managed block of .claudeignore from the frozen manifests."""
+    entries = []
+    for manifest in frozen_manifests(root).values():
+        entries.append(f"{manifest['dir']}/")
+        if manifest.get("archive"):
+            entries.append(manifest["archive"])
+    block = "\n".join([_IGNORE_BEGIN, *entries, _IGNORE_END]) + "\n"
+
+    path = root / CLAUDEIGNORE
+    content = path.read_text() if path.exists() else ""
+    pattern = re.compile(
+        re.escape(_IGNORE_BEGIN) + r".*?" + re.escape(_IGNORE_END) + r"\n?", re.DOTALL
+    )
+    if pattern.search(content):
+        content = pattern.sub(lambda _: block, content)
+    else:
+        content = (content.rstrip("\n") + "\n\n" if content.strip() else "") + block
+    atomic_write_text(path, content)
@@ -8,256 +8,219 @@ States: DRAFT -> EXECUTE -> VERIFY -> COMPLETE/FAILED
 Core responsibilities:
   - Track active bead
   - Enforce verification before completion
-  - Auto-queue next pending bead
+  - Auto-queue next ready bead (dependency DAG, critical path first)
   - Circuit breaker retry strategy
 
+The state machine lives in beads.engine (importable, no printing);
+this module is the command-line front end the .beads/bin launcher runs.
+
 Usage:
     python fsm.py init <bead_id> [--active-model MODEL] [--bead PATH]
     python fsm.py transition <state>
-    python fsm.py verify <verification_cmd>
+    python fsm.py verify [<verification_cmd> | --check NAME=CMD ...] [--timeout SECONDS]
+                         [--shards N|auto] [--background | --watch]
+    python fsm.py jobs
+    python fsm.py wait <job_id> [--timeout SECONDS]
+    python fsm.py verify-all [--phase XX] [--jobs N] [--timeout SECONDS] [--flag]
     python fsm.py rollback
     python fsm.py status
+    python fsm.py ready
+    python fsm.py run-parallel [<phase-num>] [--jobs N] [--agent CMD]
     python fsm.py sync-ledger
+    python fsm.py ledger-backend [json|sqlite]
+    python fsm.py history <bead_id>
+    python fsm.py close-phase <phase-num> [--archive]
+    python fsm.py check-phase-closed <phase-num>
+    python fsm.py validate-project
 """
 
-import json
-import re
-import subprocess
+import os
 import sys
-from dataclasses import dataclass, asdict
-from enum import Enum
 from pathlib import Path
 from typing import Optional
 
-
-class State(Enum):
-    """FSM states for bead execution."""
-    DRAFT = "draft"
-    EXECUTE = "execute"
-    VERIFY = "verify"
-    RECOVER = "recover"
-    COMPLETE = "complete"
-    FAILED = "failed"
-
-
-@dataclass
-class FSMContext:
-    """Persistent FSM state."""
-    bead_id: str
-    current_state: str
-    retry_count: int
-    initial_commit_sha: str
-    verification_cmd: Optional[str] = None
-    model: Optional[str] = None
-    last_verification_passed: bool = False
-    bead_type: str = "implementation"  # "implementation" or "spike"
-    verification_tier: str = "AUTO"  # "AUTO" | "MANUAL" | "NONE"
-    bead_path: Optional[str] = None
-
-    def to_dict(self) -> dict:
-        return asdict(self)
-
-    @classmethod
-    def from_dict(cls, data: dict) -> 'FSMContext':
-        filtered_data = {k: v for k, v in data.items() if not k.startswith('_')}
-        if 'model' not in filtered_data:
-            filtered_data['model'] = None
-        if 'last_verification_passed' not in filtered_data:
-            filtered_data['last_verification_passed'] = False
-        if 'bead_type' not in filtered_data:
-            filtered_data['bead_type'] = 'implementation'
-        if 'bead_path' not in filtered_data:
-            filtered_data['bead_path'] = None
-        if 'verification_tier' not in filtered_data:
-            # Auto-detect: spike beads default to NONE, others to AUTO
-            filtered_data['verification_tier'] = 'NONE' if filtered_data.get('bead_type') == 'spike' else 'AUTO'
-        return cls(**filtered_data)
+from beads.engine import (
+    CommitResult,
+    DependencyError,
+    Engine,
+    FSMContext,
+    GitError,
+    LedgerError,
+    ModelMismatchError,
+    NotInitializedError,
+    PhaseGuardError,
+    PhaseIncompleteError,
+    ProjectValidationError,
+    State,
+    TransitionResult,
+    VerificationCmd,
+    VerificationRequiredError,
+    SweepCommand,
+    VerifyResult,
+    model_family,
+)
+from beads.runner import DEFAULT_TIMEOUT
+from beads.results import TestSummary
+
+__all__ = ["BeadFSM", "FSMContext", "State", "main"]
 
 
 class BeadFSM:
-    """Finite State Machine for atomic bead execution."""
-
-    # Hardcoded defaults (no config file ceremony)
-    MAX_RETRIES = 3
-    STATE_FILE = Path(".beads/fsm-state.json")
-    LEDGER_FILE = Path(".beads/ledger.json")
-
-    def __init__(self):
-        self.context: Optional[FSMContext] = None
-        self._load_state()
-
-    def _load_state(self) -> None:
-        """Load FSM state from disk."""
-        if self.STATE_FILE.exists():
-            try:
-                data = json.loads(self.STATE_FILE.read_text())
-                self.context = FSMContext.from_dict(data)
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"⚠ State file corrupted: {e}")
-
-    def _save_state(self) -> None:
-        """Persist FSM state to disk."""
-        if self.context:
-            self.STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            state_dict = {
-                "_WARNING": "⚠️ NEVER MANUALLY EDIT - Managed by fsm.py only",
-                **self.context.to_dict()
-            }
-            self.STATE_FILE.write_text(json.dumps(state_dict, indent=2))
-
-    def _load_ledger(self) -> dict:
-        """Load ledger.json, return empty structure on missing/corrupt."""
-        if not self.LEDGER_FILE.exists():
-            return {}
-        try:
-            return json.loads(self.LEDGER_FILE.read_text())
-        except json.JSONDecodeError as e:
-            print(f"⚠ ledger.json corrupted: {e}")
-            return {}
-
-    def _save_ledger(self, data: dict) -> bool:
-        """Atomically save ledger.json (write tmp → rename)."""
-        import os
-        tmp = self.LEDGER_FILE.with_suffix(".json.tmp")
-        try:
-            tmp.write_text(json.dumps(data, indent=2))
-            os.rename(tmp, self.LEDGER_FILE)
-            return True
-        except OSError as e:
-            print(f"✗ Ledger write failed: {e}")
-            if tmp.exists():
-                tmp.unlink()
-            return False
-
-    def _get_current_commit_sha(self) -> str:
-        """Get current git HEAD commit SHA."""
-        result = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-
-    def _check_dependencies_simple(self, bead_path: str) -> bool:
-        """Verify depends_on beads are complete in ledger.json."""
-        bead_file = Path(bead_path)
-        if not bead_file.exists():
-            return True
-
-        content = bead_file.read_text()
-        depends_match = re.search(r'depends_on:\s*\[([^\]]*)\]', content, re.IGNORECASE)
-        if not depends_match:
-            return True
-
-        depends_str = depends_match.group(1).strip()
-        if not depends_str:
-            return True
-
-        dependencies = [d.strip().strip('"\'') for d in depends_str.split(',')]
-        if not self.LEDGER_FILE.exists():
-            print(f"⚠ Cannot validate dependencies - ledger not found")
-            return True
+    """
+    Printing front end for fsm.py.
 
-        data = self._load_ledger()
-        beads = data.get("beads", {})
-        incomplete = []
-        for dep in dependencies:
-            dep_id = '-'.join(dep.split('-')[:2])
-            bead = beads.get(dep_id)
-            if not bead or bead.get("status") != "complete":
-                incomplete.append(dep_id)
-
-        if incomplete:
-            print(f"✗ Incomplete dependencies: {', '.join(f'Bead-{d}' for d in incomplete)}")
-            print(f"  Complete these beads first.")
-            return False
+    All state handling lives in beads.engine.Engine; this class turns its
+    results into the banners Claude reads and its exceptions into exit codes.
+    """
 
-        print(f"✓ Dependencies satisfied ({len(dependencies)} beads)")
-        return True
+    MAX_RETRIES = Engine.MAX_RETRIES
+    FAILURE_TAIL_LINES = 40  # of the runner tail, printed on failure
+    FAILED_TESTS_SHOWN = 10
+    STATE_FILE = Engine.STATE_FILE
+    LEDGER_FILE = Engine.LEDGER_FILE
+    GUARD_FILE = Engine.GUARD_FILE
+
+    def __init__(self, root: Path = Path(".")):
+        self.engine = Engine(root)
+        self._flush_warnings()
+
+    @property
+    def context(self) -> Optional[FSMContext]:
+        return self.engine.context
+
+    def _flush_warnings(self) -> None:
+        for warning in self.engine.warnings:
+            print(f"⚠ {warning}")
+        self.engine.warnings.clear()
+
+    def _print_transition(self, result: TransitionResult) -> None:
+        if result.tier_skipped:
+            print("✓ Verification tier NONE - skipping verification requirement")
+        if result.ledger_error:
+            print(f"✗ {result.ledger_error}")
+        if result.warm_stopped:
+            print(f"⚙ Warm servers stopped: {', '.join(result.warm_stopped)}")
+        sync = result.sync
+        if not sync:
+            return
+        if sync.phase_complete:
+            print("")
+            print("=" * 65)
+            print(f"  PHASE {sync.phase_complete} COMPLETE!")
+            print("=" * 65)
+            print("")
+            print(f"  All beads in Phase {sync.phase_complete} verified and committed")
+            print(f"  Phase ready to freeze")
+            print("")
+            print("  REQUIRED NEXT STEP:")
+            print("   /beads:close-phase")
+            print("")
+            print("  DO NOT proceed to next phase without freezing this one first!")
+            print("=" * 65)
+            print("")
+        if sync.auto_queued:
+            print(f"✓ Auto-queued: Bead-{sync.auto_queued}")
 
     def init(
         self,
         bead_id: str,
-        verification_cmd: Optional[str] = None,
+        verification_cmd: Optional[VerificationCmd] = None,
         model: Optional[str] = None,
         active_model: Optional[str] = None,
-        bead_path: Optional[str] = None,
+        bead_path: Optional[str] = None
     ) -> None:
         """
         Initialize FSM for new bead execution.
 
         IRON LOCK: active_model must match bead's required model.
         """
-        # Check dependencies
-        if bead_path and not self._check_dependencies_simple(bead_path):
+        try:
+            result = self.engine.init(
+                bead_id, verification_cmd, model, active_model, bead_path, warm=self._warm_tools(),
+            )
+        except PhaseGuardError as e:
+            self._flush_warnings()
+            if e.reason == "previous_phase_open":
+                print("")
+                print("=" * 65)
+                print(f"🛡️ Phase Guard: Phase Boundary Violation 🛡️")
+                print("=" * 65)
+                print("")
+                print(f"Phase {e.prev_phase} is NOT CLOSED yet.")
+                print("")
+                print("You MUST close the previous phase before starting a new one:")
+                print("  → /beads:close-phase")
+                print("")
+                print("Why this matters:")
+                print(f"- Creates {e.prev_phase}-SUMMARY.md for context isolation")
+                print("- Prevents stale context bleeding into new phase")
+                print("- Marks phase complete in ledger")
+                print("")
+                print("⛔ Execution BLOCKED until previous phase closed")
+                print("=" * 65)
+                print("")
+            else:
+                print("")
+                print("=" * 65)
+                print(f"🛡️ Phase Guard: Unplanned Phase Detected 🛡️")
+                print("=" * 65)
+                print("")
+                print(f"Next bead would be: {bead_id}")
+                print(f"Status: BEAD FILES NOT FOUND")
+                print("")
+                print(f"Phase {e.phase} has NOT been planned yet.")
+                print("")
+                print("You MUST plan the phase first:")
+                print(f"  → /beads:plan phase-{e.phase}")
+                print("")
+                print("Cannot execute beads that don't exist!")
+                print("")
+                print("⛔ Execution BLOCKED until phase planned")
+                print("=" * 65)
+                print("")
+            sys.exit(1)
+        except DependencyError as e:
+            self._flush_warnings()
+            print(f"✗ {e}")
+            print("  Complete these beads first.")
+            sys.exit(1)
+        except ModelMismatchError as e:
+            self._flush_warnings()
+            print(f"✗ {e}")
+            print(f"  Switch models before proceeding.")
+            sys.exit(1)
+        except GitError:
+            self._flush_warnings()
+            print("✗ Git repository not initialized.")
+            print("")
+            print("  Run these commands first:")
+            print("    git init")
+            print("    git add .")
+            print("    git commit -m 'chore: initial commit'")
             sys.exit(1)
 
-        # Extract model, verification_cmd, bead_type, and verification_tier from bead file
-        bead_type = "implementation"  # default
-        verification_tier = "AUTO"  # default
-        if bead_path:
-            bead_file = Path(bead_path)
-            if bead_file.exists():
-                content = bead_file.read_text()
-                model_match = re.search(r'model:\s*(\w+)', content, re.IGNORECASE)
-                if model_match:
-                    model = model_match.group(1).lower()
-                verify_match = re.search(r'verification_cmd:\s*["\'](.+?)["\']', content)
-                if verify_match:
-                    verification_cmd = verify_match.group(1)
-                # Extract bead type (spike or implementation)
-                type_match = re.search(r'type:\s*(\w+)', content, re.IGNORECASE)
-                if type_match:
-                    bead_type = type_match.group(1).lower()
-                # Extract verification tier (AUTO, MANUAL, NONE)
-                tier_match = re.search(r'verification_tier:\s*(\w+)', content, re.IGNORECASE)
-                if tier_match:
-                    verification_tier = tier_match.group(1).upper()
-                elif bead_type == "spike":
-                    verification_tier = "NONE"  # Spike beads default to NONE
-
-        # IRON LOCK: Model guard
-        if active_model and model:
-            actual = active_model.lower()
-            expected = model.lower()
-            for base in ['opus', 'sonnet', 'haiku']:
-                if base in actual:
-                    actual = base
-                if base in expected:
-                    expected = base
-
-            if actual != expected:
-                print(f"✗ IRON LOCK: Bead requires {expected.upper()}, running {actual.upper()}")
-                print(f"  Switch models before proceeding.")
-                sys.exit(1)
-
-        initial_sha = self._get_current_commit_sha()
-        self.context = FSMContext(
-            bead_id=bead_id,
-            current_state=State.DRAFT.value,
-            retry_count=0,
-            initial_commit_sha=initial_sha,
-            verification_cmd=verification_cmd,
-            model=model,
-            last_verification_passed=False,
-            bead_type=bead_type,
-            verification_tier=verification_tier,
-            bead_path=bead_path,
+        self._flush_warnings()
+        self._print_transition(result.transition)
+        if result.warm:
+            print(f"⚙ Warm servers starting: {', '.join(result.warm)}")
+        context = result.context
+        self._print_state_summary(
+            bead_id, bead_path, context.model, active_model, context.verification_cmd,
+            context.verification_tier, context.bead_type, result.phase,
         )
-        self._save_state()
-
-        # Auto-transition to EXECUTE
-        self.context.current_state = State.EXECUTE.value
-        self._save_state()
-        self.sync_ledger()
 
-        # Derive numeric phase from bead_id (e.g. "06C-01" -> "6", "06-01" -> "6")
-        phase_match = re.match(r'^0*(\d+)', bead_id)
-        current_phase = phase_match.group(1) if phase_match else None
+    @staticmethod
+    def _warm_tools() -> list[str]:
+        """fsm.warm_servers from config.yaml: true (all), false, or a list of tools."""
+        from beads.router import load_config
+        from beads.warm import TOOLS
 
-        # Print compact state summary
-        self._print_state_summary(bead_id, bead_path, model, active_model, verification_cmd, verification_tier, bead_type, current_phase)
+        setting = (load_config(quiet=True).get("fsm") or {}).get("warm_servers") or False
+        if setting is True:
+            return list(TOOLS)
+        if isinstance(setting, str):
+            setting = [t.strip() for t in setting.strip("[]").split(",")]
+        return [t for t in setting if t in TOOLS] if isinstance(setting, list) else []
 
     def _print_state_summary(
         self,
@@ -265,456 +228,592 @@ class BeadFSM:
         bead_path: Optional[str],
         model: Optional[str],
         active_model: Optional[str],
-        verification_cmd: Optional[str],
+        verification_cmd: Optional[VerificationCmd],
         verification_tier: str,
         bead_type: str,
         current_phase: Optional[str],
     ) -> None:
         """Print compact state summary — all context Claude needs, nothing more."""
-        title = self._extract_bead_title(bead_path)
-        goal = self._extract_bead_goal(bead_path)
-        scope = self._extract_context_files(bead_path)
-        phase_progress = self._get_phase_progress(current_phase)
-        model_display = (active_model or model or "any").lower()
-        for base in ['opus', 'sonnet', 'haiku']:
-            if base in model_display:
-                model_display = base
-                break
+        title = self.engine.bead_title(bead_path)
+        phase_progress = self.engine.phase_progress(current_phase)
+        model_display = model_family(active_model or model or "any")
 
         width = 65
         print("")
+        print("")
         print("╔" + "═" * (width - 2) + "╗")
-        header = f"  ✅ BEAD READY: {bead_id}"
+        header = f"  BEAD READY: {bead_id}"
         if title:
             header += f" — {title}"
         print("║" + header.ljust(width - 2) + "║")
+        summary = f"  Phase {phase_progress}  |  Model: {model_display}"
+        summary += f"  |  Tier: {verification_tier}"
+        print("║" + summary.ljust(width - 2) + "║")
         print("╚" + "═" * (width - 2) + "╝")
-        if goal:
-            print(f"  Goal    : {goal}")
-        if scope:
-            print(f"  Scope   : {', '.join(scope)}")
-        verify_display = verification_cmd or f"{verification_tier} tier"
-        print(f"  Verify  : {verify_display}")
-        print(f"  Phase   : {phase_progress}  |  Model: {model_display}  |  Tier: {verification_tier}")
         if bead_type == "spike":
-            print(f"  ⚡ Spike bead — exploration mode")
+            print("  ⚡ Spike bead — exploration mode")
         print("")
-        print(f"  ℹ️  Tip: /clear before each bead saves tokens")
+        print("  Tip: Run /clear before this bead to free up context")
         print("")
 
-    def _extract_bead_title(self, bead_path: Optional[str]) -> Optional[str]:
-        """Extract title from '# Bead XX-YY: Title' in bead file."""
-        if not bead_path:
-            return None
-        path = Path(bead_path)
-        if not path.exists():
-            return None
-        for line in path.read_text().splitlines():
-            match = re.match(r'^#\s+Bead\s+[\w-]+:\s+(.+)', line)
-            if match:
-                return match.group(1).strip()
-        return None
-
-    def _extract_bead_goal(self, bead_path: Optional[str]) -> Optional[str]:
-        """Extract Goal line from <intent> block in bead file."""
-        if not bead_path:
-            return None
-        path = Path(bead_path)
-        if not path.exists():
-            return None
-        content = path.read_text()
-        match = re.search(r'\*\*Goal\*\*\s*:\s*(.+)', content)
-        if match:
-            return match.group(1).strip()
-        return None
-
-    def _extract_context_files(self, bead_path: Optional[str]) -> list[str]:
-        """Extract mandatory files from <context_files> block in bead file."""
-        if not bead_path:
-            return []
-        path = Path(bead_path)
-        if not path.exists():
-            return []
-        content = path.read_text()
-        block_match = re.search(r'<context_files>(.*?)</context_files>', content, re.DOTALL)
-        if not block_match:
-            return []
-        block = block_match.group(1)
-        mandatory_match = re.search(r'mandatory:(.*?)(?:reference:|$)', block, re.DOTALL)
-        if not mandatory_match:
-            return []
-        files = re.findall(r'^\s{2}-\s+(.+)', mandatory_match.group(1), re.MULTILINE)
-        return [
-            f.strip() for f in files
-            if not f.strip().startswith('[') and 'ledger.json' not in f
-        ]
-
-    def _auto_commit(self) -> bool:
+    def sync_ledger(self) -> bool:
         """
-        Smart stage scope files and auto-commit after successful verification.
-        Returns True if commit succeeded, False otherwise.
+        Sync FSM state to ledger.json.
+        Updates active_bead, marks completed beads, auto-queues next.
         """
-        if not self.context:
-            return False
-
-        bead_id = self.context.bead_id
-        bead_path = self.context.bead_path
-        scope_files = self._extract_context_files(bead_path)
-
-        # Determine what to stage
-        if scope_files:
-            existing = [f for f in scope_files if Path(f).exists()]
-            if not existing:
-                print("⚠ No scope files found on disk — staging all changed tracked files")
-                stage_cmd = ["git", "add", "-u"]
-            else:
-                print(f"  Staging {len(existing)} scope file(s): {', '.join(existing)}")
-                stage_cmd = ["git", "add"] + existing
-        else:
-            print("⚠ No scope defined — staging all changed tracked files")
-            stage_cmd = ["git", "add", "-u"]
-
-        result = subprocess.run(stage_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"✗ git add failed: {result.stderr.strip()}")
-            return False
-
-        # Check if there's anything to commit
-        status = subprocess.run(
-            ["git", "diff", "--cached", "--quiet"],
-            capture_output=True
-        )
-        if status.returncode == 0:
-            print("⚠ Nothing staged — working tree already clean, skipping commit")
-            return True  # Not a failure — just nothing to commit
-
-        # Generate commit message
-        title = self._extract_bead_title(bead_path) or bead_id
-        commit_msg = f"beads({bead_id}): {title}"
-
-        result = subprocess.run(
-            ["git", "commit", "-m", commit_msg],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            print(f"✗ git commit failed: {result.stderr.strip()}")
-            return False
-
-        sha = subprocess.run(
-            ["git", "rev-parse", "--short", "HEAD"],
-            capture_output=True, text=True
-        ).stdout.strip()
-        print(f"✓ Committed: {commit_msg} ({sha})")
-        return True
-
-    def _get_phase_progress(self, current_phase: Optional[str]) -> str:
-        """Return 'Phase X of Y' from ledger.json roadmap."""
-        if not current_phase or not self.LEDGER_FILE.exists():
-            return current_phase or "?"
-        data = self._load_ledger()
-        total = len(data.get("roadmap", []))
-        if total:
-            return f"{current_phase} of {total}"
-        return current_phase
-
-    def _find_next_pending_bead(self, data: dict) -> Optional[str]:
-        """Find first pending bead in ledger.json (preserves insertion order)."""
-        for bead_id, bead in data.get("beads", {}).items():
-            if bead.get("status") == "pending":
-                return bead_id
-        return None
-
-    def sync_ledger(self) -> bool:
-        """Sync FSM state to ledger.json. No regex — pure dict operations."""
-        if not self.context:
+        try:
+            sync = self.engine.sync_ledger()
+        except NotInitializedError:
             print("✗ FSM not initialized")
             return False
-
-        if not self.LEDGER_FILE.exists():
-            print(f"✗ Ledger not found: {self.LEDGER_FILE}")
+        except LedgerError as e:
+            print(f"✗ {e}")
             return False
-
-        data = self._load_ledger()
-        bead_id = self.context.bead_id
-        state = self.context.current_state
-
-        if "beads" not in data:
-            data["beads"] = {}
-
-        # Mark bead complete
-        if state == "complete":
-            if bead_id in data["beads"]:
-                data["beads"][bead_id]["status"] = "complete"
-                print(f"✓ Marked Bead-{bead_id} complete")
-            else:
-                print(f"⚠ Bead-{bead_id} not in ledger — adding")
-                data["beads"][bead_id] = {"status": "complete", "model": self.context.model}
-
-        # Update active_bead
-        if state in ["complete", "failed"]:
-            next_bead = self._find_next_pending_bead(data)
-            data["active_bead"] = next_bead
-            if next_bead:
-                print(f"✓ Auto-queued: Bead-{next_bead}")
-            else:
-                print("✓ All beads complete")
-        else:
-            data["active_bead"] = bead_id
-
-        result = self._save_ledger(data)
-        if result:
-            print(f"✓ Ledger synced: Bead-{bead_id} → {state}")
-        return result
+        self._flush_warnings()
+        self._print_transition(TransitionResult(from_state="", to_state="", sync=sync))
+        return True
 
     def transition(self, target_state: str) -> None:
         """
         Transition to target state.
         INTEGRITY GATE: Cannot complete without passing verification.
         """
-        if not self.context:
-            raise RuntimeError("FSM not initialized. Run 'fsm.py init <bead_id>' first.")
-
         try:
-            new_state = State(target_state)
-        except ValueError:
-            raise ValueError(f"Invalid state: {target_state}")
-
-        current = State(self.context.current_state)
-
-        # Validate transition
-        valid_transitions = {
-            State.DRAFT: [State.EXECUTE],
-            State.EXECUTE: [State.VERIFY, State.COMPLETE],  # COMPLETE allowed for spike beads
-            State.VERIFY: [State.COMPLETE, State.RECOVER],
-            State.RECOVER: [State.EXECUTE, State.FAILED],
-            State.COMPLETE: [],
-            State.FAILED: []
-        }
-
-        # For spike beads, allow direct EXECUTE -> COMPLETE
-        if current == State.EXECUTE and new_state == State.COMPLETE:
-            if self.context.bead_type != "spike":
-                raise RuntimeError(f"Cannot transition EXECUTE -> COMPLETE for implementation beads (must verify first)")
-        elif new_state not in valid_transitions.get(current, []):
-            raise RuntimeError(f"Invalid transition: {current.value} -> {new_state.value}")
-
-        # INTEGRITY GATE (skip for NONE tier)
-        if new_state == State.COMPLETE and not self.context.last_verification_passed:
-            if self.context.verification_tier == "NONE":
-                print(f"✓ Verification tier NONE - skipping verification requirement")
-            else:
-                print(f"✗ Cannot complete: verification not passed")
-                print(f"  Tier: {self.context.verification_tier}")
-                print(f"  Run: fsm.py verify \"<cmd>\"")
-                sys.exit(1)
-
-        self.context.current_state = new_state.value
-        self._save_state()
-        print(f"✓ Transition: {current.value} -> {new_state.value}")
-
-        self.sync_ledger()
+            result = self.engine.transition(target_state)
+        except VerificationRequiredError as e:
+            print(f"✗ Cannot complete: verification not passed")
+            print(f"  Tier: {e.tier}")
+            print(f"  Run: fsm.py verify \"<cmd>\"")
+            sys.exit(1)
+        self._flush_warnings()
+        self._print_transition(result)
 
-    def verify(self, verification_cmd: Optional[str] = None) -> bool:
+    def verify(
+        self,
+        verification_cmd: Optional[VerificationCmd] = None,
+        timeout: Optional[float] = None,
+        shards: Optional[str] = None,
+        background: bool = False,
+        watch: bool = False,
+    ) -> bool:
         """
-        Run verification command.
+        Run verification command (or named checks, concurrently).
         Only this method can set last_verification_passed=True.
-        Auto-prefixes python commands with 'uv run'.
+        Tools run from the environment resolved at init ('uv run' without one).
+        With background, verify a snapshot in a detached job (see wait); the
+        snapshot holds tracked and untracked files but nothing gitignored, so
+        build outputs and in-project environments are missing from it;
+        with watch, re-run affected tests on every change without using a retry.
         """
-        if not self.context:
-            raise RuntimeError("FSM not initialized.")
+        if timeout is None or shards is None:
+            from beads.router import load_config
+            fsm_config = load_config(quiet=True).get("fsm") or {}
+            if timeout is None:
+                timeout = float(fsm_config.get("verify_timeout") or DEFAULT_TIMEOUT)
+            if shards is None:
+                shards = str(fsm_config.get("verify_shards") or 1)
+        shard_count = (os.cpu_count() or 1) if shards == "auto" else int(shards)
+
+        if watch:
+            return self._watch(verification_cmd, timeout or None)
+
+        if background:
+            job = self.engine.verify_background(
+                verification_cmd, timeout=timeout or None, shards=shard_count,
+            )
+            self._flush_warnings()
+            print(f"⚙ Verification job {job.job_id} started in background"
+                  f" (snapshot {job.tree[:7]})")
+            print(f"  Keep working; apply the result with: fsm.py wait {job.job_id}")
+            return True
+
+        def progress(elapsed: float, lines: int) -> None:
+            print(f"  … {elapsed:.0f}s, {lines} lines of output", flush=True)
 
-        cmd = verification_cmd or self.context.verification_cmd
-        if not cmd:
-            raise ValueError("No verification command provided.")
+        result = self.engine.verify(
+            verification_cmd, timeout=timeout or None, on_progress=progress, shards=shard_count,
+        )
+        self._flush_warnings()
+        return self._print_verify(result)
 
-        # Auto-prefix python commands with 'uv run'
-        python_commands = ['pytest', 'python', 'mypy', 'ruff', 'coverage']
-        needs_prefix = any(cmd.strip().startswith(tool) for tool in python_commands)
-        if needs_prefix and not cmd.strip().startswith('uv run'):
-            cmd = f"uv run {cmd}"
-            print(f"⚙ Auto-prefixed: {cmd}")
+    def _watch(self, verification_cmd: Optional[VerificationCmd], timeout: Optional[float]) -> bool:
+        """Watch loop until Ctrl-C; one compact line per run."""
+        import time
 
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        from beads.watch import WatchRun
 
-        if result.returncode == 0:
-            self.context.last_verification_passed = True
-            self._save_state()
-            print("✓ Verification PASSED")
+        def report(run: WatchRun) -> None:
+            if run.tests is None:
+                scope = "full run"
+            else:
+                scope = ", ".join(run.tests)
+                scope = scope if len(scope) <= 80 else f"{len(run.tests)} test files"
+            counts = ", ".join(
+                f"{n} {label}" for n, label in ((run.failed, "failed"), (run.passed, "passed")) if n
+            )
+            stamp = time.strftime('%H:%M:%S')
+            if run.ok:
+                print(f"✓ {stamp} {counts or 'passed'} ({run.duration:.1f}s) — {scope}")
+                return
+            outcome = "timed out" if run.timed_out else (counts or f"exit {run.returncode}")
+            print(f"✗ {stamp} {outcome} ({run.duration:.1f}s) — {scope}")
+            shown = run.failed_tests[:self.FAILED_TESTS_SHOWN]
+            if shown:
+                more = len(run.failed_tests) - len(shown)
+                print(f"  {', '.join(shown)}" + (f" +{more} more" if more else ""))
+            print(f"  Output: {run.log}", flush=True)
+
+        print("⚙ Watching scope files and tests — Ctrl-C to stop (no retries used)", flush=True)
+        try:
+            self.engine.watch(report, verification_cmd, timeout=timeout)
+        except KeyboardInterrupt:
+            pass
+        self._flush_warnings()
+        print("")
+        print("⚙ Watch stopped — run fsm.py verify to complete the bead")
+        return True
 
-            # Verified Commit: auto-commit scope files before marking DONE
-            if not self._auto_commit():
+    def _print_verify(self, result: VerifyResult) -> bool:
+        """Report a verification run and what it did to the bead."""
+        if result.prefixed and not result.checks:
+            print(f"⚙ Auto-prefixed: {result.command}")
+        if result.env_resolved and result.tool_env:
+            where = result.tool_env.bin or f"{result.tool_env.source} prefix"
+            print(f"⚙ Tool environment resolved ({result.tool_env.source}): {where}")
+        if result.warm:
+            print(f"⚙ Warm: {', '.join(result.warm)} via the bead's tool server")
+        if result.shards:
+            from beads.split import DURATIONS_FILE
+            print(f"⚙ Split across {result.shards} pytest processes (balanced by {DURATIONS_FILE})")
+        if result.failed_first:
+            print(f"⚙ Failed-first: re-ran {len(result.failed_first)} previously failing test(s)"
+                  " before the full command")
+        self._print_checks(result)
+        if result.tests:
+            print(f"⚙ Tests: {self._test_counts(result.tests)} — {result.tests.results}")
+            if result.tests.collection_errors:
+                errors = ", ".join(result.tests.collection_errors)
+                print(f"✗ Collection errors (tests not run): {errors}")
+
+        if result.passed:
+            print("✓ Verification PASSED")
+            commit = result.commit or CommitResult()  # set whenever verification passed
+            if commit.staged:
+                print(f"  Staging {len(commit.staged)} scope file(s): {', '.join(commit.staged)}")
+            if commit.error:
+                print(f"✗ {commit.error}")
                 print("✗ Auto-commit failed — bead remains in EXECUTE state")
                 print("  Fix git issues and re-run: fsm.py verify")
-                self.context.last_verification_passed = False
-                self._save_state()
                 return False
-
-            if State(self.context.current_state) == State.EXECUTE:
-                self.transition(State.VERIFY.value)
-            self.transition(State.COMPLETE.value)
+            if commit.nothing_staged:
+                print("⚠ Nothing staged — working tree already clean, skipping commit")
+            else:
+                print(f"✓ Committed: {commit.message} ({commit.sha})")
+            for transition in result.transitions:
+                self._print_transition(transition)
             return True
 
-        # Exit code 127 = command not found (environment error, don't retry)
-        if result.returncode == 127:
-            print(f"✗ Command not found (exit 127): {cmd}")
-            if result.stderr:
-                print(f"  {result.stderr.strip()}")
+        failed = result.failed_check
+        if result.env_error:
+            print(f"✗ Command not found (exit 127): {failed.command if failed else result.command}")
+            self._print_tail(result)
             print(f"  Install missing tool or check environment")
             return False
 
-        print(f"✗ Verification FAILED (exit {result.returncode})")
-        if result.stderr:
-            print(f"  {result.stderr.strip()}")
+        if failed and failed.timed_out:
+            print(f"✗ Verification TIMED OUT: check '{failed.name}' after {failed.duration:.0f}s"
+                  " — process group killed")
+        elif failed:
+            print(f"✗ Verification FAILED: check '{failed.name}' (exit {failed.returncode})")
+        elif result.timed_out:
+            print(f"✗ Verification TIMED OUT after {result.duration:.0f}s — process group killed")
+        else:
+            print(f"✗ Verification FAILED (exit {result.returncode})")
+        self._print_tail(result)
+
+        if result.circuit_broken:
+            print(f"✗ Circuit breaker: {result.retry_count}/{self.MAX_RETRIES} attempts")
+            print("")
+            print("⛔ STOP. Report this failure to the user.")
+            print("Do NOT attempt rollback or other recovery commands.")
+        else:
+            print(f"⚠ Retry {result.retry_count}/{self.MAX_RETRIES} - entering RECOVER")
+        for transition in result.transitions:
+            self._print_transition(transition)
+        return False
 
-        # Circuit breaker retry logic
-        self.context.retry_count += 1
-        self.context.last_verification_passed = False
-        self._save_state()
+    def _print_checks(self, result: VerifyResult) -> None:
+        """One line per named check: outcome, duration, command."""
+        for check in result.checks:
+            if check.passed:
+                mark, outcome = "✓", "passed"
+            elif check.cancelled:
+                mark, outcome = "⚠", "cancelled"
+            elif check.timed_out:
+                mark, outcome = "✗", "timed out"
+            else:
+                mark, outcome = "✗", f"exit {check.returncode}"
+            command = check.command if len(check.command) <= 100 else check.command[:97] + "..."
+            print(f"{mark} {check.name}: {outcome} ({check.duration:.1f}s) — {command}")
+
+    @staticmethod
+    def _test_counts(summary: TestSummary) -> str:
+        """'41 passed, 1 failed, 2 skipped in 3.2s' — zero counts left out."""
+        counts = [
+            ("failed", summary.failed),
+            ("error" if summary.errors == 1 else "errors", summary.errors),
+            ("passed", summary.passed),
+            ("skipped", summary.skipped),
+            ("xfailed", summary.xfailed),
+            ("xpassed", summary.xpassed),
+        ]
+        text = ", ".join(f"{n} {label}" for label, n in counts if n) or "no tests ran"
+        return f"{text} in {summary.duration:.1f}s"
+
+    def _print_tail(self, result: VerifyResult) -> None:
+        """Last lines of a failed run; the full output stays in the log."""
+        lines = result.stdout.strip().splitlines()[-self.FAILURE_TAIL_LINES:]
+        for line in lines:
+            print(f"  {line}")
+        if result.log:
+            print(f"  Full output: {result.log}")
+        if result.failed_tests:
+            shown = result.failed_tests[:self.FAILED_TESTS_SHOWN]
+            more = len(result.failed_tests) - len(shown)
+            print(f"  Failing tests (re-run first next attempt): {', '.join(shown)}"
+                  + (f" +{more} more" if more else ""))
+
+    def verify_all(
+        self,
+        phase: Optional[str] = None,
+        jobs: Optional[int] = None,
+        timeout: Optional[float] = None,
+        flag: bool = False,
+    ) -> bool:
+        """Regression sweep over completed beads; False when any regressed."""
+        if timeout is None:
+            from beads.router import load_config
+            fsm_config = load_config(quiet=True).get("fsm") or {}
+            timeout = float(fsm_config.get("verify_timeout") or DEFAULT_TIMEOUT)
+        scope = f"Phase {phase}" if phase else "all phases"
+        print(f"⚙ Regression sweep over completed beads ({scope})", flush=True)
+
+        def report(done: SweepCommand) -> None:
+            beads = ", ".join(done.beads)
+            command = done.command if len(done.command) <= 80 else done.command[:77] + "..."
+            if done.passed:
+                print(f"✓ {command} ({done.duration:.1f}s) — {beads}", flush=True)
+                return
+            outcome = "timed out" if done.timed_out else f"exit {done.returncode}"
+            print(f"✗ {command}: {outcome} ({done.duration:.1f}s) — {beads}")
+            shown = done.failed_tests[:self.FAILED_TESTS_SHOWN]
+            if shown:
+                more = len(done.failed_tests) - len(shown)
+                print(f"  Failing: {', '.join(shown)}" + (f" +{more} more" if more else ""))
+            print(f"  Output: {done.log}", flush=True)
+
+        result = self.engine.verify_all(
+            phase, jobs, timeout=timeout or None, flag=flag, on_done=report
+        )
+        self._flush_warnings()
 
-        if self.context.retry_count >= self.MAX_RETRIES:
-            print(f"✗ Circuit breaker: {self.context.retry_count}/{self.MAX_RETRIES} attempts")
-            self.transition(State.FAILED.value)
+        for bead_id, reason in result.skipped.items():
+            print(f"⚠ Bead-{bead_id} not re-run: {reason}")
+        if not result.commands:
+            print("⚠ No completed beads with a verification command to re-run")
+            return True
+        ran = f"{len(result.commands)} distinct command(s) in {result.duration:.1f}s"
+        print("")
+        if result.ok:
+            print(f"✓ No regressions: {len(result.passed)} bead(s), {ran}")
         else:
-            print(f"⚠ Retry {self.context.retry_count}/{self.MAX_RETRIES} - entering RECOVER")
-            self.transition(State.RECOVER.value)
-            if self.context.retry_count >= 2:
-                print("⚠ Consider rollback: fsm.py rollback")
-
-        return False
+            regressed = ", ".join(f"Bead-{b}" for b in result.regressed)
+            print(f"✗ REGRESSED: {regressed} ({len(result.passed)} still pass, {ran})")
+        print(f"  Report: {result.report}")
+        if result.flagged:
+            print("✓ Ledger updated (regressions)")
+        return result.ok
+
+    def jobs(self) -> None:
+        """List background verification jobs."""
+        jobs = self.engine.jobs()
+        if not jobs:
+            print("No background verification jobs")
+            return
+        marks = {
+            "running": "⚙", "passed": "✓", "applied": "✓",
+            "failed": "✗", "error": "✗", "stale": "⚠",
+        }
+        for job in jobs:
+            status, mark = job.status, marks.get(job.status, "?")
+            if status == "applied" and job.result and job.result.get("returncode"):
+                status, mark = "applied (failed)", "✗"
+            detail = f" — {job.error}" if job.error else ""
+            started = f"(started {job.started})"
+            print(f"{mark} {job.job_id}: Bead-{job.bead_id} {status} {started}{detail}")
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a background job and apply its result if the tree still matches."""
+        print(f"⚙ Waiting for verification job {job_id}...", flush=True)
+        outcome = self.engine.wait_job(job_id, timeout)
+        self._flush_warnings()
+        job = outcome.job
+        if job.status == "running":
+            print(f"⚠ Job {job_id} still running after {timeout:.0f}s")
+            return False
+        if job.status == "error":
+            print(f"✗ Job {job_id} failed to run: {job.error}")
+            return False
+        if outcome.stale:
+            print(f"⚠ Job {job_id} result is stale: {outcome.stale}")
+            print("  Not applied — no retry used. Re-run: fsm.py verify")
+            return False
+        if outcome.verify is None:
+            print(f"✓ Job {job_id} was already applied")
+            return True
+        return self._print_verify(outcome.verify)
 
     def rollback(self) -> None:
         """Hard rollback to initial commit state."""
         if not self.context:
-            raise RuntimeError("FSM not initialized.")
-
-        initial_sha = self.context.initial_commit_sha
-        print(f"⚠ Rolling back to {initial_sha[:8]}")
-
-        # Save context before rollback
-        saved_context = FSMContext(
-            bead_id=self.context.bead_id,
-            current_state=State.DRAFT.value,
-            retry_count=self.context.retry_count,
-            initial_commit_sha=self.context.initial_commit_sha,
-            verification_cmd=self.context.verification_cmd,
-            model=self.context.model
-        )
+            raise NotInitializedError("FSM not initialized.")
 
+        print(f"⚠ Rolling back to {self.context.initial_commit_sha[:8]}")
         try:
-            subprocess.run(["git", "reset", "--hard", initial_sha], check=True, capture_output=True)
-            subprocess.run(
-                ["git", "clean", "-fd", "--exclude=.beads/", "--exclude=.planning/"],
-                check=True,
-                capture_output=True
-            )
-
-            # Restore FSM state
-            self.STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            self.STATE_FILE.write_text(json.dumps(saved_context.to_dict(), indent=2))
-            self.context = saved_context
-
-            print("✓ Rollback complete - state reset to DRAFT")
-
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Rollback failed: {e}")
+            self.engine.rollback()
+        except GitError as e:
+            print(f"✗ {e}")
             sys.exit(1)
+        self._flush_warnings()
+        print("✓ Rollback complete - state reset to DRAFT")
 
     def status(self) -> None:
         """Display current FSM status."""
-        if not self.context:
+        context = self.engine.status().context
+        if not context:
             print("FSM not initialized")
             return
 
-        print(f"Bead: {self.context.bead_id}")
-        print(f"State: {self.context.current_state}")
-        print(f"Retry: {self.context.retry_count}/{self.MAX_RETRIES}")
-        print(f"Initial commit: {self.context.initial_commit_sha[:8]}")
-        if self.context.model:
-            print(f"Model: {self.context.model}")
-        if self.context.verification_cmd:
-            print(f"Verification: {self.context.verification_cmd}")
+        print(f"Bead: {context.bead_id}")
+        print(f"State: {context.current_state}")
+        print(f"Retry: {context.retry_count}/{self.MAX_RETRIES}")
+        print(f"Initial commit: {context.initial_commit_sha[:8]}")
+        if context.model:
+            print(f"Model: {context.model}")
+        if isinstance(context.verification_cmd, dict):
+            print("Verification:")
+            for name, check_cmd in context.verification_cmd.items():
+                print(f"  {name}: {check_cmd}")
+        elif context.verification_cmd:
+            print(f"Verification: {context.verification_cmd}")
+        if context.test_summary:
+            summary = context.test_summary
+            print(f"Last tests: {self._test_counts(summary)} ({summary.results})")
+
+    def ready(self) -> None:
+        """List beads whose dependencies are complete, longest critical path first."""
+        try:
+            result = self.engine.ready()
+        except LedgerError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+
+        if result.cycle:
+            print(f"⚠ Dependency cycle: {' -> '.join(result.cycle)}")
+        if not result.ready:
+            print("No ready beads")
+        else:
+            print(f"Ready beads ({len(result.ready)}):")
+            for bead in result.ready:
+                marker = "→" if bead.bead_id == result.next_bead else " "
+                line = f"  {marker} {bead.bead_id}  critical path {bead.critical_path}"
+                if bead.title:
+                    line += f"  — {bead.title}"
+                if not bead.registered:
+                    line += "  (phase not started)"
+                print(line)
+        if result.blocked:
+            print(f"Blocked ({len(result.blocked)}):")
+            for bid, unmet in result.blocked.items():
+                print(f"    {bid}  waiting on {', '.join(unmet)}")
+
+    def run_parallel(
+        self, phase: Optional[str], jobs: Optional[int], agent_cmd: Optional[str]
+    ) -> bool:
+        """Run the phase's ready beads concurrently, one git worktree each."""
+        from beads.parallel import BeadRun, DEFAULT_AGENT_CMD, DEFAULT_JOBS, ParallelRunner
+        from beads.router import load_config
+        settings = load_config(quiet=True).get("parallel") or {}
+        agent_cmd = agent_cmd or settings.get("agent_cmd") or DEFAULT_AGENT_CMD
+        jobs = jobs or int(settings.get("max_sessions") or DEFAULT_JOBS)
+
+        if not phase:
+            ready = self.engine.ready()
+            candidates = (
+                [ready.next_bead] if ready.next_bead else sorted(b.bead_id for b in ready.ready)
+            )
+            if not candidates:
+                print("✗ No ready beads — pass the phase number: fsm.py run-parallel <phase-num>")
+                return False
+            phase = candidates[0][:2]
+
+        def report(event: str, run: BeadRun) -> None:
+            if event == "start":
+                print(f"▶ Bead-{run.bead_id} started in {run.worktree} (log: {run.log})")
+            elif event == "merged":
+                print(f"✓ Bead-{run.bead_id} verified and merged")
+            elif event == "conflict":
+                print(f"✗ Bead-{run.bead_id} merge conflict — worktree kept at {run.worktree}")
+                for path in run.conflicts:
+                    print(f"    {path}")
+            elif event == "failed":
+                print(f"✗ Bead-{run.bead_id} not verified "
+                      f"(status: {run.status}, agent exit {run.returncode})")
+                print(f"    log: {run.log}")
+            else:
+                print(f"✗ Bead-{run.bead_id}: {run.error}")
+
+        print(f"⚙ Phase {phase.zfill(2)}: up to {jobs} parallel session(s) — {agent_cmd}")
+        result = ParallelRunner(self.engine, agent_cmd, jobs, on_event=report).run(phase)
+        self._flush_warnings()
+
+        merged = sum(1 for run in result.runs if run.outcome == "merged")
+        mark = "✓" if merged == len(result.runs) else "⚠"
+        print(f"{mark} {merged}/{len(result.runs)} bead(s) merged")
+        for bid, unmet in result.blocked.items():
+            print(f"    {bid}  still waiting on {', '.join(unmet)}")
+        return merged == len(result.runs)
+
+    def ledger_backend(self, backend: Optional[str]) -> None:
+        """Show or switch the ledger backend (ledger.json / ledger.db)."""
+        if backend is None:
+            print(f"Ledger backend: {self.engine.ledger_backend}")
+            return
+        try:
+            changed = self.engine.set_ledger_backend(backend)
+        except LedgerError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        if not changed:
+            print(f"✓ Ledger backend already {backend}")
+        elif backend == "sqlite":
+            print("✓ Ledger moved to .beads/ledger.db — ledger.json is now an exported view")
+        else:
+            print("✓ Ledger moved back to .beads/ledger.json — ledger.db removed")
+
+    def history(self, bead_id: str) -> None:
+        """Print a bead's status transitions."""
+        try:
+            transitions = self.engine.bead_history(bead_id)
+        except LedgerError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        if not transitions:
+            print(f"No transitions recorded for Bead-{bead_id}")
+            return
+        for t in transitions:
+            print(f"  {t['at']}  {t['from'] or '-'} → {t['to']}")
 
     def reset(self) -> None:
         """Clear FSM state."""
-        if self.STATE_FILE.exists():
-            self.STATE_FILE.unlink()
-        self.context = None
+        self.engine.reset()
+        self._flush_warnings()
         print("✓ FSM state cleared")
 
-
-def validate_project():
-    """
-    Validate PROJECT.md has real content and output parsed data.
-    Physical enforcement: writes .beads/.plan-ready flag on success.
-    Without this flag, hooks block writes to .planning/phases/.
-    """
-    project_md = Path(".planning/PROJECT.md")
-    plan_ready = Path(".beads/.plan-ready")
-
-    if not project_md.exists():
-        print("✗ .planning/PROJECT.md not found")
-        print("  Run `beads init` first")
+    def close_phase(self, phase_num: str, archive: bool = False) -> None:
+        """Close a phase once all its beads are complete."""
+        try:
+            result = self.engine.close_phase(phase_num, archive=archive)
+        except PhaseIncompleteError as e:
+            print("")
+            print("=" * 65)
+            print(f"  BLOCKED: Phase {e.phase} has incomplete beads")
+            print("=" * 65)
+            print("")
+            for bid in sorted(e.incomplete):
+                print(f"  ✗ Bead {bid}: {e.incomplete[bid]}")
+            print("")
+            print("  Complete all beads before closing the phase.")
+            print("")
+            sys.exit(1)
+        except LedgerError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        self._flush_warnings()
+        print(f"✓ Phase {result.phase} closed")
+        if result.archived:
+            print(f"  {result.archived} bead(s) archived to {result.shard}")
+        if result.manifest:
+            print(f"  Frozen: {result.manifest} (planning tree added to .claudeignore)")
+        if result.archive:
+            print(f"  Planning tree packed into {result.archive}")
+
+    def check_phase_closed(self, phase_num: str) -> None:
+        """Exit 0 if the phase before phase_num is closed, else print a block banner."""
+        try:
+            closed = self.engine.check_phase_closed(phase_num)
+        except LedgerError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        if closed:
+            sys.exit(0)
+        prev_phase = f"{int(phase_num) - 1:02d}"
+        print("")
+        print("=" * 65)
+        print(f"  BLOCKED: Phase {prev_phase} is not closed yet")
+        print("=" * 65)
+        print("")
+        print(f"  You must close Phase {prev_phase} before planning Phase {phase_num.zfill(2)}.")
+        print("")
+        print("  Run: /beads:close-phase")
+        print("")
         sys.exit(1)
 
-    content = project_md.read_text()
-
-    # Extract and validate sections
-    vision_match = re.search(r'## Vision\s*\n+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-    goals_match = re.search(r'## Goals / MVP Target\s*\n+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-
-    vision = vision_match.group(1).strip() if vision_match else ""
-    goals = goals_match.group(1).strip() if goals_match else ""
-
-    errors = []
-    if not vision or vision.startswith("[TODO"):
-        errors.append("Vision is empty or placeholder")
-    if not goals or goals.startswith("[TODO"):
-        errors.append("Goals / MVP Target is empty or placeholder")
+    def validate_project(self) -> None:
+        """
+        Validate PROJECT.md has real content and output parsed data.
+        Physical enforcement: writes .beads/.plan-ready flag on success.
+        Without this flag, hooks block writes to .planning/phases/.
+        """
+        try:
+            info = self.engine.validate_project()
+        except ProjectValidationError as e:
+            if not e.errors:
+                print(f"✗ {e}")
+                print("  Run `beads init` first")
+                sys.exit(1)
+            print(f"✗ {e}:")
+            for error in e.errors:
+                print(f"  - {error}")
+            print("")
+            print("  Fill in PROJECT.md or re-run `beads init` with real descriptions")
+            sys.exit(1)
+        self._flush_warnings()
 
-    if errors:
-        print("✗ PROJECT.md validation failed:")
-        for e in errors:
-            print(f"  - {e}")
+        # Output parsed content for Claude to use (physical guarantee it reads this)
+        print("")
+        print("=" * 65)
+        print("  PROJECT VALIDATED")
+        print("=" * 65)
+        print("")
+        print(f"  Vision: {info.vision[:200]}")
+        print(f"  Goals:  {info.goals[:200]}")
+        if info.tech_stack:
+            print(f"  Stack:  {info.tech_stack[:200]}")
+        if info.current_state:
+            print(f"  State:  EXISTING PROJECT — has Current State section")
+            print(f"          {info.current_state[:200]}")
+        else:
+            print(f"  State:  NEW PROJECT — no Current State section")
+        print("")
+        print("  .beads/.plan-ready flag set — phase writes unlocked")
+        print("=" * 65)
         print("")
-        print("  Fill in PROJECT.md or re-run `beads init` with real descriptions")
-        sys.exit(1)
 
-    # Write plan-ready flag
-    plan_ready.write_text(json.dumps({
-        "_WARNING": "Temporary flag — deleted after plan-project completes",
-        "validated_at": subprocess.run(
-            ["date", "-u", "+%Y-%m-%dT%H:%M:%SZ"],
-            capture_output=True, text=True
-        ).stdout.strip(),
-    }, indent=2))
-
-    # Extract optional sections (from /beads:onboard)
-    state_match = re.search(r'## Current State\s*\n+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-    current_state = state_match.group(1).strip() if state_match else ""
-
-    stack_match = re.search(r'## Tech Stack\s*\n+(.*?)(?=\n##|\Z)', content, re.DOTALL)
-    tech_stack = stack_match.group(1).strip() if stack_match else ""
-
-    # Output parsed content for Claude to use (physical guarantee it reads this)
-    print("")
-    print("=" * 65)
-    print("  PROJECT VALIDATED")
-    print("=" * 65)
-    print("")
-    print(f"  Vision: {vision[:200]}")
-    print(f"  Goals:  {goals[:200]}")
-    if tech_stack:
-        print(f"  Stack:  {tech_stack[:200]}")
-    if current_state:
-        print(f"  State:  EXISTING PROJECT — has Current State section")
-        print(f"          {current_state[:200]}")
-    else:
-        print(f"  State:  NEW PROJECT — no Current State section")
-    print("")
-    print("  .beads/.plan-ready flag set — phase writes unlocked")
-    print("=" * 65)
-    print("")
+
+def validate_project():
+    """Validate PROJECT.md in the current directory (see BeadFSM.validate_project)."""
+    BeadFSM().validate_project()
 
 
 def main():
@@ -764,8 +863,69 @@ def main():
             fsm.transition(sys.argv[2])
 
         elif command == "verify":
-            verification_cmd = sys.argv[2] if len(sys.argv) > 2 else None
-            success = fsm.verify(verification_cmd)
+            verification_cmd, timeout, shards = None, None, None
+            background = watch = False
+            i = 2
+            while i < len(sys.argv):
+                if sys.argv[i] == "--background":
+                    background = True
+                    i += 1
+                elif sys.argv[i] == "--watch":
+                    watch = True
+                    i += 1
+                elif sys.argv[i] == "--timeout" and i + 1 < len(sys.argv):
+                    timeout = float(sys.argv[i + 1])
+                    i += 2
+                elif sys.argv[i] == "--shards" and i + 1 < len(sys.argv):
+                    shards = sys.argv[i + 1]
+                    i += 2
+                elif sys.argv[i] == "--check" and i + 1 < len(sys.argv):
+                    name, sep, check_cmd = sys.argv[i + 1].partition("=")
+                    if not sep or not name or not check_cmd:
+                        print("Usage: fsm.py verify --check NAME=CMD [--check NAME=CMD ...]")
+                        sys.exit(1)
+                    if not isinstance(verification_cmd, dict):
+                        verification_cmd = {}
+                    verification_cmd[name] = check_cmd
+                    i += 2
+                else:
+                    verification_cmd = sys.argv[i]
+                    i += 1
+            success = fsm.verify(verification_cmd, timeout, shards, background, watch)
+            sys.exit(0 if success else 1)
+
+        elif command == "verify-all":
+            phase, jobs, timeout, flag = None, None, None, False
+            i = 2
+            while i < len(sys.argv):
+                if sys.argv[i] == "--phase" and i + 1 < len(sys.argv):
+                    phase = sys.argv[i + 1]
+                    i += 2
+                elif sys.argv[i] == "--jobs" and i + 1 < len(sys.argv):
+                    jobs = int(sys.argv[i + 1])
+                    i += 2
+                elif sys.argv[i] == "--timeout" and i + 1 < len(sys.argv):
+                    timeout = float(sys.argv[i + 1])
+                    i += 2
+                elif sys.argv[i] == "--flag":
+                    flag = True
+                    i += 1
+                else:
+                    i += 1
+            success = fsm.verify_all(phase, jobs, timeout, flag)
+            sys.exit(0 if success else 1)
+
+        elif command == "jobs":
+            fsm.jobs()
+
+        elif command == "wait":
+            if len(sys.argv) < 3:
+                print("Usage: fsm.py wait <job_id> [--timeout SECONDS]")
+                sys.exit(1)
+            timeout = None
+            if "--timeout" in sys.argv[3:-1]:
+                timeout = float(sys.argv[sys.argv.index("--timeout") + 1])
+            success = fsm.wait(sys.argv[2], timeout)
             sys.exit(0 if success else 1)
 
         elif command == "rollback":
@@ -774,6 +934,25 @@ def main():
         elif command == "status":
             fsm.status()
 
+        elif command == "ready":
+            fsm.ready()
+
+        elif command == "run-parallel":
+            phase, jobs, agent_cmd = None, None, None
+            i = 2
+            while i < len(sys.argv):
+                if sys.argv[i] == "--jobs" and i + 1 < len(sys.argv):
+                    jobs = int(sys.argv[i + 1])
+                    i += 2
+                elif sys.argv[i] == "--agent" and i + 1 < len(sys.argv):
+                    agent_cmd = sys.argv[i + 1]
+                    i += 2
+                else:
+                    phase = sys.argv[i]
+                    i += 1
+            success = fsm.run_parallel(phase, jobs, agent_cmd)
+            sys.exit(0 if success else 1)
+
         elif command == "reset":
             fsm.reset()
 
@@ -781,8 +960,29 @@ def main():
             success = fsm.sync_ledger()
             sys.exit(0 if success else 1)
 
+        elif command == "ledger-backend":
+            fsm.ledger_backend(sys.argv[2] if len(sys.argv) > 2 else None)
+
+        elif command == "history":
+            if len(sys.argv) < 3:
+                print("Usage: fsm.py history <bead_id>")
+                sys.exit(1)
+            fsm.history(sys.argv[2])
+
+        elif command == "close-phase":
+            if len(sys.argv) < 3:
+                print("Usage: fsm.py close-phase <phase-num> [--archive]")
+                sys.exit(1)
+            fsm.close_phase(sys.argv[2], archive="--archive" in sys.argv[3:])
+
         elif command == "validate-project":
-            validate_project()
+            fsm.validate_project()
+
+        elif command == "check-phase-closed":
+            if len(sys.argv) < 3:
+                print("Usage: fsm.py check-phase-closed <phase-num>")
+                sys.exit(1)
+            fsm.check_phase_closed(sys.argv[2])
 
         else:
             print(f"Unknown command: {command}")
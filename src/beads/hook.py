@@ -0,0 +1,346 @@
+"""Single hook dispatcher for the State Guard.
+
+Replaces the per-hook shell scripts (protect-files.sh, guard-bash.sh,
+workflow-guard.sh, error-lock.sh) with one entry point: the tool-call payload
+is parsed once and every guard rule is evaluated from a rule table compiled at
+import time. Stdlib only — this runs hundreds of times per bead.
+
+Registered for PostToolUse too, it takes over error-tracker.sh: a failed tool
+call bumps .beads/.error-count under .beads/error-count.lock.
+
+Usage (registered in .claude/settings.json by `beads sync`):
+    beads-hook < payload.json
+
+Exit codes follow the Claude Code hook contract:
+    0  allow (PostToolUse always exits 0)
+    2  deny (reason on stderr, shown to Claude)
+"""
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from beads.locking import ERROR_COUNT_LOCK, increment_counter
+from beads.telemetry import is_enabled, record_hook
+
+# =============================================================================
+# RULE TABLE
+# =============================================================================
+
+# Framework files managed by the BEADS runtime. Entries ending in "/" protect
+# the whole subtree.
+PROTECTED_PATHS = (
+    ".beads/ledger.json",
+    ".beads/ledger.db",
+    ".beads/ledger/",
+    ".beads/frozen/",
+    ".beads/fsm-state.json",
+    ".beads/fsm-state.backup.json",
+    ".beads/.guard-state",
+    ".beads/.error-count",
+    ".beads/PROTOCOL.md",
+    ".beads/bin/",
+    ".beads/lib/",
+    ".claude/hooks/",
+    ".claude/settings.json",
+)
+
+# Paths that may be edited without an active bead (planning and framework docs)
+WORKFLOW_EXEMPT_PATHS = (
+    ".planning/",
+    ".beads/",
+    ".claude/",
+    "CLAUDE.md",
+)
+
+EDIT_TOOLS = frozenset({"Edit", "Write", "MultiEdit", "NotebookEdit"})
+BASH_TOOLS = frozenset({"Bash"})
+
+# Hook scripts superseded by the dispatcher, per hook event
+REPLACED_SCRIPTS = (
+    "protect-files.sh",
+    "guard-bash.sh",
+    "workflow-guard.sh",
+    "error-lock.sh",
+)
+REPLACED_POST_SCRIPTS = ("error-tracker.sh",)
+
+ERROR_COUNT_FILE = Path(".beads/.error-count")
+ERROR_LOCK_THRESHOLD = 2
+
+# tool_response fields that mark a failed tool call
+_ERROR_FLAGS = ("is_error", "isError")
+_EXIT_CODES = ("exit_code", "exitCode", "returncode")
+
+# FSM states in which a bead no longer counts as active (engine.State values)
+_INACTIVE_STATES = frozenset({"complete", "failed"})
+
+_AUTHORIZED_CMD = re.compile(r'^\s*python3?\s+(?:\./)?\.beads/bin/(?:fsm|router)\.py\s')
+
+_END = ""  # trie terminal marker
+
+
+def _build_trie(paths: tuple[str, ...]) -> dict:
+    """Build a path-component prefix trie. Directory entries match their subtree."""
+    root: dict = {}
+    for path in paths:
+        node = root
+        for part in path.rstrip("/").split("/"):
+            node = node.setdefault(part, {})
+        node[_END] = path
+    return root
+
+
+def _build_bash_regex(paths: tuple[str, ...]) -> re.Pattern:
+    """
+    Combine protected-path references and redirects into one alternation.
+    The redirect rule is guard-bash.sh's `(>|>>|tee)\\s+.*\\.(beads|claude)/`:
+    anything (flags, other paths) may sit between the redirect and the path.
+    """
+    protected = "|".join(re.escape(p.rstrip("/")) for p in sorted(paths, key=len, reverse=True))
+    return re.compile(
+        rf"(?P<protected>{protected})"
+        r"|(?P<redirect>(?:>|>>|tee)\s+.*\.(?:beads|claude)/)"
+    )
+
+
+_PROTECTED_TRIE = _build_trie(PROTECTED_PATHS)
+_EXEMPT_TRIE = _build_trie(WORKFLOW_EXEMPT_PATHS)
+_BASH_RULES = _build_bash_regex(PROTECTED_PATHS)
+
+
+# =============================================================================
+# EVALUATION
+# =============================================================================
+
+def _trie_match(trie: dict, rel_path: str) -> str | None:
+    """Return the protected entry covering rel_path, or None."""
+    node = trie
+    for part in rel_path.split("/"):
+        if part in ("", "."):
+            continue
+        child = node.get(part)
+        if child is None:
+            return None
+        node = child
+        if _END in node:
+            return str(node[_END])
+    return None
+
+
+def _relative(file_path: str, project_root: Path) -> str | None:
+    """Project-relative POSIX path, or None if the path is outside the project."""
+    path = Path(file_path)
+    if not path.is_absolute():
+        path = project_root / path
+    try:
+        return Path(os.path.normpath(path)).relative_to(project_root).as_posix()
+    except ValueError:
+        return None
+
+
+def _read_guard_state(project_root: Path) -> dict[str, str]:
+    """
+    Parse .beads/.guard-state (KEY=VALUE, written by fsm.py).
+
+    Projects synced from an older fsm.py have no guard file until the next
+    FSM command writes one; the active bead is then read from fsm-state.json.
+    """
+    state: dict[str, str] = {}
+    try:
+        text = (project_root / ".beads" / ".guard-state").read_text()
+    except FileNotFoundError:
+        return _state_from_fsm(project_root)
+    except OSError:
+        return state
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if sep and not key.startswith("#"):
+            state[key] = value
+    return state
+
+
+def _state_from_fsm(project_root: Path) -> dict[str, str]:
+    """BEAD_* guard keys derived from .beads/fsm-state.json (empty without a bead)."""
+    try:
+        context = json.loads((project_root / ".beads" / "fsm-state.json").read_text())
+        bead_id, state = str(context["bead_id"]), str(context["current_state"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+    return {
+        "BEAD_ACTIVE": "0" if state in _INACTIVE_STATES else "1",
+        "BEAD_ID": bead_id,
+        "BEAD_STATE": state,
+    }
+
+
+def _error_count(project_root: Path) -> int:
+    try:
+        return int((project_root / ERROR_COUNT_FILE).read_text().strip())
+    except (OSError, ValueError):
+        return 0
+
+
+def tool_failed(payload: dict) -> bool:
+    """True if a PostToolUse payload reports a failed tool call."""
+    response = payload.get("tool_response")
+    if not isinstance(response, dict):
+        return False
+    if any(response.get(flag) for flag in _ERROR_FLAGS):
+        return True
+    return any(response.get(key) not in (None, 0) for key in _EXIT_CODES)
+
+
+def track_error(payload: dict, project_root: Path) -> int | None:
+    """Count a failed tool call towards the error lock. Returns the new count, or None."""
+    if not tool_failed(payload) or not (project_root / ".beads").is_dir():
+        return None
+    try:
+        return increment_counter(project_root / ERROR_COUNT_FILE, project_root / ERROR_COUNT_LOCK)
+    except OSError:
+        return None
+
+
+def evaluate(payload: dict, project_root: Path) -> tuple[str, str | None]:
+    """
+    Evaluate every guard rule against one tool call.
+
+    Returns ("allow", None) or ("deny", reason).
+    """
+    tool = payload.get("tool_name", "")
+    tool_input = payload.get("tool_input") or {}
+
+    if tool not in EDIT_TOOLS and tool not in BASH_TOOLS:
+        return "allow", None
+
+    command = tool_input.get("command", "") if tool in BASH_TOOLS else ""
+    authorized = bool(command) and _AUTHORIZED_CMD.match(command) is not None
+
+    # error-lock: consecutive failures hard-lock edits and shell access
+    if not authorized and _error_count(project_root) >= ERROR_LOCK_THRESHOLD:
+        return "deny", (
+            "BLOCK: Error lock engaged after repeated failures. "
+            "STOP and report to the user; the next `fsm.py init` clears the lock."
+        )
+
+    if tool in EDIT_TOOLS:
+        file_path = tool_input.get("file_path") or tool_input.get("notebook_path") or ""
+        rel = _relative(file_path, project_root)
+        if rel is None:
+            return "allow", None
+
+        # protect-files: framework files are managed by the runtime
+        hit = _trie_match(_PROTECTED_TRIE, rel)
+        if hit:
+            return "deny", (
+                f"BLOCK: Cannot modify '{hit}' directly. This file is managed by the BEADS "
+                "runtime. All workflow operations must go through FSM commands via "
+                "/beads:run skill."
+            )
+
+        # workflow-guard: no source edits without an active bead
+        if _trie_match(_EXEMPT_TRIE, rel) is None:
+            if _read_guard_state(project_root).get("BEAD_ACTIVE") != "1":
+                return "deny", (
+                    f"BLOCK: No active bead — cannot edit '{rel}'. "
+                    "Start one with /beads:run (fsm.py init) before changing source code."
+                )
+        return "allow", None
+
+    # guard-bash: only authorized FSM/router calls may reference framework files
+    if authorized:
+        return "allow", None
+    match = _BASH_RULES.search(command)
+    if match:
+        if match.lastgroup == "protected":
+            return "deny", (
+                f"BLOCK: Command references protected path '{match.group()}'. Direct manipulation "
+                "of BEADS framework files is forbidden. Use the authorized FSM commands: "
+                "python3 .beads/bin/fsm.py <command>"
+            )
+        return "deny", "BLOCK: Redirect to .beads/ or .claude/ directory is forbidden."
+    return "allow", None
+
+
+# =============================================================================
+# SETTINGS INSTALLATION
+# =============================================================================
+
+def _route_event(settings: dict, event: str, scripts: tuple[str, ...], command: str) -> bool:
+    """Replace event's entries for scripts with one dispatcher entry. False if none."""
+    kept = []
+    matchers: list[str] = []
+    for entry in settings.get("hooks", {}).get(event, []):
+        hooks = entry.get("hooks", [])
+        if any(h.get("command") == command for h in hooks):
+            matchers.extend(entry.get("matcher", "").split("|"))
+            continue
+        remaining = [h for h in hooks if not any(s in h.get("command", "") for s in scripts)]
+        if len(remaining) != len(hooks):
+            matchers.extend(entry.get("matcher", "").split("|"))
+        if remaining:
+            kept.append({**entry, "hooks": remaining})
+
+    if not matchers:
+        return False
+
+    ordered = sorted({m for m in matchers if m}, key=lambda m: (m == "Bash", m))
+    kept.insert(0, {
+        "matcher": "|".join(ordered),
+        "hooks": [{"type": "command", "command": command, "timeout": 5}],
+    })
+    settings["hooks"][event] = kept
+    return True
+
+
+def render_hook_settings(settings_text: str, command: str = "beads-hook") -> str:
+    """
+    Rewrite .claude/settings.json so the guards go through the dispatcher.
+
+    Hook entries pointing at the replaced scripts (PreToolUse guards,
+    PostToolUse error-tracker.sh) are dropped and one dispatcher entry per
+    event covering all their matchers is registered instead. Other hooks
+    are left untouched.
+    """
+    settings = json.loads(settings_text)
+    routed = [
+        _route_event(settings, "PreToolUse", REPLACED_SCRIPTS, command),
+        _route_event(settings, "PostToolUse", REPLACED_POST_SCRIPTS, command),
+    ]
+    if not any(routed):
+        return settings_text
+    return json.dumps(settings, indent=2) + "\n"
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def main() -> None:
+    """Read one hook payload from stdin, exit 0 (allow / recorded) or 2 (deny)."""
+    started = time.perf_counter_ns()
+    try:
+        payload = json.loads(sys.stdin.read() or "{}")
+    except json.JSONDecodeError:
+        # Malformed payload is a harness problem, not a policy violation
+        sys.exit(0)
+
+    root = Path(os.environ.get("CLAUDE_PROJECT_DIR") or payload.get("cwd") or os.getcwd())
+    root = root.resolve()
+    if payload.get("hook_event_name") == "PostToolUse":
+        decision, reason = ("error" if track_error(payload, root) else "allow"), None
+    else:
+        decision, reason = evaluate(payload, root)
+    if is_enabled(root):
+        elapsed_us = (time.perf_counter_ns() - started) // 1000
+        record_hook(root, "beads-hook", payload.get("tool_name", ""), decision, elapsed_us)
+    if decision == "deny":
+        print(reason, file=sys.stderr)
+        sys.exit(2)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,32 @@ from pathlib import Path
 import shutil
 from datetime import datetime
 
+GITIGNORE_HEADER = "# Beads framework runtime state"
+GITIGNORE_ENTRIES = [
+    ".beads/fsm-state.json",
+    ".beads/fsm-state.backup.json",
+    ".beads/.plan-ready",
+    ".beads/.error-count",
+    ".beads/.guard-state",
+    ".beads/telemetry/",
+    ".beads/.sync-manifest.json",
+    ".beads/lib/beads/__pycache__/",
+    ".beads/worktrees/",
+    ".beads/ledger.lock",
+    ".beads/error-count.lock",
+    ".beads/ledger.db*",
+    ".beads/logs/",
+    ".beads/cache/",
+    ".beads/warm/",
+    ".beads/jobs/",
+    ".beads/results/",
+    ".beads/temp.md",
+]
+
 
-def initialize_project(project_root: Path, project_name: str, vision: str, goals: str = ""):
+def initialize_project(
+    project_root: Path, project_name: str, vision: str, goals: str = "", link: bool = False
+):
     """Initialize Beads framework in project directory.
 
     Creates:
@@ -14,13 +38,16 @@ def initialize_project(project_root: Path, project_name: str, vision: str, goals
     - Updates CLAUDE.md (or creates it)
     - Updates .gitignore
     - Installs /beads:* commands to ~/.claude/commands/ (global)
+
+    With link=True, framework files (FSM, hooks, skills, PROTOCOL) point into the
+    shared versioned install (~/.claude/beads/current) instead of being copied.
     """
 
     # 1. Copy template directories
-    _copy_templates(project_root)
+    _copy_templates(project_root, link=link)
 
     # 1b. Install global commands for Claude Code autocomplete
-    _install_global_commands()
+    _install_global_commands(link=link)
 
     # 2. Create empty ledger
     _create_ledger(project_root, project_name)
@@ -35,7 +62,7 @@ def initialize_project(project_root: Path, project_name: str, vision: str, goals
     _update_claude_md(project_root, project_name)
 
     # 5. Update .gitignore
-    _update_gitignore(project_root)
+    update_gitignore(project_root)
 
     # 6. Create .github attribution
     _create_github_attribution(project_root)
@@ -44,8 +71,14 @@ def initialize_project(project_root: Path, project_name: str, vision: str, goals
     _verify_init(project_root)
 
 
-def _install_global_commands():
-    """Install /beads:* commands to ~/.claude/commands/ for Claude Code autocomplete."""
+def _install_global_commands(link: bool = False):
+    """Install /beads:* commands to ~/.claude/commands/ for Claude Code autocomplete.
+
+    With link=True, commands are symlinks into the shared install, so they follow
+    every upgrade without being re-copied.
+    """
+    from beads.shared import current_dir, is_linked, link_file
+
     skills_src = Path(__file__).parent / "templates" / "project_init" / ".claude" / "skills"
     commands_dst = Path.home() / ".claude" / "commands"
     commands_dst.mkdir(parents=True, exist_ok=True)
@@ -53,18 +86,35 @@ def _install_global_commands():
     for skill_file in skills_src.glob("*.md"):
         # beads-plan-project.md → beads:plan-project.md
         command_name = skill_file.name.replace("beads-", "beads:", 1)
-        shutil.copy2(skill_file, commands_dst / command_name)
+        if link:
+            target = current_dir() / ".claude" / "skills" / skill_file.name
+            if not is_linked(commands_dst / command_name, target):
+                link_file(target, commands_dst / command_name)
+        else:
+            shutil.copy2(skill_file, commands_dst / command_name)
 
     print(f"  ✓ Installed /beads:* commands to {commands_dst}")
 
 
-def _copy_templates(project_root: Path):
-    """Copy template directories from package to project."""
+def _copy_templates(project_root: Path, link: bool = False):
+    """Copy template directories from package to project.
+
+    With link=True, files managed by `beads sync` are not copied; they are
+    linked into the shared install at the end instead.
+    """
+    from beads.sync import ENGINE_DIR, compile_engine, sync_project, _sync_entries
+
     template_root = Path(__file__).parent / "templates" / "project_init"
 
     if not template_root.exists():
         raise RuntimeError(f"Package templates not found at {template_root}. Reinstall claude-beads.")
 
+    linked = {rel for rel, _, _ in _sync_entries(template_root)} if link else set()
+
+    def _skip_linked(directory: str, names: list[str]) -> set[str]:
+        rel_dir = Path(directory).relative_to(template_root)
+        return {n for n in names if (rel_dir / n).as_posix() in linked}
+
     # Copy .beads/
     beads_src = template_root / ".beads"
     beads_dst = project_root / ".beads"
@@ -72,17 +122,29 @@ def _copy_templates(project_root: Path):
 
     for item in beads_src.iterdir():
         if item.is_file():
-            shutil.copy2(item, beads_dst / item.name)
+            if f".beads/{item.name}" not in linked:
+                shutil.copy2(item, beads_dst / item.name)
         elif item.is_dir() and item.name in ("templates", "bin"):
-            shutil.copytree(item, beads_dst / item.name, dirs_exist_ok=True)
+            shutil.copytree(item, beads_dst / item.name, dirs_exist_ok=True, ignore=_skip_linked)
+
+    # Copy engine modules (imported by the .beads/bin/ launchers, bytecode-cached)
+    for rel_path, src, _ in _sync_entries(template_root):
+        if rel_path.startswith(f"{ENGINE_DIR}/") and rel_path not in linked:
+            (project_root / rel_path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, project_root / rel_path)
+    if not link:
+        compile_engine(project_root)
 
     # Copy .claude/
     claude_src = template_root / ".claude"
     claude_dst = project_root / ".claude"
     claude_dst.mkdir(exist_ok=True)
 
-    shutil.copy2(claude_src / "skills.yaml", claude_dst / "skills.yaml")
-    shutil.copytree(claude_src / "skills", claude_dst / "skills", dirs_exist_ok=True)
+    if ".claude/skills.yaml" not in linked:
+        shutil.copy2(claude_src / "skills.yaml", claude_dst / "skills.yaml")
+    shutil.copytree(
+        claude_src / "skills", claude_dst / "skills", dirs_exist_ok=True, ignore=_skip_linked
+    )
 
     # Copy .claude/rules/ (modular rule files — keep CLAUDE.md lean)
     rules_src = claude_src / "rules"
@@ -95,9 +157,10 @@ def _copy_templates(project_root: Path):
     if not hooks_src.exists():
         raise RuntimeError(f"Hook scripts not found at {hooks_src}. Package may be corrupted — reinstall claude-beads.")
     hooks_dst = claude_dst / "hooks"
-    shutil.copytree(hooks_src, hooks_dst, dirs_exist_ok=True)
+    shutil.copytree(hooks_src, hooks_dst, dirs_exist_ok=True, ignore=_skip_linked)
     for hook in hooks_dst.glob("*.sh"):
-        hook.chmod(0o755)
+        if not hook.is_symlink():
+            hook.chmod(0o755)
 
     # Copy .claude/settings.json (hook registration) — mandatory, fail loudly if missing
     settings_src = claude_src / "settings.json"
@@ -105,7 +168,11 @@ def _copy_templates(project_root: Path):
         raise RuntimeError(f"settings.json not found at {settings_src}. Package may be corrupted — reinstall claude-beads.")
     settings_dst = claude_dst / "settings.json"
     if not settings_dst.exists():
-        shutil.copy2(settings_src, settings_dst)
+        if shutil.which("beads-hook"):
+            from beads.hook import render_hook_settings
+            settings_dst.write_text(render_hook_settings(settings_src.read_text()))
+        else:
+            shutil.copy2(settings_src, settings_dst)
     else:
         print("⚠️  .claude/settings.json already exists — hook config not merged automatically")
         print("    Manually ensure hooks are registered or delete settings.json and re-run beads init")
@@ -114,11 +181,17 @@ def _copy_templates(project_root: Path):
     planning_dst = project_root / ".planning"
     planning_dst.mkdir(exist_ok=True)
 
+    # Link framework files into the shared install (one manifest check, no copies)
+    if link:
+        sync_project(project_root, link=True)
+
 
 # Mandatory files that MUST exist after beads init
 _MANDATORY_FILES = [
     ".beads/bin/fsm.py",
     ".beads/bin/router.py",
+    ".beads/lib/beads/fsm.py",
+    ".beads/lib/beads/router.py",
     ".beads/PROTOCOL.md",
     ".beads/ledger.json",
     ".beads/config.yaml",
@@ -155,6 +228,7 @@ def _create_ledger(project_root: Path, project_name: str):
     import json
     data = {
         "_warning": "NEVER MANUALLY EDIT — managed by fsm.py only",
+        "version": 0,
         "project": {
             "name": project_name,
             "vision": "",
@@ -261,28 +335,23 @@ def _update_claude_md(project_root: Path, project_name: str):
         claude_md.write_text(content)
 
 
-def _update_gitignore(project_root: Path):
-    """Add Beads entries to .gitignore."""
-    gitignore = project_root / ".gitignore"
+def update_gitignore(project_root: Path, dry_run: bool = False) -> list[str]:
+    """Append the Beads entries missing from .gitignore, creating it if needed.
 
-    beads_entries = [
-        "",
-        "# Beads framework runtime state",
-        ".beads/fsm-state.json",
-        ".beads/fsm-state.backup.json",
-        ".beads/.plan-ready",
-        ".beads/.error-count",
-        ".beads/temp.md",
-        "",
-    ]
-
-    if gitignore.exists():
-        content = gitignore.read_text()
-        if ".beads/fsm-state.json" not in content:
-            content += "\n".join(beads_entries)
-            gitignore.write_text(content)
-    else:
-        gitignore.write_text("\n".join(beads_entries))
+    Called by init and by `beads sync`, so projects set up by an older version
+    pick up entries added since. Returns the entries added (with dry_run, the
+    ones that would be).
+    """
+    gitignore = project_root / ".gitignore"
+    content = gitignore.read_text() if gitignore.exists() else ""
+    present = {line.strip() for line in content.splitlines()}
+    missing = [entry for entry in GITIGNORE_ENTRIES if entry not in present]
+    if missing and not dry_run:
+        if content and not content.endswith("\n"):
+            content += "\n"
+        header = [] if GITIGNORE_HEADER in present else ["", GITIGNORE_HEADER]
+        gitignore.write_text(content + "\n".join([*header, *missing, ""]))
+    return missing
 
 
 def _create_github_attribution(project_root: Path):
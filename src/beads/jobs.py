@@ -0,0 +1,286 @@
+"""
+Background verification jobs.
+
+`fsm.py verify --background` snapshots the working tree (everything but
+.beads/, untracked files included) into a commit, checks it out in a
+temporary worktree and verifies there in a detached process:
+
+    .beads/jobs/<id>.json              job record (status, snapshot, result)
+    .beads/worktrees/job-<id>/         snapshot worktree while the job runs
+    refs/beads/jobs/<id>               keeps the snapshot commit alive
+
+Gitignored files (build outputs, in-project virtualenvs) are not part of
+the snapshot, so verify refuses background mode when the tool
+environment lives inside the project. Logs, test results and the
+duration cache are shared with the main tree. Nothing touches the FSM
+until `fsm.py wait <id>`: the result is applied (Verified Commit,
+transitions) only if the bead, its retry count and the working tree
+still match the snapshot; otherwise the job is marked stale and no
+retry is spent.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from beads.locking import atomic_write_text
+
+JOBS_DIR = Path(".beads/jobs")
+WORKTREES_DIR = Path(".beads/worktrees")
+REF_PREFIX = "refs/beads/jobs/"
+# symlinked from the job worktree back into the main .beads/
+_SHARED_DIRS = ("logs", "cache", "results")
+# Job process entry point (not `-m beads.jobs`: the package imports this module first)
+_RUN_JOB = (
+    "import sys, pathlib; from beads.jobs import run; run(pathlib.Path(sys.argv[1]), sys.argv[2])"
+)
+
+# running -> passed | failed | error, then applied | stale once waited for
+FINISHED = ("passed", "failed", "error")
+
+
+@dataclass
+class Job:
+    """One background verification."""
+    job_id: str
+    bead_id: str
+    command: Optional[str | dict[str, str]]  # str, or {name: cmd} named checks
+    tree: str  # snapshot tree of the working tree (without .beads/)
+    commit: str  # snapshot commit checked out in the job worktree
+    retry_count: int  # bead's retry count when the job started
+    timeout: Optional[float] = None
+    shards: int = 1
+    fail_fast: bool = True
+    status: str = "running"
+    pid: int = 0
+    started: str = ""
+    finished: Optional[str] = None
+    result: Optional[dict] = None  # VerifyResult fields
+    failed_tests: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def worktree(self) -> Path:
+        return WORKTREES_DIR / f"job-{self.job_id}"
+
+
+def _git(root: Path, *args: str, env: Optional[dict] = None) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], capture_output=True, text=True, cwd=root, env=env)
+
+
+def snapshot_tree(root: Path) -> str:
+    """Tree ID of the working tree as `git add -A` would stage it, .beads/ excluded."""
+    index = Path(_git(root, "rev-parse", "--git-path", "index").stdout.strip())
+    index = index if index.is_absolute() else root / index
+    tmp = root / JOBS_DIR / f".index.{os.getpid()}"
+    tmp.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if index.exists():
+            shutil.copyfile(index, tmp)  # reuse stat info: only changed files get hashed
+        env = {**os.environ, "GIT_INDEX_FILE": str(tmp.resolve())}
+        added = _git(root, "add", "-A", "--", ".", ":(exclude).beads", env=env)
+        if added.returncode != 0:
+            raise RuntimeError(f"git add failed: {added.stderr.strip()}")
+        tree = _git(root, "write-tree", env=env)
+        if tree.returncode != 0:
+            raise RuntimeError(f"git write-tree failed: {tree.stderr.strip()}")
+        return str(tree.stdout.strip())
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def job_path(root: Path, job_id: str) -> Path:
+    return root / JOBS_DIR / f"{job_id}.json"
+
+
+def save(root: Path, job: Job) -> None:
+    path = job_path(root, job.job_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(asdict(job), indent=2))
+
+
+def load(root: Path, job_id: str) -> Optional[Job]:
+    try:
+        return Job(**json.loads(job_path(root, job_id).read_text()))
+    except (OSError, json.JSONDecodeError, TypeError):
+        return None
+
+
+def list_jobs(root: Path) -> list[Job]:
+    """Every job, oldest first; running jobs whose process died are marked error."""
+    jobs = []
+    for path in (root / JOBS_DIR).glob("*.json") if (root / JOBS_DIR).is_dir() else []:
+        job = load(root, path.stem)
+        if job is not None:
+            jobs.append(refresh(root, job))
+    return sorted(jobs, key=lambda j: int(j.job_id) if j.job_id.isdigit() else 0)
+
+
+def refresh(root: Path, job: Job) -> Job:
+    """Reload a job; a running job whose process is gone becomes an error."""
+    job = load(root, job.job_id) or job
+    if job.status == "running" and job.pid and not _alive(job.pid):
+        job.status, job.error = "error", "job process exited without a result"
+        job.finished = _now()
+        save(root, job)
+        cleanup(root, job)
+    return job
+
+
+def create(
+    root: Path,
+    bead_id: str,
+    command: Optional[str | dict[str, str]],
+    retry_count: int,
+    state: dict,
+    timeout: Optional[float],
+    shards: int,
+    fail_fast: bool,
+) -> Job:
+    """Snapshot the tree, set up the job worktree and start the job process."""
+    tree = snapshot_tree(root)
+    head = _git(root, "rev-parse", "HEAD")
+    parents = ["-p", head.stdout.strip()] if head.returncode == 0 else []
+    message = f"beads: verify snapshot for {bead_id}"
+    commit = _git(root, "commit-tree", tree, *parents, "-m", message)
+    if commit.returncode != 0:
+        raise RuntimeError(f"git commit-tree failed: {commit.stderr.strip()}")
+
+    job = Job(
+        job_id=_reserve_id(root),
+        bead_id=bead_id,
+        command=command,
+        tree=tree,
+        commit=commit.stdout.strip(),
+        retry_count=retry_count,
+        timeout=timeout,
+        shards=shards,
+        fail_fast=fail_fast,
+        started=_now(),
+    )
+    try:
+        _git(root, "update-ref", REF_PREFIX + job.job_id, job.commit)
+        added = _git(root, "worktree", "add", "--detach", str(job.worktree), job.commit)
+        if added.returncode != 0:
+            raise RuntimeError(f"git worktree add failed: {added.stderr.strip()}")
+
+        beads = root / job.worktree / ".beads"
+        beads.mkdir(exist_ok=True)
+        atomic_write_text(beads / "fsm-state.json", json.dumps(state, indent=2))
+        for name in _SHARED_DIRS:
+            (root / ".beads" / name).mkdir(parents=True, exist_ok=True)
+            link = beads / name
+            if link.is_symlink() or link.exists():
+                shutil.rmtree(link) if link.is_dir() and not link.is_symlink() else link.unlink()
+            link.symlink_to((root / ".beads" / name).resolve(), target_is_directory=True)
+    except BaseException:
+        cleanup(root, job)
+        job_path(root, job.job_id).unlink(missing_ok=True)
+        raise
+
+    save(root, job)
+    package_dir = str(Path(__file__).resolve().parent.parent)
+    pythonpath = os.pathsep.join(filter(None, [package_dir, os.environ.get("PYTHONPATH")]))
+    log = open(root / JOBS_DIR / f"{job.job_id}.log", "ab")
+    try:
+        proc = subprocess.Popen(
+            [sys.executable, "-c", _RUN_JOB, str(root.resolve()), job.job_id],
+            cwd=root, stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True,
+            env={**os.environ, "PYTHONPATH": pythonpath},
+        )
+    finally:
+        log.close()
+    job.pid = proc.pid
+    save(root, job)
+    return job
+
+
+def _reserve_id(root: Path) -> str:
+    """Next job id, claimed by creating its record (concurrent starts never share one)."""
+    (root / JOBS_DIR).mkdir(parents=True, exist_ok=True)
+    existing = [int(p.stem) for p in (root / JOBS_DIR).glob("*.json") if p.stem.isdigit()]
+    n = max(existing, default=0) + 1
+    while True:
+        try:
+            os.close(os.open(job_path(root, str(n)), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return str(n)
+        except FileExistsError:
+            n += 1
+
+
+def run(root: Path, job_id: str) -> None:
+    """Job process: verify in the snapshot worktree and record the result."""
+    from beads.engine import BeadsError, Engine
+
+    job = load(root, job_id)
+    if job is None:
+        return
+    try:
+        engine = Engine(root / job.worktree)
+        result = engine._run_verification(job.command, job.timeout, None, job.fail_fast, job.shards)
+        data = asdict(result)
+        data.pop("commit", None)
+        data.pop("transitions", None)
+        job.result = data
+        job.failed_tests = engine._require_context().failed_tests
+        job.status = "passed" if result.passed else "failed"
+    except BeadsError as e:
+        job.status, job.error = "error", str(e)
+    except Exception as e:
+        job.status, job.error = "error", repr(e)
+    finally:
+        if job.status == "running":  # interrupted (KeyboardInterrupt, SystemExit)
+            job.status, job.error = "error", "job process interrupted"
+        job.finished = _now()
+        save(root, job)
+        cleanup(root, job)
+
+
+def cleanup(root: Path, job: Job) -> None:
+    """Remove the job worktree and its snapshot ref (the job record stays)."""
+    _git(root, "worktree", "remove", "--force", str(job.worktree))
+    if (root / job.worktree).exists():
+        shutil.rmtree(root / job.worktree, ignore_errors=True)
+        _git(root, "worktree", "prune")
+    _git(root, "update-ref", "-d", REF_PREFIX + job.job_id)
+
+
+def wait(
+    root: Path, job_id: str, timeout: Optional[float] = None, poll: float = 0.5
+) -> Optional[Job]:
+    """Block until the job leaves running (or timeout); None for an unknown job."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        job = load(root, job_id)
+        if job is None:
+            return None
+        job = refresh(root, job)
+        if job.status != "running" or (deadline is not None and time.monotonic() >= deadline):
+            return job
+        time.sleep(poll)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # A finished child of this very process lingers as a zombie until reaped
+    try:
+        reaped, _ = os.waitpid(pid, os.WNOHANG)
+        return reaped == 0
+    except ChildProcessError:
+        return True
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,234 @@
+"""
+SQLite ledger backend (.beads/ledger.db).
+
+Opt-in store for projects that outgrow ledger.json. The database is the
+source of truth; ledger.json is re-exported (atomic tmp → rename) inside
+every write transaction, so hooks, the dashboard and humans keep reading
+the same file.
+
+Tables:
+  meta         top-level ledger keys (project, active_bead, version, ...) as JSON
+  beads        one row per bead, indexed by phase and status
+  phases       roadmap entries in order
+  transitions  append-only bead status history
+
+WAL mode: readers never block the writer and vice versa. Writers serialize
+on BEGIN IMMEDIATE and only touch rows that changed.
+"""
+
+import copy
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+from beads.locking import VERSION_KEY, atomic_write_text
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS beads (
+    bead_id TEXT PRIMARY KEY,
+    phase TEXT,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS beads_phase_status ON beads (phase, status);
+CREATE INDEX IF NOT EXISTS beads_status ON beads (status);
+CREATE TABLE IF NOT EXISTS phases (
+    position INTEGER PRIMARY KEY,
+    phase TEXT,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS phases_phase ON phases (phase);
+CREATE TABLE IF NOT EXISTS transitions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bead_id TEXT NOT NULL,
+    from_status TEXT,
+    to_status TEXT NOT NULL,
+    at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transitions_bead ON transitions (bead_id, id);
+"""
+
+# Top-level keys stored in their own tables; meta keeps a NULL placeholder for key order
+_TABLE_KEYS = ("beads", "roadmap")
+
+
+class LedgerDB:
+    """Ledger stored in SQLite, exported to ledger.json on every write."""
+
+    Error = sqlite3.Error
+
+    def __init__(self, path: Path, export_path: Optional[Path] = None):
+        self.path = path
+        self.export_path = export_path
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @classmethod
+    def create(cls, path: Path, data: dict, export_path: Optional[Path] = None) -> 'LedgerDB':
+        """Create ledger.db from a ledger dict (fails if it already exists)."""
+        if path.exists():
+            raise FileExistsError(f"{path} already exists")
+        db = cls(path, export_path)
+        conn = db._connect()
+        try:
+            conn.executescript(_SCHEMA)
+            conn.execute("BEGIN IMMEDIATE")
+            db._write(conn, {}, data)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.close()
+            path.unlink(missing_ok=True)
+            raise
+        conn.close()
+        return db
+
+    # -- reads (never block writers) ------------------------------------------
+
+    def load(self) -> dict:
+        """The whole ledger as the dict ledger.json would hold."""
+        conn = self._connect()
+        try:
+            return self._load(conn)
+        finally:
+            conn.close()
+
+    def bead(self, bead_id: str) -> Optional[dict]:
+        """One bead's ledger entry, or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT data FROM beads WHERE bead_id = ?", (bead_id,)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def beads(self, phase: Optional[str] = None, status: Optional[str] = None) -> dict[str, dict]:
+        """Bead entries filtered by phase and/or status (indexed lookups)."""
+        clauses, params = [], []
+        if phase is not None:
+            clauses.append("phase = ?")
+            params.append(phase)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        conn = self._connect()
+        try:
+            query = f"SELECT bead_id, data FROM beads{where} ORDER BY rowid"
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+        return {bid: json.loads(data) for bid, data in rows}
+
+    def transitions(self, bead_id: str) -> list[dict]:
+        """Status history of one bead, oldest first."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT from_status, to_status, at FROM transitions WHERE bead_id = ? ORDER BY id",
+                (bead_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [{"from": f, "to": t, "at": at} for f, t, at in rows]
+
+    # -- writes ----------------------------------------------------------------
+
+    def update(self, mutate: Callable[[dict], T]) -> tuple[T, dict]:
+        """
+        Apply mutate to the ledger in one write transaction and export
+        ledger.json before committing. Returns (mutate's result, new ledger).
+        An exception from mutate rolls back and propagates.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            before = self._load(conn)
+            data = copy.deepcopy(before)
+            outcome = mutate(data)
+            data[VERSION_KEY] = int(before.get(VERSION_KEY, 0)) + 1
+            self._write(conn, before, data)
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return outcome, data
+
+    def export(self, data: Optional[dict] = None) -> None:
+        """Write ledger.json from the database (or from data already loaded)."""
+        if self.export_path is not None:
+            exported = data if data is not None else self.load()
+            atomic_write_text(self.export_path, json.dumps(exported, indent=2))
+
+    # -- internals -------------------------------------------------------------
+
+    def _load(self, conn: sqlite3.Connection) -> dict:
+        data: dict = {}
+        for key, value in conn.execute("SELECT key, value FROM meta ORDER BY rowid"):
+            data[key] = None if key in _TABLE_KEYS else json.loads(value)
+        rows = conn.execute("SELECT bead_id, data FROM beads ORDER BY rowid")
+        data["beads"] = {bid: json.loads(raw) for bid, raw in rows}
+        if "roadmap" in data:
+            phases = conn.execute("SELECT data FROM phases ORDER BY position")
+            data["roadmap"] = [json.loads(raw) for (raw,) in phases]
+        return data
+
+    def _write(self, conn: sqlite3.Connection, before: dict, after: dict) -> None:
+        """Persist only what differs between before and after, then export."""
+        for key, value in after.items():
+            stored = None if key in _TABLE_KEYS else json.dumps(value)
+            if key not in before:
+                conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, stored))
+            elif key not in _TABLE_KEYS and before[key] != value:
+                conn.execute("UPDATE meta SET value = ? WHERE key = ?", (stored, key))
+        for key in before.keys() - after.keys():
+            conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        old_beads, new_beads = before.get("beads") or {}, after.get("beads") or {}
+        for bid, entry in new_beads.items():
+            old = old_beads.get(bid)
+            if old == entry:
+                continue
+            conn.execute(
+                "INSERT INTO beads (bead_id, phase, status, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (bead_id) DO UPDATE SET "
+                "phase = excluded.phase, status = excluded.status, data = excluded.data",
+                (bid, entry.get("phase"), entry.get("status"), json.dumps(entry)),
+            )
+            old_status = old.get("status") if old else None
+            if entry.get("status") and entry.get("status") != old_status:
+                conn.execute(
+                    "INSERT INTO transitions (bead_id, from_status, to_status, at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (bid, old_status, entry["status"], now),
+                )
+        for bid in old_beads.keys() - new_beads.keys():
+            conn.execute("DELETE FROM beads WHERE bead_id = ?", (bid,))
+
+        if before.get("roadmap") != after.get("roadmap"):
+            conn.execute("DELETE FROM phases")
+            conn.executemany(
+                "INSERT INTO phases (position, phase, status, data) VALUES (?, ?, ?, ?)",
+                [
+                    (i, entry.get("phase"), entry.get("status"), json.dumps(entry))
+                    for i, entry in enumerate(after.get("roadmap") or [])
+                ],
+            )
+
+        self.export(after)
@@ -0,0 +1,124 @@
+"""
+Concurrency control for shared .beads/ state.
+
+Several writers touch the same files — fsm.py in the main tree, parallel
+worktree runs, hooks, the dashboard. Rules:
+
+  - Readers never lock. Every write replaces the file atomically
+    (tmp → rename), so a reader sees either the old or the new content.
+  - Writers read, modify, then commit under an fcntl advisory lock only if
+    the file's `version` is still the one they read (compare-and-swap);
+    otherwise they re-read and retry. The lock is held only for the
+    check-and-rename, never while the mutation is computed.
+  - Counters (.beads/.error-count) are incremented/reset under their own lock.
+
+The beads-hook dispatcher counts failed tool calls with increment_counter;
+shell hooks take the same locks with flock(1):
+
+    flock "$CLAUDE_PROJECT_DIR/.beads/error-count.lock" sh -c '...'
+
+On platforms without fcntl the locks are no-ops — single-session use is
+unaffected.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Iterator, Optional, TypeVar
+
+fcntl: Optional[ModuleType]
+try:
+    import fcntl as _fcntl
+    fcntl = _fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+LEDGER_LOCK = Path(".beads/ledger.lock")
+ERROR_COUNT_LOCK = Path(".beads/error-count.lock")
+VERSION_KEY = "version"
+MAX_CAS_RETRIES = 8
+
+T = TypeVar("T")
+
+
+class ConflictError(RuntimeError):
+    """Compare-and-swap kept losing to concurrent writers."""
+
+
+@contextmanager
+def file_lock(lock_path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on lock_path for the duration of the block."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write via a per-process tmp file and rename over path."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(text)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def read_versioned(path: Path) -> tuple[dict, int]:
+    """Lock-free read. Returns (data, version); a missing version counts as 0."""
+    data = json.loads(path.read_text())
+    return data, int(data.get(VERSION_KEY, 0))
+
+
+def cas_update(
+    path: Path,
+    lock_path: Path,
+    mutate: Callable[[dict], T],
+    retries: int = MAX_CAS_RETRIES,
+) -> tuple[T, dict]:
+    """
+    Apply mutate to the JSON document at path with optimistic concurrency.
+
+    mutate receives a freshly read copy and may be called more than once,
+    so it must only change the dict it is given. Returns (mutate's result,
+    written document). Raises ConflictError after `retries` lost races;
+    FileNotFoundError / json.JSONDecodeError / OSError propagate.
+    """
+    for attempt in range(retries):
+        data, version = read_versioned(path)
+        outcome = mutate(data)
+        with file_lock(lock_path):
+            _, current = read_versioned(path)
+            if current == version:
+                data[VERSION_KEY] = version + 1
+                atomic_write_text(path, json.dumps(data, indent=2))
+                return outcome, data
+        time.sleep(0.005 * (2 ** attempt))
+    raise ConflictError(f"{path.name}: gave up after {retries} concurrent-write conflicts")
+
+
+def increment_counter(path: Path, lock_path: Path) -> int:
+    """Add one to an integer file (missing or garbage counts as 0). Returns the new value."""
+    with file_lock(lock_path):
+        try:
+            value = int(path.read_text().strip())
+        except (OSError, ValueError):
+            value = 0
+        atomic_write_text(path, f"{value + 1}\n")
+        return value + 1
+
+
+def reset_counter(path: Path, lock_path: Path) -> None:
+    """Remove an integer counter file."""
+    with file_lock(lock_path):
+        path.unlink(missing_ok=True)
@@ -0,0 +1,106 @@
+"""
+In-memory ledger model.
+
+One pass over the ledger dict builds slotted records plus the indexes
+every reader needs, so lookups stop re-scanning nested dicts:
+
+    ledger = Ledger.from_dict(json.loads(path.read_text()))
+    ledger.bead("02-03")            # O(1)
+    ledger.in_phase("02")           # phase -> beads index
+    ledger.with_status("pending")   # status -> beads index
+    ledger.is_phase_closed("01")    # O(1)
+
+Records reference the ledger's own entry dicts instead of copying them.
+The model is read-only: writers keep mutating the dict through
+Engine._update_ledger.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from beads.shards import ROLLUP_KEY
+
+
+@dataclass(slots=True)
+class Bead:
+    """One ledger bead entry."""
+    bead_id: str
+    phase: str
+    status: Optional[str]
+    data: dict  # the ledger entry itself (not copied)
+
+
+@dataclass(slots=True)
+class Phase:
+    """One roadmap entry."""
+    phase: str
+    status: Optional[str]
+    data: dict
+
+
+@dataclass(slots=True)
+class Ledger:
+    """Indexed, read-only view of a ledger dict."""
+    data: dict
+    beads: dict[str, Bead] = field(default_factory=dict)
+    phases: dict[str, Phase] = field(default_factory=dict)  # roadmap order
+    by_phase: dict[str, list[Bead]] = field(default_factory=dict)
+    by_status: dict[Optional[str], list[Bead]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Ledger':
+        ledger = cls(data)
+        for bid, info in (data.get("beads") or {}).items():
+            bead = Bead(bid, str(info.get("phase") or bid[:2]), info.get("status"), info)
+            ledger.beads[bid] = bead
+            ledger.by_phase.setdefault(bead.phase, []).append(bead)
+            ledger.by_status.setdefault(bead.status, []).append(bead)
+        for entry in data.get("roadmap") or []:
+            if entry.get("phase"):
+                num = str(entry["phase"])
+                ledger.phases.setdefault(num, Phase(num, entry.get("status"), entry))
+        return ledger
+
+    @classmethod
+    def load(cls, path: Path) -> 'Ledger':
+        """Parse a ledger.json. Raises OSError / json.JSONDecodeError."""
+        return cls.from_dict(json.loads(path.read_text()))
+
+    @property
+    def active_bead(self) -> Optional[str]:
+        return self.data.get("active_bead")
+
+    @property
+    def project(self) -> dict:
+        return self.data.get("project") or {}
+
+    @property
+    def rollup(self) -> dict[str, dict]:
+        """Closed-phase count rollup (see beads.shards)."""
+        return self.data.get(ROLLUP_KEY) or {}
+
+    def bead(self, bead_id: str) -> Optional[Bead]:
+        return self.beads.get(bead_id)
+
+    def in_phase(self, phase: str) -> list[Bead]:
+        return self.by_phase.get(phase, [])
+
+    def with_status(self, status: Optional[str]) -> list[Bead]:
+        return self.by_status.get(status, [])
+
+    def count(self, status: Optional[str] = None) -> int:
+        """Beads in the active ledger, optionally only those with status."""
+        return len(self.beads) if status is None else len(self.with_status(status))
+
+    def is_phase_closed(self, phase: str) -> bool:
+        entry = self.phases.get(phase)
+        return entry is not None and entry.status == "closed"
+
+    def closed_phases(self) -> list[str]:
+        return sorted(num for num, entry in self.phases.items() if entry.status == "closed")
+
+    def statuses(self) -> dict[str, Optional[str]]:
+        """bead ID -> status."""
+        return {bid: bead.status for bid, bead in self.beads.items()}
@@ -0,0 +1,252 @@
+"""
+Parallel bead execution in isolated git worktrees.
+
+Every ready bead in a phase (dependencies complete, see beads.scheduler)
+gets its own worktree and branch:
+
+    .beads/worktrees/02-03/      git worktree on branch beads/02-03
+    .beads/worktrees/02-03.log   agent output
+
+and its own FSM state (fsm-state.json lives in the worktree). An agent
+command runs in each worktree under a concurrency limit; it is expected to
+drive the bead through `fsm.py init` / `fsm.py verify` there. Beads whose
+worktree ledger ends at `complete` are merged back into the main tree in
+dependency order, the main ledger is updated under the ledger lock, and
+newly unblocked beads are started. Merge conflicts abort that merge and
+leave the worktree in place for manual resolution.
+"""
+
+import os
+import shutil
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from beads.engine import BeadsError, Engine, GitError, State
+from beads.scheduler import BeadGraph, CycleError, ledger_statuses
+
+WORKTREES_DIR = Path(".beads/worktrees")
+BRANCH_PREFIX = "beads/"
+DEFAULT_AGENT_CMD = 'claude -p "/beads:run {bead_id}"'
+DEFAULT_JOBS = 3
+
+# Per-session runtime state never copied into a worktree
+_RUNTIME_IGNORE = shutil.ignore_patterns(
+    "worktrees", "fsm-state.json", "fsm-state.backup.json", ".error-count",
+    ".guard-state", ".plan-ready", "telemetry", "*.lock", "__pycache__",
+    "ledger.db", "ledger.db-*", "logs", "warm", "jobs", "results",
+)
+
+
+@dataclass
+class BeadRun:
+    """One bead executed in its own worktree."""
+    bead_id: str
+    worktree: Path
+    branch: str
+    log: Path
+    returncode: Optional[int] = None
+    status: Optional[str] = None  # bead status in the worktree ledger after the agent exited
+    outcome: str = "running"  # merged | failed | conflict | error
+    conflicts: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class ParallelResult:
+    """Outcome of one run-parallel invocation."""
+    phase: str
+    runs: list[BeadRun] = field(default_factory=list)  # in merge order
+    blocked: dict[str, list[str]] = field(default_factory=dict)  # bead -> unmet dependencies
+
+
+class ParallelRunner:
+    """Run the ready beads of one phase concurrently, one worktree each."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        agent_cmd: str = DEFAULT_AGENT_CMD,
+        jobs: int = DEFAULT_JOBS,
+        on_event: Optional[Callable[[str, BeadRun], None]] = None,
+    ):
+        self.engine = engine
+        self.root = engine.root
+        self.agent_cmd = agent_cmd
+        self.jobs = max(1, jobs)
+        self.on_event = on_event or (lambda event, run: None)
+
+    def _git(self, *args: str, cwd: Optional[Path] = None) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", *args], capture_output=True, text=True, cwd=cwd or self.root)
+
+    def run(self, phase: str) -> ParallelResult:
+        """Execute every schedulable bead of the phase; returns when none can start."""
+        phase = phase.zfill(2)
+        self._check_main_tree()
+        self.engine.register_phase_beads(phase)
+
+        result = ParallelResult(phase=phase)
+        attempted: set[str] = set()
+        running: dict[Future, BeadRun] = {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while True:
+                graph, statuses = self._graph()
+                for bead_id in self._startable(graph, statuses, phase, attempted):
+                    if len(running) >= self.jobs:
+                        break
+                    attempted.add(bead_id)
+                    run = self._prepare(bead_id, graph)
+                    if run.outcome == "error":
+                        result.runs.append(run)
+                        self.on_event("error", run)
+                        continue
+                    self.on_event("start", run)
+                    running[pool.submit(self._execute, run, graph)] = run
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                finished = [running.pop(future) for future in done]
+                for run in sorted(finished, key=lambda r: self._topo_index(graph, r.bead_id)):
+                    self._finish(run)
+                    result.runs.append(run)
+                    self.on_event(run.outcome, run)
+
+        graph, statuses = self._graph()
+        for bead_id in sorted(graph.nodes):
+            if graph.nodes[bead_id].phase == phase and statuses.get(bead_id) == "pending":
+                unmet = graph.unmet(bead_id, statuses)
+                if unmet:
+                    result.blocked[bead_id] = unmet
+        return result
+
+    # -- scheduling ----------------------------------------------------------
+
+    def _graph(self) -> tuple[BeadGraph, dict]:
+        data = self.engine.load_ledger()
+        graph = BeadGraph.from_project(self.root, data)
+        return graph, ledger_statuses(data, graph)
+
+    def _startable(
+        self, graph: BeadGraph, statuses: dict, phase: str, attempted: set[str]
+    ) -> list[str]:
+        """Ready pending beads of the phase, longest critical path first."""
+        ready = [
+            bid for bid in graph.ready(statuses)
+            if graph.nodes[bid].phase == phase
+            and statuses.get(bid) == "pending"
+            and bid not in attempted
+        ]
+        try:
+            lengths = graph.critical_path(statuses)
+        except CycleError:
+            lengths = {}
+        return sorted(ready, key=lambda bid: (-lengths.get(bid, 1), bid))
+
+    def _topo_index(self, graph: BeadGraph, bead_id: str) -> tuple[int, str]:
+        try:
+            return graph.topological_order().index(bead_id), bead_id
+        except CycleError:
+            return 0, bead_id
+
+    def _check_main_tree(self) -> None:
+        """Merges need a clean main tree (framework runtime under .beads/ excepted)."""
+        context = self.engine.context
+        if context and context.current_state not in (State.COMPLETE.value, State.FAILED.value):
+            raise BeadsError(f"Bead {context.bead_id} is active in the main tree — finish it first")
+        status = self._git("status", "--porcelain", "--untracked-files=no", "--", ".", ":!.beads")
+        if status.returncode != 0:
+            raise GitError("Git repository not initialized.")
+        if status.stdout.strip():
+            raise BeadsError(
+                "Main working tree has uncommitted changes — commit or stash them first"
+            )
+
+    # -- one bead ------------------------------------------------------------
+
+    def _prepare(self, bead_id: str, graph: BeadGraph) -> BeadRun:
+        """Create the worktree and copy framework runtime into it."""
+        worktree = self.root / WORKTREES_DIR / bead_id
+        run = BeadRun(
+            bead_id=bead_id,
+            worktree=worktree,
+            branch=f"{BRANCH_PREFIX}{bead_id}",
+            log=worktree.with_suffix(".log"),
+        )
+        if worktree.exists():
+            run.outcome = "error"
+            run.error = f"{worktree} already exists — resolve it, then `git worktree remove` it"
+            return run
+
+        added = self._git("worktree", "add", "-B", run.branch, str(worktree), "HEAD")
+        if added.returncode != 0:
+            run.outcome = "error"
+            run.error = f"git worktree add failed: {added.stderr.strip()}"
+            return run
+
+        # Framework runtime may be untracked or stale at HEAD — mirror the main tree's copy
+        beads_src, claude_src = self.root / ".beads", self.root / ".claude"
+        shutil.copytree(beads_src, worktree / ".beads", dirs_exist_ok=True, ignore=_RUNTIME_IGNORE)
+        if claude_src.is_dir():
+            shutil.copytree(
+                claude_src, worktree / ".claude", dirs_exist_ok=True, ignore=_RUNTIME_IGNORE
+            )
+        # Keep copied runtime (ledger.json included) out of the bead's commits;
+        # the main ledger is updated on merge
+        listed = self._git("ls-files", "-m", "--", ".beads", ".claude", cwd=worktree)
+        modified = listed.stdout.split()
+        if modified:
+            self._git("update-index", "--skip-worktree", *modified, cwd=worktree)
+        return run
+
+    def _execute(self, run: BeadRun, graph: BeadGraph) -> BeadRun:
+        """Run the agent command in the worktree (worker thread)."""
+        node = graph.nodes[run.bead_id]
+        bead_path = node.path.relative_to(self.root) if node.path else ""
+        cmd = self.agent_cmd.format(bead_id=run.bead_id, bead_path=bead_path, worktree=run.worktree)
+        env = {
+            **os.environ,
+            "CLAUDE_PROJECT_DIR": str(run.worktree.resolve()),
+            "BEADS_BEAD_ID": run.bead_id,
+            "BEADS_WORKTREE": "1",
+        }
+        with open(run.log, "w") as log:
+            proc = subprocess.run(
+                cmd, shell=True, cwd=run.worktree, env=env, stdout=log, stderr=subprocess.STDOUT
+            )
+        run.returncode = proc.returncode
+        return run
+
+    def _finish(self, run: BeadRun) -> None:
+        """Merge a verified bead back, or record why it was not merged (main thread)."""
+        worktree_engine = Engine(run.worktree)
+        try:
+            run.status = ledger_statuses(worktree_engine.load_ledger()).get(run.bead_id)
+        except BeadsError as e:
+            run.outcome, run.error = "error", str(e)
+            return
+
+        if run.status != State.COMPLETE.value:
+            run.outcome = "failed"
+            if run.status == State.FAILED.value:
+                self.engine.set_bead_status(run.bead_id, State.FAILED.value)
+            return
+
+        message = f"beads({run.bead_id}): merge worktree"
+        merged = self._git("merge", "--no-ff", "--no-edit", "-m", message, run.branch)
+        if merged.returncode != 0:
+            unmerged = self._git("diff", "--name-only", "--diff-filter=U")
+            run.conflicts = [f for f in unmerged.stdout.splitlines() if f]
+            self._git("merge", "--abort")
+            run.outcome = "conflict"
+            run.error = merged.stderr.strip() or merged.stdout.strip()
+            return
+
+        self.engine.set_bead_status(run.bead_id, State.COMPLETE.value)
+        self._git("worktree", "remove", "--force", str(run.worktree))
+        self._git("branch", "-D", run.branch)
+        run.outcome = "merged"
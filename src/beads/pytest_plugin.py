@@ -0,0 +1,136 @@
+"""
+Beads pytest plugin: structured per-test results for verify.
+
+Synced to .beads/lib/pytest/beads_pytest_plugin.py; verify puts that
+directory on PYTHONPATH, loads it into every pytest process through
+PYTEST_PLUGINS and names the attempt's results file in BEADS_RESULTS:
+
+    .beads/results/<bead>-<attempt>.json
+    {"exitstatus": 1, "duration": 3.21, "runs": 2,
+     "summary": {"passed": 41, "failed": 1, "error": 0, "skipped": 2, "xfailed": 0, "xpassed": 0},
+     "collection_errors": ["tests/test_b.py"],
+     "tests": [{"nodeid": "tests/test_a.py::test_x", "outcome": "failed", "when": "call",
+                "duration": 0.12}, ...]}
+
+Every pytest process of an attempt (failed-first, then the full command;
+or concurrent shards) merges into the same file under a lock; a node ID
+keeps its latest outcome. BEADS_RESULTS may list several files
+(os.pathsep-separated): a named check also reports into its own file.
+Without BEADS_RESULTS the plugin does nothing.
+
+Runs inside the project's environment: standard library only.
+"""
+
+import json
+import os
+import time
+import warnings
+
+RESULTS_ENV = "BEADS_RESULTS"
+OUTCOMES = ("passed", "failed", "error", "skipped", "xfailed", "xpassed")
+_NOTHING_RUN = (4, 5)  # a failed-first run whose node IDs are gone: the full run decides
+
+
+def pytest_configure(config):
+    paths = [p for p in os.environ.get(RESULTS_ENV, "").split(os.pathsep) if p]
+    if paths and not hasattr(config, "workerinput"):  # xdist workers report to the controller
+        config.pluginmanager.register(_Recorder(paths), "beads-results")
+
+
+class _Recorder:
+    """Collects reports during the session and writes them at the end."""
+
+    def __init__(self, paths):
+        self.paths = list(dict.fromkeys(paths))
+        self.start = time.monotonic()
+        self.tests = {}
+        self.collection_errors = []
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self.collection_errors.append(report.nodeid or "<session>")
+
+    def pytest_runtest_logreport(self, report):
+        entry = self.tests.setdefault(
+            report.nodeid, {"nodeid": report.nodeid, "outcome": None, "when": None, "duration": 0.0}
+        )
+        entry["duration"] = round(entry["duration"] + report.duration, 6)
+        outcome = _outcome(report)
+        if outcome is None:
+            return
+        # setup/teardown errors never hide the call outcome of a failed test
+        if report.when == "call" or entry["outcome"] in (None, "passed"):
+            entry["outcome"], entry["when"] = outcome, report.when
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        tests = [
+            {**entry, "outcome": entry["outcome"] or "passed", "when": entry["when"] or "call"}
+            for entry in self.tests.values()
+        ]
+        run = {
+            "exitstatus": int(exitstatus),
+            "duration": round(time.monotonic() - self.start, 3),
+            "collection_errors": self.collection_errors,
+            "tests": tests,
+        }
+        for path in self.paths:
+            try:
+                _merge_write(path, run)
+            except OSError as e:
+                warnings.warn(f"beads: could not write test results to {path}: {e}")
+
+
+def _outcome(report):
+    """Outcome a report phase implies, or None (a passing setup/teardown)."""
+    if hasattr(report, "wasxfail"):
+        return "xfailed" if report.skipped else "xpassed" if report.passed else "failed"
+    if report.skipped:
+        return "skipped"
+    if report.failed:
+        return "failed" if report.when == "call" else "error"
+    return "passed" if report.when == "call" else None
+
+
+def _combined_exit(previous, current):
+    """Exit status of the attempt so far: any real failure wins over success."""
+    if previous is None:
+        return current
+    codes = (int(previous), current)
+    failing = [c for c in codes if c != 0 and c not in _NOTHING_RUN]
+    return max(failing) if failing else min(codes)
+
+
+def _merge_write(path, run):
+    """Fold one pytest run into the results file (read-modify-write under a lock)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as lock:
+        try:
+            import fcntl
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        except ImportError:  # pragma: no cover - Windows: runs of one attempt don't overlap there
+            pass
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        tests = {t["nodeid"]: t for t in data.get("tests") or []}
+        tests.update((t["nodeid"], t) for t in run["tests"])
+        errors = list(data.get("collection_errors") or [])
+        errors += [e for e in run["collection_errors"] if e not in errors]
+        summary = dict.fromkeys(OUTCOMES, 0)
+        for test in tests.values():
+            summary[test["outcome"]] = summary.get(test["outcome"], 0) + 1
+        merged = {
+            "exitstatus": _combined_exit(data.get("exitstatus"), run["exitstatus"]),
+            "duration": round(float(data.get("duration") or 0) + run["duration"], 3),
+            "runs": int(data.get("runs") or 0) + 1,
+            "summary": summary,
+            "collection_errors": errors,
+            "tests": list(tests.values()),
+        }
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(merged, f, indent=1)
+        os.replace(tmp, path)
@@ -0,0 +1,95 @@
+"""
+Structured test results of verification attempts.
+
+verify runs pytest with the bundled plugin (beads.pytest_plugin, synced
+to .beads/lib/pytest/) which writes one file per attempt:
+
+    .beads/results/<bead>-<attempt>.json
+
+The compact TestSummary of the latest attempt is kept in fsm-state.json
+and on the bead's ledger entry ("tests"). Commands that run no pytest
+leave no results file and no summary.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+RESULTS_DIR = Path(".beads/results")
+PLUGIN_DIR = Path(".beads/lib/pytest")
+PLUGIN_MODULE = "beads_pytest_plugin"
+RESULTS_ENV = "BEADS_RESULTS"  # beads.pytest_plugin.RESULTS_ENV
+
+
+@dataclass
+class TestSummary:
+    """Counts of one attempt's pytest results."""
+    results: str  # .beads/results/<bead>-<attempt>.json
+    passed: int = 0
+    failed: int = 0
+    errors: int = 0  # setup/teardown errors
+    skipped: int = 0
+    xfailed: int = 0
+    xpassed: int = 0
+    collection_errors: list[str] = field(default_factory=list)  # files pytest could not import
+    duration: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.passed + self.failed + self.errors + self.skipped + self.xfailed + self.xpassed
+
+
+def results_path(root: Path, bead_id: str, log_path: Path) -> Path:
+    """.beads/results/<bead>-<attempt>.json for the attempt logging to <attempt>.log."""
+    return root / RESULTS_DIR / f"{bead_id}-{log_path.stem}.json"
+
+
+def plugin_environ(env: dict, root: Path, path: Path) -> dict:
+    """env with the plugin loaded into pytest and writing to path (env itself when not synced)."""
+    plugin_dir = root / PLUGIN_DIR
+    if not (plugin_dir / f"{PLUGIN_MODULE}.py").exists():
+        return env
+    env = dict(env)
+    pythonpath = [str(plugin_dir.resolve()), env.get("PYTHONPATH")]
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, pythonpath))
+    plugins = [p for p in env.get("PYTEST_PLUGINS", "").split(",") if p.strip()]
+    env["PYTEST_PLUGINS"] = ",".join([*plugins, PLUGIN_MODULE])
+    env[RESULTS_ENV] = str(path.resolve())
+    return env
+
+
+def summarize(root: Path, path: Path) -> Optional[TestSummary]:
+    """Summary of a results file; None when no pytest run wrote one."""
+    Path(f"{path}.lock").unlink(missing_ok=True)
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    counts = data.get("summary") or {}
+    return TestSummary(
+        results=str(path.relative_to(root)),
+        passed=int(counts.get("passed", 0)),
+        failed=int(counts.get("failed", 0)),
+        errors=int(counts.get("error", 0)),
+        skipped=int(counts.get("skipped", 0)),
+        xfailed=int(counts.get("xfailed", 0)),
+        xpassed=int(counts.get("xpassed", 0)),
+        collection_errors=list(data.get("collection_errors") or []),
+        duration=float(data.get("duration") or 0.0),
+    )
+
+
+def tests_of(path: Path) -> list[dict]:
+    """The per-test entries of a results file; empty when there is none."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return []
+    return list(data.get("tests") or [])
+
+
+def failing_tests(path: Path) -> list[str]:
+    """Node IDs that failed or errored in a results file."""
+    return [t["nodeid"] for t in tests_of(path) if t.get("outcome") in ("failed", "error")]
@@ -0,0 +1,96 @@
+"""
+Failed-first retries for pytest verification.
+
+The bundled pytest plugin (see beads.results) records every test of a
+verification attempt; the failing node IDs are kept in fsm-state.json.
+The next attempt first re-runs only those tests and runs the full
+command only once they pass:
+
+    uv run pytest -q tests/test_a.py::test_x
+    uv run pytest tests/ -v    # only if the above passed
+
+Both runs report into the same results file, where a node ID keeps its
+latest outcome, so the file's failing tests are the attempt's. A named
+check also reports into a file of its own (added to BEADS_RESULTS), so
+its failures are kept per command.
+
+A failed-first run that finds nothing to run (tests renamed or removed,
+pytest exit 4/5) falls through to the full command. Commands that are
+not a single pytest invocation (shell operators) run unchanged and are
+not tracked.
+"""
+
+import os
+import shlex
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from beads.results import RESULTS_ENV
+
+MAX_FAILED_FIRST = 200  # more failures than this: just run the full command
+FALL_THROUGH = (4, 5)  # pytest usage error / no tests collected
+
+_SHELL_OPERATORS = set(";&|<>()`$")
+
+
+@dataclass
+class PytestRun:
+    """A pytest command rewritten to re-run failing tests first."""
+    command: str  # what to execute
+    results: Optional[Path] = None  # its own results file; None: only the attempt's
+    failed_first: list[str] = field(default_factory=list)  # node IDs re-run first
+
+
+def pytest_launcher(cmd: str) -> Optional[list[str]]:
+    """
+    Tokens up to and including `pytest` (`uv run pytest`, `python -m pytest`)
+    when cmd is one plain pytest invocation; None otherwise.
+    """
+    if any(ch in _SHELL_OPERATORS for ch in cmd):
+        return None
+    try:
+        tokens = shlex.split(cmd)
+    except ValueError:
+        return None
+    for i, token in enumerate(tokens):
+        if token == "pytest" or token.endswith("/pytest"):
+            return tokens[:i + 1]
+    return None
+
+
+def failed_first_command(launcher: list[str], failed: list[str]) -> str:
+    """`pytest -q <node ids>` with the same launcher."""
+    return shlex.join([*launcher, "-q", *failed])
+
+
+def plan_run(
+    cmd: str, failed: Optional[list[str]] = None, results: Optional[Path] = None
+) -> Optional[PytestRun]:
+    """
+    Precede a pytest command with a failed-first run of failed node IDs,
+    both also reporting to results when given. None when cmd is not
+    trackable.
+    """
+    launcher = pytest_launcher(cmd)
+    if launcher is None:
+        return None
+    prefix = _results_prefix(results) if results else ""
+    if not failed or len(failed) > MAX_FAILED_FIRST:
+        return PytestRun(command=prefix + cmd, results=results)
+    first = prefix + failed_first_command(launcher, failed)
+    return PytestRun(
+        command=f"{first}; rc=$?; if {_stop_test()}; then exit $rc; fi; {prefix}{cmd}",
+        results=results,
+        failed_first=list(failed),
+    )
+
+
+def _results_prefix(results: Path) -> str:
+    """sh assignment adding results to the files the plugin reports to."""
+    return f'{RESULTS_ENV}="${RESULTS_ENV}"{os.pathsep}{shlex.quote(str(results))} '
+
+
+def _stop_test() -> str:
+    """sh test on $rc: true when a failed-first exit code should stop the attempt."""
+    return " && ".join(["[ $rc -ne 0 ]", *(f"[ $rc -ne {code} ]" for code in FALL_THROUGH)])
@@ -0,0 +1,237 @@
+"""
+Streaming command runner for verification.
+
+Output (stdout and stderr merged) is streamed to a log file as it is
+produced; only the last lines stay in memory for the summary:
+
+    .beads/logs/<bead_id>/<attempt>.log
+
+The command runs in its own process group. On timeout the whole group is
+sent SIGTERM, then SIGKILL, so test workers and servers die with it. A
+progress callback fires every few seconds with elapsed time and line
+count — the caller decides what to print.
+
+run_checks() runs several named commands at once, one log per check:
+
+    .beads/logs/<bead_id>/<attempt>-<name>.log
+
+With fail_fast the first failing check cancels the others (their process
+groups are killed the same way).
+"""
+
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, Optional, cast
+
+LOGS_DIR = Path(".beads/logs")
+DEFAULT_TIMEOUT = 1800  # seconds; fsm.verify_timeout in config.yaml
+TAIL_LINES = 200
+PROGRESS_INTERVAL = 15  # seconds between progress callbacks
+TIMEOUT_EXIT = 124  # same as coreutils timeout(1)
+_KILL_GRACE = 5  # seconds between SIGTERM and SIGKILL
+_MAX_LINE = 64 * 1024  # longer lines are split, never buffered whole
+_CANCEL_POLL = 0.1  # seconds between cancel checks while a check runs
+
+
+@dataclass
+class RunResult:
+    """One streamed command run."""
+    command: str
+    returncode: int
+    log: Optional[Path] = None
+    tail: str = ""  # last TAIL_LINES lines of combined output
+    lines: int = 0
+    duration: float = 0.0
+    timed_out: bool = False
+    cancelled: bool = False  # killed because another check failed first
+
+
+def next_log_path(root: Path, bead_id: str) -> Path:
+    """.beads/logs/<bead>/<n>.log with n one past the newest attempt."""
+    bead_dir = root / LOGS_DIR / bead_id
+    attempts = []
+    if bead_dir.is_dir():
+        for p in bead_dir.glob("*.log"):
+            n = p.stem.split("-", 1)[0]  # <n>.log or <n>-<check>.log
+            if n.isdigit():
+                attempts.append(int(n))
+    return bead_dir / f"{max(attempts, default=0) + 1}.log"
+
+
+def check_log_path(log_path: Path, name: str) -> Path:
+    """<n>-<name>.log next to the attempt's <n>.log."""
+    safe = re.sub(r'[^\w.-]+', '_', name)
+    return log_path.with_name(f"{log_path.stem}-{safe}{log_path.suffix}")
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    """SIGTERM the process group, SIGKILL it if it is still alive after a grace period."""
+    if not hasattr(os, "killpg"):  # pragma: no cover - Windows
+        proc.kill()
+        return
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            proc.wait(timeout=_KILL_GRACE)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def run_streamed(
+    cmd: str,
+    cwd: Path,
+    log_path: Optional[Path] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    on_progress: Optional[Callable[[float, int], None]] = None,
+    tail_lines: int = TAIL_LINES,
+    env: Optional[dict] = None,
+    cancel: Optional[threading.Event] = None,
+) -> RunResult:
+    """
+    Run a shell command, streaming output to log_path. timeout=None waits
+    forever; setting cancel kills the process group early.
+    """
+    tail: deque[str] = deque(maxlen=tail_lines)
+    count = 0
+    log = None
+    if log_path is not None:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log = open(log_path, "wb")
+
+    start = time.monotonic()
+    proc = subprocess.Popen(
+        cmd, shell=True, cwd=cwd, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+        start_new_session=hasattr(os, "setsid"),
+    )
+    stdout = cast(IO[bytes], proc.stdout)  # stdout=PIPE
+
+    def pump() -> None:
+        nonlocal count
+        try:
+            for chunk in iter(lambda: stdout.readline(_MAX_LINE), b""):
+                if log is not None:
+                    log.write(chunk)
+                tail.append(chunk.decode(errors="replace"))
+                count += 1
+        except (OSError, ValueError):
+            pass  # pipe or log closed under us after a timeout kill
+
+    reader = threading.Thread(target=pump, daemon=True)
+    reader.start()
+
+    timed_out = cancelled = False
+    next_progress = PROGRESS_INTERVAL
+    while True:
+        elapsed = time.monotonic() - start
+        if timeout is not None and elapsed >= timeout:
+            timed_out = True
+            _kill_group(proc)
+            break
+        if cancel is not None and cancel.is_set():
+            cancelled = True
+            _kill_group(proc)
+            break
+        wait = next_progress - elapsed
+        if timeout is not None:
+            wait = min(wait, timeout - elapsed)
+        if cancel is not None:
+            wait = min(wait, _CANCEL_POLL)
+        try:
+            proc.wait(timeout=max(wait, 0))
+            break
+        except KeyboardInterrupt:
+            _kill_group(proc)  # the group is its own session: Ctrl-C never reached it
+            raise
+        except subprocess.TimeoutExpired:
+            elapsed = time.monotonic() - start
+            if elapsed >= next_progress:
+                next_progress += PROGRESS_INTERVAL
+                if on_progress and (timeout is None or elapsed < timeout):
+                    on_progress(elapsed, count)
+
+    # A backgrounded grandchild can hold the pipe open after the command exits
+    reader.join(timeout=_KILL_GRACE)
+    if reader.is_alive() and hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        reader.join(timeout=_KILL_GRACE)
+    if log is not None:
+        if timed_out and not reader.is_alive():
+            log.write(f"\n[beads] killed after {timeout:g}s timeout\n".encode())
+        elif cancelled and not reader.is_alive():
+            log.write(b"\n[beads] cancelled: another check failed\n")
+        log.close()
+    stdout.close()
+
+    return RunResult(
+        command=cmd,
+        returncode=TIMEOUT_EXIT if timed_out else proc.returncode,
+        log=log_path,
+        tail="".join(tail),
+        lines=count,
+        duration=time.monotonic() - start,
+        timed_out=timed_out,
+        cancelled=cancelled,
+    )
+
+
+def run_checks(
+    checks: dict[str, str],
+    cwd: Path,
+    log_path: Optional[Path] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    on_progress: Optional[Callable[[float, int], None]] = None,
+    fail_fast: bool = True,
+    tail_lines: int = TAIL_LINES,
+    env: Optional[dict] = None,
+) -> dict[str, RunResult]:
+    """
+    Run named shell commands concurrently; returns name -> RunResult in
+    checks order. log_path is the attempt's <n>.log — each check writes
+    <n>-<name>.log next to it. on_progress gets the summed line count.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    cancel = threading.Event()
+    lines: dict[str, int] = {}
+    results: dict[str, RunResult] = {}
+    start = time.monotonic()
+
+    def counter(name: str) -> Callable[[float, int], None]:
+        return lambda _elapsed, count: lines.__setitem__(name, count)
+
+    # Each check is its own process group; a thread per check only pumps
+    # output and waits, so threads are enough to run them in parallel.
+    with ThreadPoolExecutor(max_workers=max(len(checks), 1)) as pool:
+        futures = {
+            pool.submit(
+                run_streamed, cmd, cwd, log_path and check_log_path(log_path, name), timeout,
+                counter(name), tail_lines, env, cancel,
+            ): name
+            for name, cmd in checks.items()
+        }
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = results[futures[future]] = future.result()
+                if fail_fast and result.returncode != 0 and not result.cancelled:
+                    cancel.set()
+            if not done and on_progress:
+                on_progress(time.monotonic() - start, sum(lines.values()))
+
+    return {name: results[name] for name in checks}
@@ -0,0 +1,222 @@
+"""
+Dependency-aware bead scheduling.
+
+Builds a DAG from every bead file's `depends_on` list and answers:
+  - which beads are ready (all dependencies complete)
+  - in what order beads can run (topological order)
+  - which ready bead unblocks the most remaining work (critical path)
+
+Bead files live in .planning/phases/XX-name/beads/XX-YY-slug.md; beads only
+known to the ledger join the graph with no dependencies.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from beads.shards import archived_phases
+
+# Ledger statuses that satisfy a dependency
+DONE_STATUSES = ("complete", "skip")
+
+# Ledger statuses a bead can be scheduled from (None = bead file not registered yet)
+SCHEDULABLE_STATUSES = ("pending", None)
+
+_BEAD_ID = re.compile(r'(\d{2}-\d{2})')
+_DEPENDS_ON = re.compile(r'depends_on:\s*\[([^\]]*)\]', re.IGNORECASE)
+
+
+class CycleError(ValueError):
+    """depends_on forms a cycle; cycle lists the bead IDs in order."""
+
+    def __init__(self, cycle: list[str]):
+        super().__init__(f"Dependency cycle: {' -> '.join(cycle)}")
+        self.cycle = cycle
+
+
+@dataclass
+class BeadNode:
+    """One bead in the dependency graph."""
+    bead_id: str
+    phase: str
+    depends_on: list[str] = field(default_factory=list)
+    path: Optional[Path] = None
+
+
+def parse_depends_on(content: str) -> list[str]:
+    """Bead IDs (XX-YY) from a bead file's `depends_on: [...]` line."""
+    match = _DEPENDS_ON.search(content)
+    if not match:
+        return []
+    deps = []
+    for raw in match.group(1).split(','):
+        dep = raw.strip().strip('"\'')
+        if dep:
+            deps.append('-'.join(dep.split('-')[:2]))
+    return deps
+
+
+class BeadGraph:
+    """Dependency DAG over bead IDs."""
+
+    def __init__(self, nodes: dict[str, BeadNode]):
+        self.nodes = nodes
+        self.dependents: dict[str, list[str]] = {bid: [] for bid in nodes}
+        for node in nodes.values():
+            for dep in node.depends_on:
+                if dep in self.dependents:
+                    self.dependents[dep].append(node.bead_id)
+
+    @classmethod
+    def from_project(cls, root: Path, ledger_data: dict) -> 'BeadGraph':
+        """
+        Scan .planning/phases/*/beads/ and merge in beads tracked by the ledger.
+        Frozen phases (beads.freeze) come from their manifest, not the tree.
+        """
+        from beads.freeze import frozen_dir_names, frozen_manifests
+
+        nodes: dict[str, BeadNode] = {}
+        manifests = frozen_manifests(root)
+        for phase, manifest in manifests.items():
+            for bid, info in manifest.get("beads", {}).items():
+                nodes[bid] = BeadNode(bid, phase, list(info.get("depends_on", [])))
+
+        frozen = frozen_dir_names(manifests)
+        phases_dir = root / ".planning" / "phases"
+        if phases_dir.is_dir():
+            bead_files = (
+                bead_file
+                for phase_dir in sorted(phases_dir.iterdir())
+                if phase_dir.is_dir() and phase_dir.name not in frozen
+                for bead_file in sorted(phase_dir.glob("beads/*.md"))
+            )
+            for bead_file in bead_files:
+                match = _BEAD_ID.match(bead_file.stem)
+                if not match or match.group(1) in nodes:
+                    continue
+                bid = match.group(1)
+                try:
+                    deps = parse_depends_on(bead_file.read_text())
+                except OSError:
+                    deps = []
+                nodes[bid] = BeadNode(bid, bid[:2], [d for d in deps if d != bid], bead_file)
+
+        for bid, info in ledger_data.get("beads", {}).items():
+            if bid not in nodes:
+                nodes[bid] = BeadNode(bid, str(info.get("phase") or bid[:2]))
+        return cls(nodes)
+
+    def find_cycle(self) -> Optional[list[str]]:
+        """Return one dependency cycle (first node repeated at the end), or None."""
+        WHITE, GREY, BLACK = 0, 1, 2
+        color = {bid: WHITE for bid in self.nodes}
+
+        for start in sorted(self.nodes):
+            if color[start] != WHITE:
+                continue
+            # Iterative DFS along depends_on edges; path mirrors the grey stack
+            path = [start]
+            stack = [iter(sorted(self.nodes[start].depends_on))]
+            color[start] = GREY
+            while stack:
+                dep = next(stack[-1], None)
+                if dep is None:
+                    color[path.pop()] = BLACK
+                    stack.pop()
+                elif dep not in color:
+                    continue  # dependency on an unknown bead — not part of a cycle
+                elif color[dep] == GREY:
+                    return path[path.index(dep):] + [dep]
+                elif color[dep] == WHITE:
+                    color[dep] = GREY
+                    path.append(dep)
+                    stack.append(iter(sorted(self.nodes[dep].depends_on)))
+        return None
+
+    def topological_order(self) -> list[str]:
+        """Dependencies before dependents; ties broken by bead ID. Raises CycleError."""
+        indegree = {
+            bid: sum(1 for dep in node.depends_on if dep in self.nodes)
+            for bid, node in self.nodes.items()
+        }
+        frontier = sorted(bid for bid, n in indegree.items() if n == 0)
+        order = []
+        while frontier:
+            bid = frontier.pop(0)
+            order.append(bid)
+            for dependent in self.dependents[bid]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    frontier.append(dependent)
+            frontier.sort()
+        if len(order) != len(self.nodes):
+            raise CycleError(self.find_cycle() or sorted(set(self.nodes) - set(order)))
+        return order
+
+    def critical_path(self, statuses: dict[str, Optional[str]]) -> dict[str, int]:
+        """
+        Length of the longest chain of unfinished beads starting at each bead.
+
+        A bead with nothing depending on it scores 1; finished beads score 0.
+        Running the highest-scoring ready bead first shortens the schedule.
+        """
+        lengths: dict[str, int] = {}
+        for bid in reversed(self.topological_order()):
+            if statuses.get(bid) in DONE_STATUSES:
+                lengths[bid] = 0
+                continue
+            lengths[bid] = 1 + max((lengths[d] for d in self.dependents[bid]), default=0)
+        return lengths
+
+    def unmet(self, bead_id: str, statuses: dict[str, Optional[str]]) -> list[str]:
+        """Dependencies of bead_id that are not complete."""
+        return [d for d in self.nodes[bead_id].depends_on if statuses.get(d) not in DONE_STATUSES]
+
+    def ready(self, statuses: dict[str, Optional[str]]) -> list[str]:
+        """Schedulable beads whose dependencies are all complete, by bead ID."""
+        return sorted(
+            bid for bid in self.nodes
+            if statuses.get(bid) in SCHEDULABLE_STATUSES and not self.unmet(bid, statuses)
+        )
+
+    def next_bead(self, statuses: dict[str, Optional[str]]) -> Optional[str]:
+        """
+        Ready bead to run next: earliest phase with schedulable beads first,
+        then longest critical path, then bead ID.
+        """
+        pending_phases = [
+            node.phase for bid, node in self.nodes.items() if statuses.get(bid) == "pending"
+        ]
+        if not pending_phases:
+            return None
+        phase = min(pending_phases)
+        candidates = [
+            bid for bid in self.ready(statuses)
+            if self.nodes[bid].phase == phase and statuses.get(bid) == "pending"
+        ]
+        if not candidates:
+            return None
+        try:
+            lengths = self.critical_path(statuses)
+        except CycleError:
+            return candidates[0]
+        return min(candidates, key=lambda bid: (-lengths[bid], bid))
+
+
+def ledger_statuses(
+    ledger_data: dict, graph: Optional[BeadGraph] = None
+) -> dict[str, Optional[str]]:
+    """
+    bead ID -> ledger status. Beads of closed phases are no longer in the
+    ledger (see beads.shards); with a graph, its nodes and dependencies in
+    those phases are reported as complete.
+    """
+    statuses = {bid: info.get("status") for bid, info in ledger_data.get("beads", {}).items()}
+    archived = archived_phases(ledger_data)
+    if archived and graph is not None:
+        for node in graph.nodes.values():
+            for bid in (node.bead_id, *node.depends_on):
+                if bid[:2] in archived:
+                    statuses.setdefault(bid, "complete")
+    return statuses
@@ -0,0 +1,92 @@
+"""
+Closed-phase ledger shards.
+
+close-phase moves a phase's beads out of the active ledger into an
+immutable .beads/ledger/phase-XX.json. The active ledger keeps open phases
+plus a per-phase rollup of counts:
+
+    "phase_rollup": {"01": {"complete": 4, "skip": 1, "shard": ".beads/ledger/phase-01.json"}}
+
+Hot-path commands parse only the active ledger. Views that need every bead
+(the dashboard) merge the shards back in with merge_shards().
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from beads.locking import atomic_write_text
+
+SHARD_DIR = Path(".beads/ledger")
+ROLLUP_KEY = "phase_rollup"
+
+
+def shard_path(root: Path, phase: str) -> Path:
+    return root / SHARD_DIR / f"phase-{phase}.json"
+
+
+def archived_phases(ledger_data: dict) -> set[str]:
+    """Phases whose beads live in a shard."""
+    return set(ledger_data.get(ROLLUP_KEY) or {})
+
+
+def load_shard(root: Path, phase: str) -> dict:
+    """A shard's content ({} when the shard is missing or unreadable)."""
+    try:
+        shard: dict = json.loads(shard_path(root, phase).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return shard
+
+
+def build_shard(root: Path, phase: str, beads: dict[str, dict]) -> tuple[dict, dict]:
+    """
+    Shard content for a closed phase and its rollup entry (nothing is written).
+    Beads already in the shard are kept; entries in beads win.
+    """
+    existing = load_shard(root, phase)
+    merged = {**existing.get("beads", {}), **beads}
+    shard = {
+        "_warning": "Closed phase — managed by fsm.py close-phase, never edited",
+        "phase": phase,
+        "closed_at": (
+            existing.get("closed_at") or datetime.now(timezone.utc).isoformat(timespec="seconds")
+        ),
+        "beads": dict(sorted(merged.items())),
+    }
+    counts: dict = {}
+    for info in merged.values():
+        status = info.get("status", "unknown")
+        counts[status] = counts.get(status, 0) + 1
+    counts["shard"] = str(SHARD_DIR / shard_path(root, phase).name)
+    return shard, counts
+
+
+def write_shard(root: Path, phase: str, shard: dict) -> None:
+    """Write a shard built by build_shard (atomic, then read-only)."""
+    path = shard_path(root, phase)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(shard, indent=2))
+    os.chmod(path, 0o444)
+
+
+def rollup_counts(ledger_data: dict) -> dict[str, int]:
+    """Status -> bead count over every closed phase, from the rollup alone."""
+    totals: dict[str, int] = {}
+    for entry in (ledger_data.get(ROLLUP_KEY) or {}).values():
+        for status, count in entry.items():
+            if isinstance(count, int):
+                totals[status] = totals.get(status, 0) + count
+    return totals
+
+
+def merge_shards(root: Path, ledger_data: dict) -> dict:
+    """Copy of the ledger with every shard's beads merged back into "beads"."""
+    merged = dict(ledger_data)
+    beads: dict[str, dict] = {}
+    for phase in sorted(archived_phases(ledger_data)):
+        beads.update(load_shard(root, phase).get("beads", {}))
+    beads.update(ledger_data.get("beads", {}))
+    merged["beads"] = beads
+    return merged
@@ -0,0 +1,140 @@
+"""Shared versioned install for link-mode projects.
+
+Instead of copying fsm.py, router.py, hooks, skills and PROTOCOL.md into every
+project, `beads init --link` / `beads sync --link` point them at one install:
+
+    ~/.claude/beads/
+    ├── versions/1.1.0/          ● framework files for one package version
+    │   └── .install-manifest.json
+    └── current -> versions/1.1.0
+
+Project files are symlinks into `current/`, so an upgrade is a single atomic
+swap of the `current` pointer. Where symlinks are unavailable, files are
+hardlinked, then reflinked (copy-on-write clone), then copied.
+
+The shared tree is identical for every project; settings.json, whose hook
+wiring depends on the project's environment, is copied per project.
+"""
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from beads import __version__
+
+SHARED_ROOT = Path.home() / ".claude" / "beads"
+INSTALL_MANIFEST = ".install-manifest.json"
+
+_FICLONE = 0x40049409  # Linux ioctl: clone file extents (btrfs, xfs, ...)
+
+_install_lock = threading.Lock()  # fleet sync links many projects from one process
+
+
+def current_dir() -> Path:
+    """Stable pointer that project symlinks target."""
+    return SHARED_ROOT / "current"
+
+
+def ensure_shared_install(
+    entries: list[tuple[str, Path]], modes: dict[str, int] | None = None
+) -> Path:
+    """
+    Make sure this package version is installed and `current` points at it.
+
+    entries are (relative path, source file) pairs. Checks one install manifest;
+    files are only copied when the version is new. The version directory is
+    built in a temp dir and renamed into place, then `current` is swapped with
+    os.replace — readers never see a partial install.
+    Returns the `current` pointer path.
+    """
+    with _install_lock:
+        return _ensure_shared_install(entries, modes)
+
+
+def _ensure_shared_install(entries: list[tuple[str, Path]], modes: dict[str, int] | None) -> Path:
+    name = __version__
+    versions = SHARED_ROOT / "versions"
+    version_dir = versions / name
+
+    if not _install_is_complete(version_dir, name):
+        versions.mkdir(parents=True, exist_ok=True)
+        staging = versions / f".{name}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        for rel_path, src in entries:
+            path = staging / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, path)
+            if modes and rel_path in modes:
+                path.chmod(modes[rel_path])
+        (staging / INSTALL_MANIFEST).write_text(json.dumps({"version": name}, indent=2))
+        shutil.rmtree(version_dir, ignore_errors=True)
+        os.rename(staging, version_dir)
+
+    current = current_dir()
+    pointer = os.path.join("versions", name)
+    if not current.is_symlink() or os.readlink(current) != pointer:
+        tmp_link = SHARED_ROOT / f".current.tmp-{os.getpid()}"
+        tmp_link.unlink(missing_ok=True)
+        os.symlink(pointer, tmp_link)
+        os.replace(tmp_link, current)
+    return current
+
+
+def _install_is_complete(version_dir: Path, name: str) -> bool:
+    try:
+        data = json.loads((version_dir / INSTALL_MANIFEST).read_text())
+    except (OSError, json.JSONDecodeError):
+        return False
+    return bool(data.get("version") == name)
+
+
+def is_linked(dst: Path, target: Path) -> bool:
+    """True if dst already points at target (symlink) — lstat only, no content read."""
+    try:
+        return dst.is_symlink() and os.readlink(dst) == str(target)
+    except OSError:
+        return False
+
+
+def link_file(target: Path, dst: Path) -> str:
+    """
+    Point dst at target. Returns the method used: symlink | hardlink | reflink | copy.
+
+    dst is replaced atomically (link created beside it, then renamed over it).
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.link-tmp")
+    tmp.unlink(missing_ok=True)
+
+    try:
+        os.symlink(target, tmp)
+        method = "symlink"
+    except OSError:
+        resolved = target.resolve()
+        try:
+            os.link(resolved, tmp)
+            method = "hardlink"
+        except OSError:
+            method = "reflink" if _reflink(resolved, tmp) else "copy"
+            if method == "copy":
+                shutil.copy2(resolved, tmp)
+
+    os.replace(tmp, dst)
+    return method
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Copy-on-write clone where the filesystem supports it."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
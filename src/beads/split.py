@@ -0,0 +1,176 @@
+"""
+Duration-balanced splitting of pytest verification.
+
+A plain pytest command is split into N commands over disjoint sets of
+test files, run as concurrent named checks (shard-1 .. shard-N). Files
+are assigned longest-first to the least-loaded shard using per-test
+durations that every pytest verification run updates from its results
+file (see beads.results); a file costs the sum of its tests:
+
+    .beads/cache/test-durations.json    {"tests/test_api.py::test_login": 1.2, ...}
+
+Files without history count as the mean known duration. No pytest-xdist
+needed — each shard is an ordinary pytest process.
+
+Only commands that name their test paths are split, and only in projects
+using pytest's default test file patterns: testpaths, rootdir discovery
+and custom python_files are pytest's to resolve, and a guess that misses
+files would let a sharded verify pass without running them.
+"""
+
+import json
+import os
+import shlex
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from beads.locking import atomic_write_text
+from beads.retry import pytest_launcher
+
+DURATIONS_FILE = Path(".beads/cache/test-durations.json")
+DEFAULT_DURATION = 1.0  # seconds, for files when there is no history at all
+_PYTEST_CONFIGS = ("pytest.ini", ".pytest.ini", "pyproject.toml", "tox.ini", "setup.cfg")
+
+# pytest options whose value is a separate argument (never a test path)
+_VALUE_OPTIONS = {
+    "-k", "-m", "-c", "-p", "-o", "-r", "-W", "--tb", "--maxfail", "--durations", "--rootdir",
+    "--confcutdir", "--basetemp", "--ignore", "--ignore-glob", "--deselect", "--cov",
+    "--cov-report", "--cov-config", "--log-level", "--import-mode", "--override-ini",
+}
+_SKIP_DIRS = {"__pycache__", "node_modules", ".venv", "venv"}
+
+
+@dataclass
+class Selection:
+    """A pytest command taken apart into launcher, options and test paths."""
+    launcher: list[str]
+    options: list[str]
+    paths: list[str]  # files, directories or node IDs, as given
+
+
+def parse_selection(cmd: str, root: Path) -> Optional[Selection]:
+    """
+    Split a plain pytest command; None when it is not one, names no test
+    paths (pytest's own testpaths/rootdir discovery is not guessed at) or
+    the project collects files by custom python_files patterns.
+    """
+    launcher = pytest_launcher(cmd)
+    if launcher is None or _custom_patterns(root):
+        return None
+    tokens = shlex.split(cmd)[len(launcher):]
+    options, paths = [], []
+    takes_value = False
+    for token in tokens:
+        if takes_value:
+            options.append(token)
+            takes_value = False
+        elif token.startswith("-"):
+            options.append(token)
+            takes_value = token in _VALUE_OPTIONS
+        elif (root / token.split("::", 1)[0]).exists():
+            paths.append(token)
+        else:
+            options.append(token)
+    return Selection(launcher, options, paths) if paths else None
+
+
+def _custom_patterns(root: Path) -> bool:
+    """Whether a pytest config file might set python_files (checked textually)."""
+    for name in _PYTEST_CONFIGS:
+        try:
+            if "python_files" in (root / name).read_text(errors="replace"):
+                return True
+        except OSError:
+            continue
+    return False
+
+
+def collect_files(selection: Selection, root: Path) -> list[str]:
+    """Test files (and node IDs) the selection covers, directories expanded."""
+    files: list[str] = []
+    for path in selection.paths:
+        target = root / path.split("::", 1)[0]
+        if not target.is_dir():
+            files.append(path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(target):
+            dirnames[:] = sorted(
+                d for d in dirnames if d not in _SKIP_DIRS and not d.startswith(".")
+            )
+            for name in sorted(filenames):
+                if name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py")):
+                    files.append(str((Path(dirpath) / name).relative_to(root)))
+    return list(dict.fromkeys(files))
+
+
+def balance(files: list[str], durations: dict[str, float], n: int) -> list[list[str]]:
+    """Greedy longest-first assignment of files to at most n shards."""
+    known = [durations[f] for f in map(_file_of, files) if f in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION
+    cost = {f: durations.get(_file_of(f), fallback) for f in files}
+    shards: list[list[str]] = [[] for _ in range(max(1, min(n, len(files))))]
+    loads = [0.0] * len(shards)
+    for f in sorted(files, key=lambda f: (-cost[f], f)):
+        i = loads.index(min(loads))
+        shards[i].append(f)
+        loads[i] += cost[f]
+    return [sorted(shard) for shard in shards if shard]
+
+
+def shard_commands(cmd: str, root: Path, n: int) -> Optional[dict[str, str]]:
+    """
+    shard-1 .. shard-k commands covering cmd's test files, balanced by
+    history. None when cmd cannot be split or yields a single shard.
+    """
+    selection = parse_selection(cmd, root) if n > 1 else None
+    if selection is None:
+        return None
+    shards = balance(collect_files(selection, root), load_durations(root), n)
+    if len(shards) < 2:
+        return None
+    return {
+        f"shard-{i}": shlex.join([*selection.launcher, *selection.options, *files])
+        for i, files in enumerate(shards, 1)
+    }
+
+
+def load_durations(root: Path) -> dict[str, float]:
+    """Per-file durations: the sum of each file's recorded tests."""
+    totals: dict[str, float] = {}
+    for node_id, duration in _load_tests(root).items():
+        f = _file_of(node_id)
+        totals[f] = totals.get(f, 0.0) + duration
+    return totals
+
+
+def record_durations(root: Path, tests: Iterable[dict]) -> None:
+    """
+    Update the history of every test in tests (results file entries).
+    Tests that did not run keep theirs, so failed-first, node-ID and -k
+    runs never shrink a file's total; tests of deleted files are dropped.
+    """
+    ran = {t["nodeid"]: round(float(t.get("duration") or 0.0), 3) for t in tests if t.get("nodeid")}
+    if not ran:
+        return
+    durations = _load_tests(root)
+    durations.update(ran)
+    durations = {k: v for k, v in durations.items() if (root / _file_of(k)).is_file()}
+    path = root / DURATIONS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(dict(sorted(durations.items())), indent=2))
+
+
+def _load_tests(root: Path) -> dict[str, float]:
+    """Per-test durations (entries without a node ID, from older caches, are ignored)."""
+    try:
+        data = json.loads((root / DURATIONS_FILE).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {
+        k: float(v) for k, v in data.items() if "::" in k and isinstance(v, (int, float))
+    }
+
+
+def _file_of(node_id: str) -> str:
+    return node_id.split("::", 1)[0]
@@ -4,6 +4,9 @@ from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
 
+from beads.model import Ledger
+from beads.shards import rollup_counts
+
 console = Console()
 
 
@@ -16,35 +19,35 @@ def show_status(project_root: Path):
         return
 
     try:
-        data = json.loads(ledger_path.read_text())
+        ledger = Ledger.load(ledger_path)
     except json.JSONDecodeError as e:
         console.print(f"[red]❌ ledger.json corrupted: {e}[/red]")
         return
 
-    project_name = data.get("project", {}).get("name", "Unknown Project")
+    project_name = ledger.project.get("name", "Unknown Project")
     console.print(Panel.fit(
         f"[bold blue]Claude Beads Project Status[/bold blue]\n{project_name}",
         subtitle=str(project_root.name)
     ))
 
     # Active bead
-    active = data.get("active_bead")
+    active = ledger.active_bead
     console.print("\n[bold]Active Bead:[/bold]")
     console.print(f"  {active}" if active else "  None")
 
     # Roadmap summary
     console.print("\n[bold]Roadmap:[/bold]")
-    roadmap = data.get("roadmap", [])
+    roadmap = ledger.data.get("roadmap", [])
     for phase in roadmap[:8]:
         status_icon = {"complete": "✅", "active": "🔄", "pending": "⏳"}.get(phase.get("status"), "?")
         console.print(f"  {status_icon} Phase {phase['phase']}: {phase['name']}")
     if len(roadmap) > 8:
         console.print(f"  ... and {len(roadmap) - 8} more phases")
 
-    # Bead stats
-    beads = data.get("beads", {})
-    complete = sum(1 for b in beads.values() if b.get("status") == "complete")
-    total = len(beads)
+    # Bead stats (closed phases counted from the rollup, shards are not parsed)
+    archived = rollup_counts(ledger.data)
+    complete = ledger.count("complete") + archived.get("complete", 0)
+    total = ledger.count() + sum(archived.values())
     console.print(f"\n[bold]Progress:[/bold] {complete}/{total} beads complete")
 
     # Next actions
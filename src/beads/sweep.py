@@ -0,0 +1,60 @@
+"""
+Regression sweep over completed beads.
+
+`fsm.py verify-all [--phase XX]` re-runs the verification command of
+every completed bead against the current tree. Identical commands (and
+identical named checks across beads) run once; distinct commands run
+concurrently, N at a time, each in its own process group:
+
+    .beads/logs/verify-all/<stamp>/<n>.log       output of command n
+    .beads/logs/verify-all/<stamp>/<n>.json      per-test results (pytest plugin)
+    .beads/logs/verify-all/<stamp>/report.json   regression report
+
+A bead regressed when any of its commands fails. With --flag the ledger
+lists regressed beads under "regressions" until a later sweep passes
+them; bead statuses are never changed.
+"""
+
+import re
+from pathlib import Path
+from typing import Optional
+
+from beads.freeze import PLANNING_DIR, frozen_manifests
+
+SWEEP_DIR = Path(".beads/logs/verify-all")
+REPORT_FILE = "report.json"
+REGRESSIONS_KEY = "regressions"  # top-level ledger key (closed-phase shards are never rewritten)
+
+_TIER = re.compile(r'verification_tier:\s*(\w+)', re.IGNORECASE)
+_TYPE = re.compile(r'type:\s*(\w+)', re.IGNORECASE)
+
+
+def bead_content(root: Path, bead_id: str, phase: str) -> Optional[str]:
+    """A bead file's text from the planning tree, or from its frozen phase's archive."""
+    for path in sorted((root / PLANNING_DIR).glob(f"*/beads/{bead_id}*.md")):
+        if path.stem == bead_id or path.stem.startswith(f"{bead_id}-"):
+            try:
+                return path.read_text(errors="replace")
+            except OSError:
+                return None
+    manifest = frozen_manifests(root).get(phase) or {}
+    info = (manifest.get("beads") or {}).get(bead_id)
+    if not info or not manifest.get("archive"):
+        return None
+    import tarfile  # archived phases only
+
+    try:
+        with tarfile.open(root / manifest["archive"]) as tar:
+            member = tar.extractfile(info["file"])
+            return member.read().decode(errors="replace") if member else None
+    except (OSError, KeyError, tarfile.TarError):
+        return None
+
+
+def auto_verified(content: str) -> bool:
+    """False for beads completed without automatic verification (tier NONE/MANUAL, spikes)."""
+    tier = _TIER.search(content)
+    if tier:
+        return tier.group(1).upper() == "AUTO"
+    kind = _TYPE.search(content)
+    return not (kind and kind.group(1).lower() == "spike")
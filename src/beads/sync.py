@@ -1,8 +1,19 @@
 """Sync framework files from installed package to current project."""
-import filecmp
+import compileall
+import difflib
+import hashlib
+import json
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from beads import __version__
+from beads.hook import render_hook_settings
+from beads.init import update_gitignore
+from beads.shared import current_dir, ensure_shared_install, is_linked, link_file
+
 
 # Files that get synced — framework internals only, never user content
 _SYNC_FILES = [
@@ -23,51 +34,333 @@ _SYNC_FILES = [
     (".claude/skills.yaml", None),
 ]
 
+# Engine modules — shipped once as package modules, imported by the .beads/bin/ launchers
+ENGINE_DIR = ".beads/lib/beads"
+_ENGINE_MODULES = [
+    "__init__.py", "engine.py", "freeze.py", "fsm.py", "jobs.py", "ledger_db.py", "locking.py",
+    "model.py", "parallel.py", "results.py", "retry.py", "router.py", "runner.py", "scheduler.py",
+    "shards.py", "split.py", "sweep.py", "toolenv.py", "warm.py", "watch.py",
+]
+
+# Bundled pytest plugin — its own directory, so only it lands on the project's PYTHONPATH
+PYTEST_PLUGIN_FILE = ".beads/lib/pytest/beads_pytest_plugin.py"
+
 # Skills directory — sync all .md files
 _SYNC_SKILL_DIR = ".claude/skills"
 
+# Hook registration — rewritten to the beads-hook dispatcher when it is on PATH
+_SETTINGS_FILE = ".claude/settings.json"
+
+# Project .gitignore — missing Beads entries are appended (see beads.init.update_gitignore)
+GITIGNORE_FILE = ".gitignore"
+
+# Records package version + content hash and stat of every synced file
+MANIFEST_FILE = ".beads/.sync-manifest.json"
+
+# Directories never searched for fleet projects
+_FLEET_SKIP_DIRS = {".git", "node_modules", ".venv", "venv", "__pycache__", ".tox", ".nox"}
+
 
-def sync_project(project_root: Path) -> list[str]:
+def sync_project(project_root: Path, dry_run: bool = False, link: bool | None = None) -> list[str]:
     """Sync framework files from package templates to project.
 
-    Only overwrites files that differ from the template.
-    Returns list of updated file paths.
+    Only overwrites files that differ from the template. When the manifest's
+    package version matches and neither template nor project files changed on
+    disk (size + mtime), returns immediately without reading any file content.
+    With link=True, files point into the shared install instead of being copied
+    (see beads.shared); link=None keeps the mode recorded in the manifest.
+    Beads entries missing from the project's .gitignore are appended whenever
+    the framework files are re-checked.
+    With dry_run, nothing is written. Returns list of updated file paths.
     """
     template_root = Path(__file__).parent / "templates" / "project_init"
     if not template_root.exists():
         raise RuntimeError("Package templates not found. Reinstall claude-beads.")
 
-    updated = []
+    dispatcher = shutil.which("beads-hook") is not None
+    manifest = _load_manifest(project_root)
+    if link is None:
+        link = manifest.get("mode") == "link"
+    if link:
+        return _sync_linked(project_root, template_root, manifest, dispatcher, dry_run)
+
+    same_build = (
+        manifest.get("version") == __version__
+        and manifest.get("dispatcher") == dispatcher
+        and manifest.get("mode", "copy") == "copy"
+    )
+    recorded = manifest.get("files", {}) if same_build else {}
+
+    entries = _sync_entries(template_root)
+    files: dict[str, dict] = {}
+    stale = []
+    for rel_path, src, mode in entries:
+        record = recorded.get(rel_path)
+        src_stat, dst_stat = _stat(src), _stat(project_root / rel_path)
+        if record and record.get("src") == src_stat and record.get("dst") == dst_stat:
+            files[rel_path] = record
+        else:
+            stale.append((rel_path, src, mode))
+
+    # Fast path: same version, nothing touched since the last sync
+    if not stale and same_build and len(files) == len(recorded):
+        return []
 
-    # Sync individual files
-    for rel_path, mode in _SYNC_FILES:
-        src = template_root / rel_path
+    updated = []
+    for rel_path, src, mode in stale:
         dst = project_root / rel_path
-        if not src.exists():
-            continue
-        if _needs_update(src, dst):
+        content = _template_content(rel_path, src, dispatcher)
+        digest = hashlib.sha256(content).hexdigest()
+        if dst.is_symlink() or not dst.exists() or _hash_file(dst) != digest:
+            updated.append(rel_path)
+            if dry_run:
+                continue
+            # tmp → rename never writes through a link into the shared install
             dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
+            tmp = dst.with_name(f".{dst.name}.sync-tmp")
+            tmp.write_bytes(content)
             if mode:
-                dst.chmod(mode)
-            updated.append(rel_path)
+                tmp.chmod(mode)
+            os.replace(tmp, dst)
+        files[rel_path] = {"sha256": digest, "src": _stat(src), "dst": _stat(dst)}
+
+    if update_gitignore(project_root, dry_run):
+        updated.append(GITIGNORE_FILE)
+    if dry_run:
+        return updated
+
+    if any(rel_path.startswith(f"{ENGINE_DIR}/") for rel_path in updated):
+        compile_engine(project_root)
+    _save_manifest(project_root, {
+        "_WARNING": "Managed by beads sync — safe to delete (forces a full re-check)",
+        "version": __version__,
+        "dispatcher": dispatcher,
+        "files": files,
+    })
+    return updated
+
+
+def _sync_linked(
+    project_root: Path, template_root: Path, manifest: dict, dispatcher: bool, dry_run: bool
+) -> list[str]:
+    """Point framework files at the shared install. Checks one manifest, not file contents.
+
+    settings.json stays a per-project copy: its hook wiring depends on whether
+    this project's environment has the dispatcher, which the shared tree
+    (one `current` for every linked project) must not decide.
+    """
+    entries = _sync_entries(template_root)
+    current = current_dir()
+    same_build = (
+        manifest.get("mode") == "link"
+        and manifest.get("version") == __version__
+        and manifest.get("dispatcher") == dispatcher
+    )
+    recorded = manifest.get("files", {}) if same_build else {}
+
+    stale = []
+    for rel_path, _, _ in entries:
+        dst, target = project_root / rel_path, current / rel_path
+        record = recorded.get(rel_path, {})
+        if rel_path == _SETTINGS_FILE:
+            if record.get("link") == "copy" and record.get("dst") == _stat(dst):
+                continue
+        elif is_linked(dst, target):
+            continue
+        # Hardlink/reflink/copy fallbacks: unchanged since recorded → still current
+        elif record.get("link") not in (None, "symlink") and record.get("dst") == _stat(dst):
+            continue
+        stale.append(rel_path)
+
+    if same_build and not stale:
+        return []
+
+    settings = next((src for rel, src, _ in entries if rel == _SETTINGS_FILE), None)
+    settings_content = _template_content(_SETTINGS_FILE, settings, dispatcher) if settings else b""
+    settings_dst = project_root / _SETTINGS_FILE
+    if _SETTINGS_FILE in stale and not settings_dst.is_symlink() and settings_dst.exists():
+        if _hash_file(settings_dst) == hashlib.sha256(settings_content).hexdigest():
+            stale.remove(_SETTINGS_FILE)  # only the manifest entry was missing
+    if update_gitignore(project_root, dry_run):
+        stale.append(GITIGNORE_FILE)
+    if dry_run:
+        return stale
+
+    ensure_shared_install(
+        [(rel_path, src) for rel_path, src, _ in entries if rel_path != _SETTINGS_FILE],
+        modes={rel: mode for rel, mode in _SYNC_FILES if mode},
+    )
+
+    files = {}
+    for rel_path, _, _ in entries:
+        dst = project_root / rel_path
+        if rel_path == _SETTINGS_FILE:
+            if rel_path in stale:
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                tmp = dst.with_name(f".{dst.name}.sync-tmp")
+                tmp.write_bytes(settings_content)
+                os.replace(tmp, dst)
+            method = "copy"
+        elif rel_path in stale:
+            method = link_file(current / rel_path, dst)
+        else:
+            method = recorded.get(rel_path, {}).get("link", "symlink")
+        files[rel_path] = {"link": method, "dst": _stat(dst)}
+    if any(rel_path.startswith(f"{ENGINE_DIR}/") for rel_path in stale):
+        compile_engine(project_root)
 
-    # Sync skills directory
+    _save_manifest(project_root, {
+        "_WARNING": "Managed by beads sync — safe to delete (forces a full re-check)",
+        "version": __version__,
+        "dispatcher": dispatcher,
+        "mode": "link",
+        "files": files,
+    })
+    return stale
+
+
+def preview_sync(project_root: Path, link: bool | None = None) -> dict[str, tuple[int, int]]:
+    """Dry-run sync. Returns {path: (lines added, lines removed)} per file that would change."""
+    template_root = Path(__file__).parent / "templates" / "project_init"
+    dispatcher = shutil.which("beads-hook") is not None
+    sources = {rel: src for rel, src, _ in _sync_entries(template_root)}
+
+    summary = {}
+    for rel_path in sync_project(project_root, dry_run=True, link=link):
+        if rel_path == GITIGNORE_FILE:  # entries are only ever appended
+            summary[rel_path] = (len(update_gitignore(project_root, dry_run=True)), 0)
+            continue
+        new = _template_content(rel_path, sources[rel_path], dispatcher).decode(errors="replace")
+        dst = project_root / rel_path
+        old = dst.read_text(errors="replace") if dst.exists() else ""
+        added = removed = 0
+        for line in difflib.unified_diff(old.splitlines(), new.splitlines(), lineterm="", n=0):
+            if line.startswith("+") and not line.startswith("+++"):
+                added += 1
+            elif line.startswith("-") and not line.startswith("---"):
+                removed += 1
+        summary[rel_path] = (added, removed)
+    return summary
+
+
+@dataclass
+class FleetResult:
+    """Outcome of syncing one project in a fleet run."""
+    project: Path
+    updated: list[str] = field(default_factory=list)
+    diffstat: dict[str, tuple[int, int]] = field(default_factory=dict)
+    error: str | None = None
+
+
+def discover_projects(root: Path) -> list[Path]:
+    """Find every directory under root containing a .beads/ project (not descending into one)."""
+    projects = []
+    for dirpath, dirnames, _ in os.walk(root):
+        if ".beads" in dirnames and (Path(dirpath) / ".beads" / "ledger.json").exists():
+            projects.append(Path(dirpath))
+            dirnames[:] = []
+            continue
+        dirnames[:] = [d for d in dirnames if d not in _FLEET_SKIP_DIRS]
+    return sorted(projects)
+
+
+def load_fleet_manifest(manifest_path: Path) -> list[Path]:
+    """Read project paths (one per line, '#' comments) relative to the manifest file."""
+    projects = []
+    for line in manifest_path.read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            path = Path(line).expanduser()
+            projects.append(path if path.is_absolute() else manifest_path.parent / path)
+    return projects
+
+
+def sync_fleet(
+    projects: list[Path], jobs: int = 8, dry_run: bool = False, link: bool | None = None
+) -> list[FleetResult]:
+    """Run sync_project (or preview_sync) on every project in a bounded thread pool."""
+
+    def _one(project: Path) -> FleetResult:
+        result = FleetResult(project=project)
+        try:
+            if not (project / ".beads").is_dir():
+                raise RuntimeError("Beads not initialized")
+            if dry_run:
+                result.diffstat = preview_sync(project, link=link)
+                result.updated = list(result.diffstat)
+            else:
+                result.updated = sync_project(project, link=link)
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        return list(pool.map(_one, projects))
+
+
+def _sync_entries(template_root: Path) -> list[tuple[str, Path, int | None]]:
+    """All (relative path, template source, mode) pairs that sync manages."""
+    entries = [
+        (rel_path, template_root / rel_path, mode)
+        for rel_path, mode in _SYNC_FILES
+        if (template_root / rel_path).exists()
+    ]
     skills_src = template_root / _SYNC_SKILL_DIR
-    skills_dst = project_root / _SYNC_SKILL_DIR
     if skills_src.exists():
-        skills_dst.mkdir(parents=True, exist_ok=True)
-        for skill_file in skills_src.glob("*.md"):
-            dst = skills_dst / skill_file.name
-            if _needs_update(skill_file, dst):
-                shutil.copy2(skill_file, dst)
-                updated.append(f"{_SYNC_SKILL_DIR}/{skill_file.name}")
+        for skill_file in sorted(skills_src.glob("*.md")):
+            entries.append((f"{_SYNC_SKILL_DIR}/{skill_file.name}", skill_file, None))
+    package_root = Path(__file__).parent
+    for module in _ENGINE_MODULES:
+        entries.append((f"{ENGINE_DIR}/{module}", package_root / module, None))
+    entries.append((PYTEST_PLUGIN_FILE, package_root / "pytest_plugin.py", None))
+    return entries
 
-    return updated
+
+def compile_engine(project_root: Path) -> None:
+    """Precompile the engine modules so launchers load cached bytecode.
+
+    Done at sync time because hook environments often set
+    PYTHONDONTWRITEBYTECODE — reading .pyc still works there, writing does not.
+    """
+    compileall.compile_dir(str(project_root / ENGINE_DIR), quiet=1, force=True)
+
+
+def _template_content(rel_path: str, src: Path, dispatcher: bool) -> bytes:
+    """Bytes the project copy should contain (settings.json gets the dispatcher)."""
+    if rel_path == _SETTINGS_FILE and dispatcher:
+        return render_hook_settings(src.read_text()).encode()
+    return src.read_bytes()
+
+
+def _stat(path: Path) -> list[int] | None:
+    """[size, mtime_ns] — cheap change detection without reading content."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_manifest(project_root: Path) -> dict:
+    try:
+        data = json.loads((project_root / MANIFEST_FILE).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
 
 
-def _needs_update(src: Path, dst: Path) -> bool:
-    """Check if dst needs to be updated from src."""
-    if not dst.exists():
-        return True
-    return not filecmp.cmp(src, dst, shallow=False)
+def _save_manifest(project_root: Path, manifest: dict) -> None:
+    """Atomically write the manifest (write tmp → rename)."""
+    path = project_root / MANIFEST_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, path)
@@ -0,0 +1,121 @@
+"""Hook latency telemetry — decision log and percentile stats.
+
+Every State Guard hook invocation can append one compact JSON line to
+.beads/telemetry/hooks.jsonl. Recording is opt-in: it is on when the
+.beads/telemetry/ directory exists (`beads hooks enable`) or when
+BEADS_HOOK_TELEMETRY=1 is set in the hook environment.
+
+Record format (one line per invocation):
+    {"ts": 1760000000.123, "hook": "guard-bash.sh", "tool": "Bash", "decision": "deny", "us": 840}
+
+Shell hooks can append the same record with builtins + date(1):
+    start=$(date +%s%6N)
+    ...
+    [ -d "$CLAUDE_PROJECT_DIR/.beads/telemetry" ] && printf \
+      '{"ts":%s,"hook":"%s","tool":"%s","decision":"%s","us":%s}\\n' \
+      "$(date +%s)" guard-bash.sh "$TOOL" allow "$(( $(date +%s%6N) - start ))" \
+      >> "$CLAUDE_PROJECT_DIR/.beads/telemetry/hooks.jsonl"
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+TELEMETRY_DIR = Path(".beads/telemetry")
+HOOKS_LOG = "hooks.jsonl"
+MAX_LOG_BYTES = 1_000_000  # rotate hooks.jsonl → hooks.jsonl.1 past this size
+KEEP_ROTATED = 3
+PERCENTILES = (50, 95, 99)
+
+
+def is_enabled(project_root: Path) -> bool:
+    """Telemetry is opt-in: env flag or an existing telemetry directory."""
+    if os.environ.get("BEADS_HOOK_TELEMETRY") == "1":
+        return True
+    return (project_root / TELEMETRY_DIR).is_dir()
+
+
+def record_hook(project_root: Path, hook: str, tool: str, decision: str, micros: int) -> None:
+    """Append one hook decision record. Never raises — telemetry must not block a hook."""
+    log_dir = project_root / TELEMETRY_DIR
+    log_path = log_dir / HOOKS_LOG
+    line = json.dumps({
+        "ts": round(time.time(), 3),
+        "hook": hook,
+        "tool": tool,
+        "decision": decision,
+        "us": micros,
+    }, separators=(",", ":")) + "\n"
+
+    try:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            if log_path.stat().st_size > MAX_LOG_BYTES:
+                _rotate(log_path)
+        except FileNotFoundError:
+            pass
+        # O_APPEND + single write keeps concurrent hook records from interleaving
+        fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _rotate(log_path: Path) -> None:
+    """Shift hooks.jsonl.N → .N+1, dropping the oldest."""
+    for i in range(KEEP_ROTATED - 1, 0, -1):
+        older = log_path.with_name(f"{log_path.name}.{i}")
+        if older.exists():
+            os.replace(older, log_path.with_name(f"{log_path.name}.{i + 1}"))
+    os.replace(log_path, log_path.with_name(f"{log_path.name}.1"))
+
+
+def load_records(project_root: Path) -> list[dict]:
+    """Read current + rotated logs, oldest first. Skips malformed lines."""
+    log_path = project_root / TELEMETRY_DIR / HOOKS_LOG
+    paths = [log_path.with_name(f"{HOOKS_LOG}.{i}") for i in range(KEEP_ROTATED, 0, -1)]
+    paths.append(log_path)
+
+    records = []
+    for path in paths:
+        if not path.exists():
+            continue
+        for line in path.read_text().splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and isinstance(record.get("us"), (int, float)):
+                records.append(record)
+    return records
+
+
+def _percentile(sorted_values: list[float], pct: int) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+def summarize(records: list[dict]) -> list[dict]:
+    """Group records by (hook, tool) and compute count, deny count and p50/p95/p99 (µs)."""
+    groups: dict[tuple[str, str], list[dict]] = {}
+    for record in records:
+        key = (str(record.get("hook", "?")), str(record.get("tool", "?")))
+        groups.setdefault(key, []).append(record)
+
+    rows = []
+    for (hook, tool), items in sorted(groups.items()):
+        latencies = sorted(r["us"] for r in items)
+        row = {
+            "hook": hook,
+            "tool": tool,
+            "count": len(items),
+            "denied": sum(1 for r in items if r.get("decision") == "deny"),
+        }
+        for pct in PERCENTILES:
+            row[f"p{pct}"] = _percentile(latencies, pct)
+        rows.append(row)
+    return rows
@@ -0,0 +1,135 @@
+"""
+Verification tool environment.
+
+Resolved once at init and kept in fsm-state.json, so verify runs pytest,
+mypy, ruff... straight from the environment's bin directory instead of
+paying `uv run`'s resolution and sync check on every attempt:
+
+    "tool_env": {"source": "uv", "python": "/proj/.venv/bin/python",
+                 "bin": "/proj/.venv/bin", "fingerprint": "<sha256>"}
+
+The fingerprint hashes uv.lock and pyproject.toml; verify re-resolves
+only when it changes or the interpreter disappears. When neither uv nor
+a virtualenv is found, source is "uv run" and commands keep the old
+`uv run` prefix until an in-project virtualenv appears or uv is
+installed.
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+FINGERPRINT_FILES = ("uv.lock", "pyproject.toml")
+FALLBACK = "uv run"
+RESOLVE_TIMEOUT = 900  # seconds; the first `uv run` may have to sync the environment
+_VENV_DIRS = (".venv", "venv")
+_BIN = "Scripts" if os.name == "nt" else "bin"
+
+
+@dataclass
+class ToolEnv:
+    """Where verification tools come from."""
+    source: str  # "uv" | "venv" | "uv run" (fallback: prefix commands)
+    fingerprint: str
+    python: str = ""  # interpreter inside the environment (not resolved through symlinks)
+    bin: str = ""
+    uv: bool = False  # uv was on PATH when resolved
+
+    @property
+    def direct(self) -> bool:
+        """Tools run from bin without a `uv run` prefix."""
+        return bool(self.python)
+
+    def is_current(self, root: Path) -> bool:
+        if self.fingerprint != fingerprint(root):
+            return False
+        if self.direct:
+            if not Path(self.python).exists():
+                return False
+            project = _project_venv(root) if self.source == "venv" else None
+            return project is None or str(project) == self.python
+        # Fallback: stale once resolve() would find something better
+        import shutil
+
+        return _project_venv(root) is None and (self.uv or not shutil.which("uv"))
+
+    def environ(self, base: Optional[dict] = None) -> dict:
+        """base (default os.environ) with the environment's bin first on PATH."""
+        env = dict(os.environ if base is None else base)
+        if self.direct:
+            env["PATH"] = os.pathsep.join([self.bin, env.get("PATH", "")])
+            env.pop("PYTHONHOME", None)
+            prefix = Path(self.bin).parent
+            if (prefix / "pyvenv.cfg").exists():
+                env["VIRTUAL_ENV"] = str(prefix)
+        return env
+
+
+def fingerprint(root: Path) -> str:
+    """sha256 over uv.lock and pyproject.toml (missing files hash as empty)."""
+    import hashlib  # init and verify only
+
+    digest = hashlib.sha256()
+    for name in FINGERPRINT_FILES:
+        try:
+            digest.update((root / name).read_bytes())
+        except OSError:
+            pass
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def resolve(root: Path) -> ToolEnv:
+    """
+    Resolve the project's environment: through uv when it is installed
+    and the project has a pyproject.toml (this syncs it once, like `uv run`
+    would), else the in-project virtualenv, else an activated one.
+    """
+    import shutil
+
+    fp = fingerprint(root)
+    has_uv = bool(shutil.which("uv"))
+    if has_uv and (root / "pyproject.toml").exists():
+        try:
+            proc = subprocess.run(
+                ["uv", "run", "--", "python", "-c", "import sys; print(sys.executable)"],
+                cwd=root, capture_output=True, text=True, timeout=RESOLVE_TIMEOUT,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            proc = None
+        lines = proc.stdout.strip().splitlines() if proc and proc.returncode == 0 else []
+        if lines and Path(lines[-1]).exists():
+            interpreter = Path(lines[-1])
+            return ToolEnv(
+                source="uv", fingerprint=fp, python=str(interpreter), bin=str(interpreter.parent),
+                uv=True,
+            )
+
+    # The project's own .venv wins over whatever venv the caller has activated
+    python = _project_venv(root)
+    if python is None and os.environ.get("VIRTUAL_ENV"):
+        python = _venv_python(Path(os.environ["VIRTUAL_ENV"]))
+    if python is not None:
+        return ToolEnv(
+            source="venv", fingerprint=fp, python=str(python), bin=str(python.parent), uv=has_uv
+        )
+    return ToolEnv(source=FALLBACK, fingerprint=fp, uv=has_uv)
+
+
+def _project_venv(root: Path) -> Optional[Path]:
+    """Interpreter of an in-project virtualenv (.venv, venv), if any."""
+    for name in _VENV_DIRS:
+        python = _venv_python(root.resolve() / name)
+        if python is not None:
+            return python
+    return None
+
+
+def _venv_python(venv: Path) -> Optional[Path]:
+    for name in ("python", "python3", "python.exe"):
+        python = venv / _BIN / name
+        if python.exists():
+            return python
+    return None
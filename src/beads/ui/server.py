@@ -6,6 +6,10 @@ import webbrowser
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 
+from beads.freeze import frozen_dir_names, frozen_manifests
+from beads.model import Ledger
+from beads.shards import merge_shards
+
 
 def _read_bead_title(bead_file: Path) -> str | None:
     """Extract title from '# Bead XX-YY: Title' line."""
@@ -19,7 +23,7 @@ def _read_bead_title(bead_file: Path) -> str | None:
 
 
 def _build_data(project_root: Path) -> dict:
-    """Build dashboard data from ledger.json + planning dirs."""
+    """Build dashboard data from ledger.json, phase shards, frozen manifests and planning dirs."""
     ledger_path = project_root / ".beads" / "ledger.json"
     error_count_path = project_root / ".beads" / ".error-count"
 
@@ -27,59 +31,43 @@ def _build_data(project_root: Path) -> dict:
         return {"error": "No ledger.json found — is this a Beads project?"}
 
     try:
-        ledger = json.loads(ledger_path.read_text())
+        ledger = Ledger.from_dict(merge_shards(project_root, json.loads(ledger_path.read_text())))
     except json.JSONDecodeError:
         return {"error": "ledger.json is not valid JSON"}
 
-    beads_dict = ledger.get("beads", {})
-    roadmap = ledger.get("roadmap", [])
-    active_bead = ledger.get("active_bead")
+    active_bead = ledger.active_bead
+
+    # Frozen phases are answered from their manifest — their planning trees are never walked
+    manifests = frozen_manifests(project_root)
+    frozen_dirs = frozen_dir_names(manifests)
 
     # Build phase name map from .planning/phases/ directories
     phase_names: dict[str, str] = {}
     planning_dir = project_root / ".planning" / "phases"
+    dir_names = [m["name"] for m in manifests.values() if m.get("name")]
     if planning_dir.exists():
-        for phase_dir in planning_dir.iterdir():
-            if phase_dir.is_dir():
-                match = re.match(r'^(\d{2})-(.+)', phase_dir.name)
-                if match:
-                    num = match.group(1)
-                    name = match.group(2).replace("-", " ").title()
-                    phase_names[num] = name
-
-    # Build roadmap phase status map
-    roadmap_status: dict[str, str] = {}
-    for entry in roadmap:
-        roadmap_status[entry.get("phase", "")] = entry.get("status", "open")
+        dir_names += [
+            d.name for d in planning_dir.iterdir() if d.is_dir() and d.name not in frozen_dirs
+        ]
+    for dir_name in dir_names:
+        match = re.match(r'^(\d{2})-(.+)', dir_name)
+        if match:
+            num = match.group(1)
+            name = match.group(2).replace("-", " ").title()
+            phase_names[num] = name
 
     # Collect all phase numbers from beads + roadmap + .planning/phases/ dirs
-    all_phases: set[str] = set()
-    for bid, info in beads_dict.items():
-        phase = info.get("phase")
-        if phase:
-            all_phases.add(phase)
-    for entry in roadmap:
-        p = entry.get("phase")
-        if p:
-            all_phases.add(p)
-    if planning_dir.exists():
-        for phase_dir in planning_dir.iterdir():
-            if phase_dir.is_dir():
-                m = re.match(r'^(\d{2})-', phase_dir.name)
-                if m:
-                    all_phases.add(m.group(1))
+    all_phases = set(ledger.by_phase) | set(ledger.phases) | set(phase_names)
 
     # Build phase objects
     phases = []
     for phase_num in sorted(all_phases):
-        phase_beads_raw = {
-            bid: info for bid, info in beads_dict.items()
-            if info.get("phase") == phase_num
-        }
+        phase_beads_raw = {bead.bead_id: bead.data for bead in ledger.in_phase(phase_num)}
 
         # Find phase dir on disk for title lookups + planned-but-not-started beads
         phase_dir_path: Path | None = None
-        if planning_dir.exists():
+        frozen_beads = manifests.get(phase_num, {}).get("beads")
+        if frozen_beads is None and planning_dir.exists():
             for d in planning_dir.iterdir():
                 if d.is_dir() and d.name.startswith(f"{phase_num}-"):
                     phase_dir_path = d
@@ -95,14 +83,15 @@ def _build_data(project_root: Path) -> dict:
                     if m:
                         disk_beads[m.group(1)] = bead_file
 
-        # Merge ledger beads + disk beads
-        all_bead_ids = sorted(set(list(phase_beads_raw.keys()) + list(disk_beads.keys())))
+        # Merge ledger beads + disk beads (or the frozen manifest)
+        frozen_beads = frozen_beads or {}
+        all_bead_ids = sorted(set(phase_beads_raw) | set(disk_beads) | set(frozen_beads))
 
         phase_beads = []
         for bid in all_bead_ids:
-            info = phase_beads_raw.get(bid, {})
-            status = info.get("status", "planned")
-            title = None
+            info = phase_beads_raw.get(bid) or frozen_beads.get(bid, {})
+            status = info.get("status") or "planned"
+            title = frozen_beads.get(bid, {}).get("title")
             if bid in disk_beads:
                 title = _read_bead_title(disk_beads[bid])
             phase_beads.append({
@@ -115,11 +104,12 @@ def _build_data(project_root: Path) -> dict:
         total = len(phase_beads)
         complete = sum(1 for b in phase_beads if b["status"] == "complete")
         pct = round(complete / total * 100) if total else 0
+        phase_status = ledger.phases[phase_num].status if phase_num in ledger.phases else None
 
         phases.append({
             "num": phase_num,
             "name": phase_names.get(phase_num, f"Phase {phase_num}"),
-            "status": roadmap_status.get(phase_num, "open"),
+            "status": phase_status or "open",
             "beads": phase_beads,
             "total": total,
             "complete": complete,
@@ -142,7 +132,7 @@ def _build_data(project_root: Path) -> dict:
             pass
 
     return {
-        "project": ledger.get("project", {}),
+        "project": ledger.project,
         "phases": phases,
         "active_bead": active_bead,
         "total_beads": total_beads,
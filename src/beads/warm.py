@@ -0,0 +1,314 @@
+"""
+Warm verification tool servers.
+
+With fsm.warm_servers enabled, init starts per-bead servers in the
+project's environment once the bead enters EXECUTE:
+
+    .beads/warm/pytest.sock    forkserver: pytest and the project's third-party
+                               dependencies imported once, one fork per run
+    .beads/warm/dmypy.json     mypy daemon status file
+
+verify routes plain `pytest ...` and `mypy ...` commands through them
+while they are up (and runs them cold otherwise); they are stopped when
+the bead reaches COMPLETE or FAILED. Project modules are never preloaded
+— the bead is editing them.
+
+This file is also the server and client script, so it imports only the
+standard library at module level:
+
+    python warm.py serve <socket>                  forkserver
+    python warm.py <socket> pytest [args...]       client, exits with pytest's code
+"""
+
+import io
+import json
+import os
+import re
+import shlex
+import signal
+import socket
+import subprocess
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+WARM_DIR = Path(".beads/warm")
+PYTEST_SOCKET = WARM_DIR / "pytest.sock"
+PYTEST_PID = WARM_DIR / "pytest.pid"
+DMYPY_STATUS = WARM_DIR / "dmypy.json"
+TOOLS = ("pytest", "mypy")
+
+_SCRIPT = Path(__file__).resolve()
+_HEADER = 8  # bytes of request length, sent with the client's stdio fds
+_SHELL_OPERATORS = set(";&|<>()`$")
+
+
+# -- engine side -------------------------------------------------------------
+
+def start(root: Path, tools: Iterable[str], python: list[str]) -> list[str]:
+    """
+    Start the requested servers in the background with the project's
+    python command (e.g. ["uv", "run", "python"]); returns the tools started.
+    """
+    (root / WARM_DIR).mkdir(parents=True, exist_ok=True)
+    log = open(root / WARM_DIR / "servers.log", "ab")
+    started = []
+    try:
+        if "pytest" in tools:
+            proc = subprocess.Popen(
+                [*python, str(_SCRIPT), "serve", str(PYTEST_SOCKET)],
+                cwd=root, stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True,
+            )
+            (root / PYTEST_PID).write_text(f"{proc.pid}\n")
+            started.append("pytest")
+        if "mypy" in tools:
+            subprocess.Popen(
+                [*python, "-m", "mypy.dmypy", "--status-file", str(DMYPY_STATUS), "start"],
+                cwd=root, stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True,
+            )
+            started.append("mypy")
+    finally:
+        log.close()
+    return started
+
+
+def stop(root: Path) -> list[str]:
+    """Stop whichever servers are running; returns the tools stopped."""
+    stopped = []
+    pid = _read_pid(root / PYTEST_PID)
+    if pid and _kill(pid):
+        stopped.append("pytest")
+    try:
+        dmypy_pid = int(json.loads((root / DMYPY_STATUS).read_text()).get("pid") or 0)
+    except (OSError, ValueError, AttributeError):
+        dmypy_pid = 0
+    if dmypy_pid and _kill(dmypy_pid):
+        stopped.append("mypy")
+    for path in (PYTEST_PID, PYTEST_SOCKET, DMYPY_STATUS):
+        try:
+            (root / path).unlink()
+        except FileNotFoundError:
+            pass
+    return stopped
+
+
+def route(cmd: str, root: Path) -> tuple[str, Optional[str]]:
+    """
+    Rewrite a plain pytest or mypy command to go through its warm server.
+    Returns (command, tool) — tool is None when cmd runs cold.
+    """
+    if any(ch in _SHELL_OPERATORS for ch in cmd):
+        return cmd, None
+    try:
+        tokens = shlex.split(cmd)
+    except ValueError:
+        return cmd, None
+    for i, token in enumerate(tokens):
+        if token in ("pytest", "mypy") or token.endswith(("/pytest", "/mypy")):
+            break
+    else:
+        return cmd, None
+    args = tokens[i + 1:]
+    if token.endswith("pytest"):
+        pid = _read_pid(root / PYTEST_PID)
+        if not pid or not _alive(pid) or not (root / PYTEST_SOCKET).exists():
+            return cmd, None  # not running, or still importing
+        client = [sys.executable, str(_SCRIPT), str(PYTEST_SOCKET), "pytest", *args]
+        return shlex.join(client), "pytest"
+    if not (root / DMYPY_STATUS).exists():
+        return cmd, None
+    if i > 0 and tokens[i - 1] == "-m":
+        dmypy = "mypy.dmypy"  # `python -m mypy`: the daemon client is a submodule
+    else:
+        dmypy = re.sub(r'mypy$', 'dmypy', token)  # executable, maybe a path to one
+    client = [*tokens[:i], dmypy, "--status-file", str(DMYPY_STATUS), "run", "--", *args]
+    return shlex.join(client), "mypy"
+
+
+def _read_pid(path: Path) -> int:
+    try:
+        return int(path.read_text().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _kill(pid: int, sig: int = signal.SIGTERM) -> bool:
+    """Signal pid's process group (or pid alone when it leads none); False if it is gone."""
+    try:
+        os.killpg(pid, sig)
+        return True
+    except (ProcessLookupError, PermissionError):
+        pass
+    try:
+        os.kill(pid, sig)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+# -- forkserver (runs in the project's environment) --------------------------
+
+def serve(sock_path: str) -> None:
+    """Import pytest and the dependencies, then fork one child per client request."""
+    import pytest  # noqa: F401 — the point of the server
+
+    for name in _dependency_modules(Path.cwd()):
+        try:
+            __import__(name)
+        except Exception:  # a broken optional dependency must not stop the server
+            pass
+
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # children are reaped automatically
+    try:
+        os.unlink(sock_path)
+    except FileNotFoundError:
+        pass
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    tmp = f"{sock_path}.{os.getpid()}.tmp"
+    server.bind(tmp)
+    server.listen(64)
+    os.replace(tmp, sock_path)  # the socket appears only once everything is imported
+    sys.stdout.flush()
+    sys.stderr.flush()
+    while True:
+        conn, _ = server.accept()
+        if os.fork() == 0:
+            server.close()
+            _run_child(conn)
+        conn.close()
+
+
+def _run_child(conn: socket.socket) -> None:
+    """Forked child: take over the client's stdio, run pytest, report the exit code."""
+    code = 1
+    try:
+        header, fds, _, _ = socket.recv_fds(conn, _HEADER, 3)
+        size = int.from_bytes(header, "big")
+        payload = b""
+        while len(payload) < size:
+            chunk = conn.recv(size - len(payload))
+            if not chunk:
+                os._exit(1)
+            payload += chunk
+        request = json.loads(payload)
+
+        os.setsid()  # own group, so the client can kill the run and its workers
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        for stream in (sys.stdout, sys.stderr):
+            if isinstance(stream, io.TextIOWrapper):
+                stream.reconfigure(line_buffering=True)
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        for entry in reversed(request["env"].get("PYTHONPATH", "").split(os.pathsep)):
+            if entry and entry not in sys.path:
+                sys.path.insert(0, entry)  # e.g. verify's pytest plugin directory
+        sys.argv = ["pytest", *request["args"]]
+        conn.sendall(f"{os.getpid()}\n".encode())
+
+        import pytest
+        try:
+            code = int(pytest.main(request["args"]))
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            conn.sendall(f"{code}\n".encode())
+        except Exception:
+            pass
+        os._exit(code)
+
+
+def _dependency_modules(root: Path) -> list[str]:
+    """Top-level modules of the project's declared third-party dependencies."""
+    try:
+        import tomllib
+        from importlib.metadata import packages_distributions
+        from importlib.util import find_spec
+        pyproject = tomllib.loads((root / "pyproject.toml").read_text())
+    except Exception:
+        return []
+
+    def norm(name: str) -> str:
+        return re.sub(r'[-_.]+', '-', name).lower()
+
+    project = pyproject.get("project") or {}
+    requirements = list(project.get("dependencies") or [])
+    for group in (project.get("optional-dependencies") or {}).values():
+        requirements.extend(group)
+    for group in (pyproject.get("dependency-groups") or {}).values():
+        requirements.extend(r for r in group if isinstance(r, str))
+    names = (re.match(r'[A-Za-z0-9._-]+', r) for r in requirements)
+    wanted = {norm(m.group(0)) for m in names if m}
+    wanted.discard(norm(project.get("name") or ""))
+
+    modules = []
+    for module, dists in packages_distributions().items():
+        if module.startswith("_") or not any(norm(d) in wanted for d in dists):
+            continue
+        try:
+            spec = find_spec(module)
+        except Exception:
+            continue
+        origin = getattr(spec, "origin", None) or ""
+        if spec is None or origin.startswith(str(root.resolve()) + os.sep):
+            continue  # editable install of the project itself
+        modules.append(module)
+    return sorted(modules)
+
+
+# -- client ------------------------------------------------------------------
+
+def client(sock_path: str, args: list[str]) -> int:
+    """Hand this process's stdio to a forked pytest run and wait for its exit code."""
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(sock_path)
+    except OSError as e:
+        print(f"warm pytest server unavailable: {e}", file=sys.stderr)
+        return 1
+    payload = json.dumps({"args": args, "cwd": os.getcwd(), "env": dict(os.environ)}).encode()
+    socket.send_fds(conn, [len(payload).to_bytes(_HEADER, "big")], [0, 1, 2])
+    conn.sendall(payload)
+    reply = conn.makefile("rb")
+    pid = int(reply.readline() or 0)
+
+    def forward(signum, _frame):
+        if pid:
+            _kill(pid, signal.SIGKILL)  # the run is being abandoned: take its workers down too
+        os._exit(128 + signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    line = reply.readline().strip()
+    return int(line) if line else 1
+
+
+if __name__ == "__main__":
+    if sys.path and Path(sys.path[0]).resolve() == _SCRIPT.parent:
+        sys.path.pop(0)  # beads' own modules must not shadow the project's
+    if len(sys.argv) >= 3 and sys.argv[1] == "serve":
+        serve(sys.argv[2])
+    elif len(sys.argv) >= 3 and sys.argv[2] == "pytest":
+        sys.exit(client(sys.argv[1], sys.argv[3:]))
+    else:
+        print(__doc__)
+        sys.exit(2)
@@ -0,0 +1,136 @@
+"""
+Watch-mode verification.
+
+`fsm.py verify --watch` polls the bead's scope files and the test files
+of its pytest command, and after every change re-runs only the tests the
+change can affect:
+
+    changed test file               -> that file
+    changed module (src/pkg/mod.py) -> test files importing pkg.mod or mod,
+                                       directly or through other watched modules
+    anything else (conftest.py, data, config, unmapped modules)
+                                    -> the full verification command
+
+Watch runs are feedback only: they log to .beads/logs/<bead>/watch.log,
+never count as an attempt and never change fsm-state.json. The bead
+still completes through a plain `fsm.py verify`.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+POLL_INTERVAL = 0.5  # seconds between scans of the watched files
+WATCH_LOG = "watch.log"  # in .beads/logs/<bead>/, replaced by every run
+_FULL_RUN_FILES = {"conftest.py", "pytest.ini", "pyproject.toml", "setup.cfg", "tox.ini"}
+_SOURCE_ROOTS = ("src/", "lib/")
+
+
+@dataclass
+class WatchRun:
+    """One watch-mode run (never an attempt)."""
+    command: str
+    returncode: int
+    changed: list[str] = field(default_factory=list)  # files that triggered it (empty: first run)
+    tests: Optional[list[str]] = None  # test files re-run; None: the full command
+    passed: int = 0
+    failed: int = 0
+    failed_tests: list[str] = field(default_factory=list)
+    tail: str = ""
+    log: Optional[str] = None
+    duration: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 or (self.returncode == 5 and self.tests is not None)
+
+
+def snapshot(root: Path, paths: Iterable[str]) -> dict[str, int]:
+    """mtime (ns) of each existing path."""
+    stamps = {}
+    for path in paths:
+        try:
+            stamps[path] = (root / path).stat().st_mtime_ns
+        except OSError:
+            pass
+    return stamps
+
+
+def changed_files(before: dict[str, int], after: dict[str, int]) -> list[str]:
+    """Paths added, removed or modified between two snapshots."""
+    return sorted(p for p in before.keys() | after.keys() if before.get(p) != after.get(p))
+
+
+def affected_tests(
+    changed: list[str], test_files: list[str], root: Path, sources: Iterable[str] = ()
+) -> Optional[list[str]]:
+    """
+    Test files to re-run for changed paths; None when any change can't be
+    mapped to specific tests (the full command runs then). Imports are
+    followed through the Python files in sources, so a test importing
+    pkg.core re-runs when pkg.helpers, imported by pkg.core, changes.
+    Modules outside sources are not followed.
+    """
+    modules = [s for s in sources if s.endswith(".py") and s not in test_files]
+    selected: list[str] = []
+    for path in changed:
+        if path in test_files:
+            selected.append(path)
+            continue
+        if Path(path).name in _FULL_RUN_FILES or not path.endswith(".py"):
+            return None
+        importers = _importers(path, test_files, modules, root)
+        if not importers:
+            return None
+        selected.extend(importers)
+    existing = [t for t in dict.fromkeys(selected) if (root / t).exists()]
+    return existing or None
+
+
+def _importers(path: str, test_files: list[str], modules: list[str], root: Path) -> list[str]:
+    """Test files importing path's module, directly or through any of modules."""
+    texts: dict[str, str] = {}
+
+    def imports(file: str, pattern: re.Pattern[str]) -> bool:
+        if file not in texts:
+            try:
+                texts[file] = (root / file).read_text(errors="replace")
+            except OSError:
+                texts[file] = ""
+        return pattern.search(texts[file]) is not None
+
+    found: set[str] = set()
+    seen, pending = {path}, [path]
+    while pending:
+        pattern = _import_pattern(pending.pop())
+        if pattern is None:
+            continue
+        found.update(t for t in test_files if t not in found and imports(t, pattern))
+        for module in modules:
+            if module not in seen and imports(module, pattern):
+                seen.add(module)
+                pending.append(module)
+    return [t for t in test_files if t in found]
+
+
+def _import_pattern(path: str) -> Optional[re.Pattern[str]]:
+    """Import statements naming path's module (None for a path with no module name)."""
+    module = path[:-len(".py")]
+    for prefix in _SOURCE_ROOTS:
+        if module.startswith(prefix):
+            module = module[len(prefix):]
+            break
+    parts = [p for p in module.split("/") if p]
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    if not parts:
+        return None
+    dotted = re.escape(".".join(parts))
+    name = re.escape(parts[-1])
+    module_ref = rf'(?:[\w.]*\.)?(?:{dotted}|{name})\b'
+    return re.compile(
+        rf'^\s*(?:from\s+{module_ref}|import\s+{module_ref}|from\s+[\w.]+\s+import\s+.*\b{name}\b)',
+        re.MULTILINE,
+    )
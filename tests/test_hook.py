@@ -0,0 +1,127 @@
+"""Tests for the beads-hook dispatcher."""
+import json
+
+from beads.hook import evaluate, render_hook_settings, track_error
+
+
+def _edit(path):
+    return {"tool_name": "Edit", "tool_input": {"file_path": path}}
+
+
+def _bash(command):
+    return {"tool_name": "Bash", "tool_input": {"command": command}}
+
+
+def _guard(root, active):
+    beads = root / ".beads"
+    beads.mkdir(exist_ok=True)
+    (beads / ".guard-state").write_text(f"# managed\nBEAD_ACTIVE={active}\nBEAD_ID=01-01\n")
+
+
+def test_source_edit_needs_active_bead(tmp_path):
+    """Source edits are denied without an active bead and allowed with one."""
+    _guard(tmp_path, "0")
+    decision, reason = evaluate(_edit("src/app.py"), tmp_path)
+    assert decision == "deny"
+    assert "No active bead" in reason
+
+    _guard(tmp_path, "1")
+    assert evaluate(_edit("src/app.py"), tmp_path) == ("allow", None)
+
+
+def test_planning_and_outside_edits_allowed(tmp_path):
+    """Exempt paths and files outside the project never need a bead."""
+    _guard(tmp_path, "0")
+    assert evaluate(_edit(".planning/phases/01/PLAN.md"), tmp_path)[0] == "allow"
+    assert evaluate(_edit("CLAUDE.md"), tmp_path)[0] == "allow"
+    assert evaluate(_edit("/elsewhere/notes.md"), tmp_path)[0] == "allow"
+
+
+def test_protected_files_denied(tmp_path):
+    """Framework files are denied even with an active bead."""
+    _guard(tmp_path, "1")
+    for path in (".beads/ledger.json", ".beads/lib/beads/engine.py", ".claude/settings.json"):
+        decision, reason = evaluate(_edit(path), tmp_path)
+        assert decision == "deny", path
+        assert "managed by the BEADS runtime" in reason
+
+
+def test_bash_rules(tmp_path):
+    """Shell commands may not touch framework files unless they are FSM calls."""
+    _guard(tmp_path, "1")
+    assert evaluate(_bash("pytest -q"), tmp_path) == ("allow", None)
+    assert evaluate(_bash("cat .beads/ledger.json"), tmp_path)[0] == "deny"
+    assert evaluate(_bash("echo x > .claude/notes"), tmp_path)[0] == "deny"
+    assert evaluate(_bash("python3 .beads/bin/fsm.py status"), tmp_path)[0] == "allow"
+
+
+def test_error_lock(tmp_path):
+    """Repeated failures lock edits and shell access, but not FSM commands."""
+    _guard(tmp_path, "1")
+    (tmp_path / ".beads" / ".error-count").write_text("2\n")
+    assert evaluate(_edit("src/app.py"), tmp_path)[0] == "deny"
+    assert evaluate(_bash("ls"), tmp_path)[0] == "deny"
+    assert evaluate(_bash("python .beads/bin/fsm.py init 01-02"), tmp_path)[0] == "allow"
+
+
+def test_other_tools_allowed(tmp_path):
+    """Read-only tools are never evaluated."""
+    assert evaluate({"tool_name": "Read", "tool_input": {"file_path": ".beads/ledger.json"}},
+                    tmp_path) == ("allow", None)
+
+
+def test_missing_guard_state_falls_back_to_fsm_state(tmp_path):
+    """Without .guard-state (older fsm.py), the bead in fsm-state.json decides."""
+    beads = tmp_path / ".beads"
+    beads.mkdir()
+    assert evaluate(_edit("src/app.py"), tmp_path)[0] == "deny"
+
+    state = {"bead_id": "01-01", "current_state": "execute", "retry_count": 0}
+    (beads / "fsm-state.json").write_text(json.dumps(state))
+    assert evaluate(_edit("src/app.py"), tmp_path) == ("allow", None)
+
+    state["current_state"] = "complete"
+    (beads / "fsm-state.json").write_text(json.dumps(state))
+    assert evaluate(_edit("src/app.py"), tmp_path)[0] == "deny"
+
+
+def test_post_tool_use_counts_failures(tmp_path):
+    """Failed tool calls bump .error-count until the error lock engages."""
+    _guard(tmp_path, "1")
+    ok = {"hook_event_name": "PostToolUse", "tool_name": "Bash", "tool_response": {"stdout": ""}}
+    failed = {**ok, "tool_response": {"stdout": "", "exit_code": 1}}
+
+    assert track_error(ok, tmp_path) is None
+    assert track_error(failed, tmp_path) == 1
+    assert track_error({**ok, "tool_response": {"is_error": True}}, tmp_path) == 2
+    assert evaluate(_edit("src/app.py"), tmp_path)[0] == "deny"
+
+
+def test_render_hook_settings_routes_both_events():
+    """Replaced guard and tracker scripts collapse into one dispatcher entry per event."""
+    settings = {"hooks": {
+        "PreToolUse": [
+            {"matcher": "Edit|Write", "hooks": [{"command": ".claude/hooks/protect-files.sh"}]},
+            {"matcher": "Bash", "hooks": [{"command": ".claude/hooks/guard-bash.sh"}]},
+        ],
+        "PostToolUse": [
+            {"matcher": "Bash", "hooks": [{"command": ".claude/hooks/error-tracker.sh"}]},
+            {"matcher": "Edit", "hooks": [{"command": "./format.sh"}]},
+        ],
+    }}
+    rendered = json.loads(render_hook_settings(json.dumps(settings)))
+    pre, post = rendered["hooks"]["PreToolUse"], rendered["hooks"]["PostToolUse"]
+    assert pre == [{"matcher": "Edit|Write|Bash",
+                    "hooks": [{"type": "command", "command": "beads-hook", "timeout": 5}]}]
+    assert post[0]["matcher"] == "Bash"
+    assert post[0]["hooks"][0]["command"] == "beads-hook"
+    assert post[1] == {"matcher": "Edit", "hooks": [{"command": "./format.sh"}]}
+    assert render_hook_settings(json.dumps(rendered)) == json.dumps(rendered, indent=2) + "\n"
+
+
+def test_bash_redirect_rules_match_guard_bash(tmp_path):
+    """Flags or other words between a redirect and the framework path still deny."""
+    _guard(tmp_path, "1")
+    assert evaluate(_bash("echo x | tee -a .claude/rules/x.md"), tmp_path)[0] == "deny"
+    assert evaluate(_bash("echo x > out .claude/x"), tmp_path)[0] == "deny"
+    assert evaluate(_bash("echo x > out.txt"), tmp_path)[0] == "allow"
@@ -15,6 +15,15 @@ def test_fsm_import():
     assert State is not None
 
 
+def test_engine_import():
+    """Test that the in-process engine API can be imported."""
+    from beads import BeadsError, Engine
+    from beads.engine import VerifyResult
+    assert issubclass(Engine, object)
+    assert issubclass(BeadsError, Exception)
+    assert VerifyResult is not None
+
+
 def test_cli_import():
     """Test that CLI module can be imported."""
     from beads.cli.main import cli
@@ -0,0 +1,110 @@
+"""Tests for background verification jobs."""
+import json
+import subprocess
+from dataclasses import asdict
+
+import pytest
+
+from beads import jobs
+from beads.engine import Engine, JobError
+from beads.jobs import Job
+from beads.toolenv import ToolEnv, fingerprint
+
+
+def _repo(root, monkeypatch):
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "t")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "t@example.com")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    (root / "app.py").write_text("x = 1\n")
+    subprocess.run(["git", "add", "app.py"], cwd=root, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "init"], cwd=root, check=True)
+    (root / ".beads").mkdir()
+
+
+def _activate(root, retry_count=0, tool_env=None):
+    state = {
+        "bead_id": "01-01", "current_state": "execute", "retry_count": retry_count,
+        "initial_commit_sha": "", "verification_cmd": "pytest -q", "tool_env": tool_env,
+    }
+    (root / ".beads" / "fsm-state.json").write_text(json.dumps(state))
+
+
+def _finished_job(root, status="passed"):
+    job = Job(
+        job_id="1", bead_id="01-01", command="pytest -q", tree=jobs.snapshot_tree(root),
+        commit="", retry_count=0, status=status, result={"passed": status == "passed"},
+    )
+    jobs.save(root, job)
+    return job
+
+
+def test_job_ids_are_reserved(tmp_path):
+    """Each start claims the next unused id; an id whose record exists is never reused."""
+    assert jobs._reserve_id(tmp_path) == "1"
+    assert jobs._reserve_id(tmp_path) == "2"
+    (tmp_path / jobs.JOBS_DIR / "7.json").write_text("{}")
+    assert jobs._reserve_id(tmp_path) == "8"
+
+
+def test_run_records_unexpected_errors(tmp_path, monkeypatch):
+    """Any exception in the job process is recorded and the worktree still cleaned up."""
+    _repo(tmp_path, monkeypatch)
+    _activate(tmp_path)
+    jobs.save(tmp_path, Job(job_id="1", bead_id="01-01", command="pytest -q",
+                            tree="", commit="", retry_count=0))
+    cleaned = []
+
+    def boom(self, *args):
+        raise ValueError("unexpected")
+
+    monkeypatch.setattr("beads.engine.Engine._run_verification", boom)
+    monkeypatch.setattr("beads.jobs.cleanup", lambda root, job: cleaned.append(job.job_id))
+    (tmp_path / jobs.WORKTREES_DIR / "job-1").mkdir(parents=True)
+    jobs.run(tmp_path, "1")
+
+    job = jobs.load(tmp_path, "1")
+    assert job.status == "error"
+    assert job.error == "ValueError('unexpected')"
+    assert job.finished
+    assert cleaned == ["1"]
+
+
+def test_wait_marks_job_stale_when_tree_changed(tmp_path, monkeypatch):
+    """A result for a tree that has since been edited is not applied."""
+    _repo(tmp_path, monkeypatch)
+    _activate(tmp_path)
+    _finished_job(tmp_path)
+    (tmp_path / "app.py").write_text("x = 2\n")
+
+    outcome = Engine(tmp_path).wait_job("1")
+    assert outcome.stale == "working tree changed since the snapshot"
+    assert outcome.verify is None
+    assert jobs.load(tmp_path, "1").status == "stale"
+    assert json.loads((tmp_path / ".beads" / "fsm-state.json").read_text())["retry_count"] == 0
+
+
+def test_wait_marks_job_stale_after_another_attempt(tmp_path, monkeypatch):
+    """A job overtaken by a later verification of the same bead is stale."""
+    _repo(tmp_path, monkeypatch)
+    _activate(tmp_path, retry_count=1)
+    _finished_job(tmp_path)
+
+    outcome = Engine(tmp_path).wait_job("1")
+    assert "verified again" in outcome.stale
+    assert jobs.load(tmp_path, "1").status == "stale"
+
+
+def test_background_refuses_in_project_tool_env(tmp_path, monkeypatch):
+    """An environment inside the project is missing from the snapshot worktree."""
+    _repo(tmp_path, monkeypatch)
+    python = tmp_path / ".venv" / "bin" / "python"
+    python.parent.mkdir(parents=True)
+    python.write_text("")
+    env = ToolEnv(source="venv", fingerprint=fingerprint(tmp_path), python=str(python),
+                  bin=str(python.parent))
+    _activate(tmp_path, tool_env=asdict(env))
+
+    with pytest.raises(JobError, match="inside the project"):
+        Engine(tmp_path).verify_background()
+    assert not (tmp_path / jobs.JOBS_DIR).exists()
@@ -0,0 +1,58 @@
+"""Tests for switching the ledger between ledger.json and the SQLite backend."""
+import json
+
+from beads.engine import Engine
+
+
+def _project(root):
+    (root / ".beads").mkdir()
+    ledger = {
+        "version": 4,
+        "project": {"name": "t"},
+        "roadmap": [{"phase": "01", "status": "active"}],
+        "beads": {"01-01": {"phase": "01", "status": "complete"}, "01-02": {"phase": "01"}},
+        "active_bead": None,
+    }
+    (root / ".beads" / "ledger.json").write_text(json.dumps(ledger))
+    return ledger
+
+
+def test_migrate_to_sqlite_and_back(tmp_path):
+    """Both directions keep every ledger key; the database is removed on the way back."""
+    ledger = _project(tmp_path)
+    engine = Engine(tmp_path)
+
+    assert engine.set_ledger_backend("sqlite") is True
+    assert engine.ledger_backend == "sqlite"
+    assert engine.set_ledger_backend("sqlite") is False
+    migrated = engine.load_ledger()
+    assert migrated == {**ledger, "version": 5}
+    assert json.loads((tmp_path / ".beads" / "ledger.json").read_text()) == migrated
+
+    engine.set_bead_status("01-02", "complete")
+    assert engine.bead_history("01-02")[-1]["to"] == "complete"
+    assert json.loads(engine.ledger_file.read_text())["beads"]["01-02"]["status"] == "complete"
+
+    assert engine.set_ledger_backend("json") is True
+    assert engine.ledger_backend == "json"
+    assert not (tmp_path / ".beads" / "ledger.db").exists()
+    assert engine.load_ledger()["beads"]["01-02"]["status"] == "complete"
+
+
+def test_write_racing_the_migration_is_kept(tmp_path):
+    """A ledger.json write in flight when the backend switches lands in the database."""
+    _project(tmp_path)
+    engine, other = Engine(tmp_path), Engine(tmp_path)
+    calls = []
+
+    def record(data):
+        calls.append(data.get("version"))
+        if len(calls) == 1:  # the switch commits between this read and our write
+            other.set_ledger_backend("sqlite")
+        data["beads"]["01-02"]["status"] = "complete"
+
+    engine._update_ledger(record)
+    assert calls == [4, 5]
+    assert engine.ledger_backend == "sqlite"
+    assert engine.load_ledger()["beads"]["01-02"]["status"] == "complete"
+    assert json.loads(engine.ledger_file.read_text())["beads"]["01-02"]["status"] == "complete"
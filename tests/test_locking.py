@@ -0,0 +1,71 @@
+"""Tests for ledger compare-and-swap and locked counters."""
+import json
+import threading
+
+import pytest
+
+from beads.locking import ConflictError, cas_update, increment_counter, reset_counter
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+
+
+def test_cas_update_bumps_version(tmp_path):
+    """A write without competition applies once and increments the version."""
+    ledger = tmp_path / "ledger.json"
+    _write(ledger, {"version": 3, "beads": {}})
+
+    outcome, data = cas_update(ledger, tmp_path / "ledger.lock", lambda d: d["beads"].update(a=1))
+    assert outcome is None
+    assert data["version"] == 4
+    assert json.loads(ledger.read_text()) == {"version": 4, "beads": {"a": 1}}
+
+
+def test_cas_update_retries_after_conflict(tmp_path):
+    """A concurrent write between read and commit makes the mutation re-run on fresh data."""
+    ledger = tmp_path / "ledger.json"
+    _write(ledger, {"beads": {}})
+    calls = []
+
+    def mutate(data):
+        calls.append(dict(data["beads"]))
+        if len(calls) == 1:  # another writer commits first
+            _write(ledger, {"version": 1, "beads": {"other": 1}})
+        data["beads"]["mine"] = 1
+
+    cas_update(ledger, tmp_path / "ledger.lock", mutate)
+    assert calls == [{}, {"other": 1}]
+    assert json.loads(ledger.read_text()) == {"version": 2, "beads": {"other": 1, "mine": 1}}
+
+
+def test_cas_update_gives_up(tmp_path):
+    """Losing every race raises ConflictError and leaves the competing write intact."""
+    ledger = tmp_path / "ledger.json"
+    _write(ledger, {"version": 0})
+
+    def mutate(data):
+        _write(ledger, {"version": data["version"] + 1})
+
+    with pytest.raises(ConflictError):
+        cas_update(ledger, tmp_path / "ledger.lock", mutate, retries=3)
+    assert json.loads(ledger.read_text()) == {"version": 3}
+
+
+def test_increment_counter_concurrent(tmp_path):
+    """Concurrent increments are never lost; garbage counts as 0; reset removes the file."""
+    counter, lock = tmp_path / ".error-count", tmp_path / "error-count.lock"
+    counter.write_text("garbage")
+    threads = [
+        threading.Thread(target=lambda: [increment_counter(counter, lock) for _ in range(25)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.read_text().strip() == "100"
+
+    reset_counter(counter, lock)
+    assert not counter.exists()
+    assert increment_counter(counter, lock) == 1
@@ -0,0 +1,38 @@
+"""Tests for the indexed ledger model."""
+from beads.model import Ledger
+
+
+def test_indexes():
+    """Beads are indexed by ID, phase and status; records share the ledger's dicts."""
+    data = {
+        "active_bead": "02-01",
+        "roadmap": [{"phase": "01", "status": "closed"}, {"phase": "02", "status": "active"}],
+        "phase_rollup": {"01": {"complete": 3, "shard": ".beads/ledger/phase-01.json"}},
+        "beads": {
+            "02-01": {"phase": "02", "status": "in_progress"},
+            "02-02": {"status": "pending"},
+            "03-01": {"phase": "03", "status": "pending"},
+        },
+    }
+    ledger = Ledger.from_dict(data)
+
+    assert ledger.bead("02-01").data is data["beads"]["02-01"]
+    assert ledger.bead("09-09") is None
+    assert [b.bead_id for b in ledger.in_phase("02")] == ["02-01", "02-02"]
+    assert [b.bead_id for b in ledger.with_status("pending")] == ["02-02", "03-01"]
+    assert ledger.count() == 3 and ledger.count("pending") == 2
+    assert ledger.is_phase_closed("01") and not ledger.is_phase_closed("02")
+    assert ledger.closed_phases() == ["01"]
+    assert ledger.rollup["01"]["complete"] == 3
+    assert ledger.active_bead == "02-01"
+    assert ledger.statuses()["03-01"] == "pending"
+
+
+def test_empty_ledger():
+    """A ledger without beads or roadmap still answers every query."""
+    ledger = Ledger.from_dict({})
+    assert ledger.count() == 0
+    assert ledger.in_phase("01") == []
+    assert ledger.closed_phases() == []
+    assert ledger.rollup == {}
+    assert ledger.project == {}
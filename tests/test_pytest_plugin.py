@@ -0,0 +1,60 @@
+"""Tests for the bundled pytest plugin's results file."""
+import json
+
+import pytest
+
+from beads.pytest_plugin import _Recorder, _combined_exit, _merge_write
+
+
+def _run(exitstatus, tests, duration=1.0, collection_errors=()):
+    return {
+        "exitstatus": exitstatus,
+        "duration": duration,
+        "collection_errors": list(collection_errors),
+        "tests": [{"nodeid": n, "outcome": o, "when": "call", "duration": 0.5} for n, o in tests],
+    }
+
+
+def test_shards_merge_into_one_file(tmp_path):
+    """Concurrent shards fold into one summary; a node ID keeps its latest outcome."""
+    path = str(tmp_path / "results" / "01-01-1.json")
+    _merge_write(path, _run(1, [("t.py::a", "failed"), ("t.py::b", "passed")]))
+    _merge_write(path, _run(0, [("u.py::c", "skipped")], collection_errors=["v.py"]))
+    _merge_write(path, _run(0, [("t.py::a", "passed")]))
+
+    data = json.loads((tmp_path / "results" / "01-01-1.json").read_text())
+    assert data["runs"] == 3
+    assert data["duration"] == 3.0
+    assert data["summary"]["passed"] == 2 and data["summary"]["skipped"] == 1
+    assert data["summary"]["failed"] == 0
+    assert data["collection_errors"] == ["v.py"]
+    assert data["exitstatus"] == 1
+
+
+def test_combined_exit():
+    """A real failure wins; a failed-first run that found nothing defers to the full run."""
+    assert _combined_exit(None, 5) == 5
+    assert _combined_exit(0, 1) == 1
+    assert _combined_exit(1, 0) == 1
+    assert _combined_exit(5, 0) == 0
+    assert _combined_exit(4, 5) == 4
+
+
+class _Session:
+    pass
+
+
+def test_recorder_writes_every_listed_file(tmp_path):
+    """A named check's run lands in its own file as well as the attempt's."""
+    attempt, check = tmp_path / "1.json", tmp_path / "1-unit.json"
+    _Recorder([str(attempt), str(check)]).pytest_sessionfinish(_Session(), 0)
+    assert json.loads(attempt.read_text())["runs"] == 1
+    assert json.loads(check.read_text())["runs"] == 1
+
+
+def test_unwritable_results_warn(tmp_path):
+    """A results file that cannot be written is a warning, not a crash."""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    with pytest.warns(UserWarning, match="could not write test results"):
+        _Recorder([str(blocker / "1.json")]).pytest_sessionfinish(_Session(), 0)
@@ -0,0 +1,100 @@
+"""Tests for failed-first pytest retries."""
+import json
+import os
+import shutil
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+import beads
+from beads.engine import Engine
+from beads.results import PLUGIN_DIR, PLUGIN_MODULE
+from beads.retry import plan_run, pytest_launcher
+from beads.toolenv import ToolEnv, fingerprint
+
+CMD = "python -m pytest -q -p no:cacheprovider tests"
+
+
+def _project(root):
+    """A project with the plugin synced, one passing and one failing test, and an active bead."""
+    plugin = root / PLUGIN_DIR / f"{PLUGIN_MODULE}.py"
+    plugin.parent.mkdir(parents=True)
+    shutil.copyfile(Path(beads.__file__).parent / "pytest_plugin.py", plugin)
+    (root / "tests").mkdir()
+    (root / "tests" / "test_a.py").write_text(
+        "import pathlib\n\n"
+        "def test_ok():\n    pass\n\n"
+        "def test_flag():\n    assert pathlib.Path('flag').exists()\n"
+    )
+    env = ToolEnv(source="venv", fingerprint=fingerprint(root), python=sys.executable,
+                  bin=os.path.dirname(sys.executable))
+    state = {"bead_id": "01-01", "current_state": "execute", "retry_count": 0,
+             "initial_commit_sha": "", "tool_env": asdict(env)}
+    (root / ".beads" / "fsm-state.json").write_text(json.dumps(state))
+    return Engine(root)
+
+
+def test_pytest_launcher():
+    """Only single plain pytest invocations are tracked."""
+    assert pytest_launcher("uv run pytest -q tests") == ["uv", "run", "pytest"]
+    assert pytest_launcher("python -m pytest tests") == ["python", "-m", "pytest"]
+    assert pytest_launcher("pytest --junitxml=out.xml") == ["pytest"]
+    assert pytest_launcher("pytest -q && ruff check .") is None
+    assert pytest_launcher("ruff check .") is None
+
+
+def test_plan_run_failed_first():
+    """With failures from the last attempt, those node IDs run before the full command."""
+    failed = ["tests/test_a.py::test_x"]
+    plan = plan_run("pytest -q tests", failed)
+    assert plan.failed_first == failed
+    first, _, rest = plan.command.partition("; rc=$?;")
+    assert first == "pytest -q tests/test_a.py::test_x"
+    assert rest.endswith("; pytest -q tests")
+
+    assert plan_run("pytest -q tests").command == "pytest -q tests"
+    assert plan_run("make test", failed) is None
+
+
+def test_plan_run_reports_to_own_results():
+    """A check's own results file is added to BEADS_RESULTS for both of its runs."""
+    plan = plan_run("pytest -q tests", ["tests/test_a.py::test_x"], Path("/r/1-unit.json"))
+    prefix = f'BEADS_RESULTS="$BEADS_RESULTS"{os.pathsep}/r/1-unit.json '
+    assert plan.results == Path("/r/1-unit.json")
+    assert plan.command.startswith(prefix + "pytest -q tests/test_a.py::test_x;")
+    assert plan.command.endswith("; " + prefix + "pytest -q tests")
+
+
+def test_failed_first_uses_results_file(tmp_path):
+    """Failures come from the plugin's results; the next attempt re-runs them first."""
+    engine = _project(tmp_path)
+
+    first = engine._run_verification(CMD, None, None, True, 1)
+    assert not first.passed
+    assert first.failed_tests == ["tests/test_a.py::test_flag"]
+    assert engine.context.failed_tests == {CMD: ["tests/test_a.py::test_flag"]}
+    durations = json.loads((tmp_path / ".beads" / "cache" / "test-durations.json").read_text())
+    assert list(durations) == ["tests/test_a.py::test_flag", "tests/test_a.py::test_ok"]
+
+    (tmp_path / "flag").write_text("")
+    second = engine._run_verification(CMD, None, None, True, 1)
+    assert second.passed
+    assert second.failed_first == ["tests/test_a.py::test_flag"]
+    assert second.tests.passed == 2 and second.tests.failed == 0
+    assert engine.context.failed_tests == {}
+
+
+def test_named_checks_keep_failures_per_command(tmp_path):
+    """Each pytest check reports to its own file as well as the attempt's."""
+    engine = _project(tmp_path)
+    other = CMD.replace("-q", "-q -x")
+
+    result = engine._run_verification({"unit": CMD, "fast": other}, None, None, False, 1)
+    assert not result.passed
+    assert engine.context.failed_tests == {
+        CMD: ["tests/test_a.py::test_flag"], other: ["tests/test_a.py::test_flag"],
+    }
+    results = tmp_path / ".beads" / "results"
+    assert (results / "01-01-1-unit.json").exists()
+    assert (results / "01-01-1-fast.json").exists()
+    assert json.loads((results / "01-01-1.json").read_text())["runs"] == 2
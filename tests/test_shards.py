@@ -0,0 +1,108 @@
+"""Tests for closed-phase ledger shards and close_phase."""
+import json
+
+import pytest
+
+import beads.engine
+from beads.engine import Engine, LedgerError, PhaseIncompleteError
+from beads.shards import build_shard, load_shard, merge_shards, rollup_counts, write_shard
+
+
+def _project(root, beads):
+    (root / ".beads").mkdir()
+    (root / ".planning" / "phases" / "01-poc").mkdir(parents=True)
+    ledger = {"version": 0, "roadmap": [{"phase": "01", "status": "active"}], "beads": beads}
+    (root / ".beads" / "ledger.json").write_text(json.dumps(ledger))
+
+
+def _ledger(root):
+    return json.loads((root / ".beads" / "ledger.json").read_text())
+
+
+def test_build_and_write_shard(tmp_path):
+    """Shards merge with what is already there; the rollup counts every bead in the shard."""
+    shard, rollup = build_shard(tmp_path, "01", {"01-01": {"status": "complete"}})
+    assert not (tmp_path / ".beads" / "ledger" / "phase-01.json").exists()
+    write_shard(tmp_path, "01", shard)
+
+    shard, rollup = build_shard(tmp_path, "01", {"01-02": {"status": "skip"}})
+    write_shard(tmp_path, "01", shard)
+    assert set(load_shard(tmp_path, "01")["beads"]) == {"01-01", "01-02"}
+    assert rollup == {"complete": 1, "skip": 1, "shard": ".beads/ledger/phase-01.json"}
+
+
+def test_rollup_counts_and_merge(tmp_path):
+    """Counts sum over closed phases; merge_shards puts shard beads back."""
+    shard, rollup = build_shard(tmp_path, "01", {"01-01": {"status": "complete"}})
+    write_shard(tmp_path, "01", shard)
+    ledger = {
+        "phase_rollup": {"01": rollup, "02": {"complete": 2, "shard": "x"}},
+        "beads": {"03-01": {"status": "pending"}},
+    }
+    assert rollup_counts(ledger) == {"complete": 3}
+    assert set(merge_shards(tmp_path, ledger)["beads"]) == {"01-01", "03-01"}
+    assert rollup_counts({}) == {}
+
+
+def test_close_phase_moves_beads(tmp_path):
+    """Closing moves the phase's beads into its shard and marks the roadmap entry closed."""
+    _project(tmp_path, {"01-01": {"phase": "01", "status": "complete"},
+                        "02-01": {"phase": "02", "status": "pending"}})
+    result = Engine(tmp_path).close_phase("1")
+
+    assert result.archived == 1
+    assert result.shard == ".beads/ledger/phase-01.json"
+    ledger = _ledger(tmp_path)
+    assert set(ledger["beads"]) == {"02-01"}
+    assert ledger["roadmap"] == [{"phase": "01", "status": "closed"}]
+    assert ledger["phase_rollup"]["01"]["complete"] == 1
+    assert set(load_shard(tmp_path, "01")["beads"]) == {"01-01"}
+
+
+def test_close_phase_refuses_incomplete(tmp_path):
+    """An open bead keeps the phase open and writes no shard."""
+    _project(tmp_path, {"01-01": {"phase": "01", "status": "pending"}})
+    with pytest.raises(PhaseIncompleteError):
+        Engine(tmp_path).close_phase("01")
+    assert load_shard(tmp_path, "01") == {}
+
+
+def test_close_phase_writes_shard_once_after_conflict(tmp_path, monkeypatch):
+    """A CAS conflict re-runs the ledger change, but the shard is written only once."""
+    _project(tmp_path, {"01-01": {"phase": "01", "status": "complete"}})
+    built, written = [], []
+    real_build = beads.engine.build_shard
+
+    def build(root, phase, phase_beads):
+        built.append(phase)
+        if len(built) == 1:  # another writer commits while we compute
+            ledger = _ledger(tmp_path)
+            ledger["version"] += 1
+            (tmp_path / ".beads" / "ledger.json").write_text(json.dumps(ledger))
+        return real_build(root, phase, phase_beads)
+
+    def write(root, phase, shard):
+        written.append(phase)
+        write_shard(root, phase, shard)
+
+    monkeypatch.setattr(beads.engine, "build_shard", build)
+    monkeypatch.setattr(beads.engine, "write_shard", write)
+    Engine(tmp_path).close_phase("01")
+    assert built == ["01", "01"]
+    assert written == ["01"]
+
+
+def test_close_phase_reopens_when_shard_write_fails(tmp_path, monkeypatch):
+    """A failed shard write puts the beads back instead of losing them."""
+    _project(tmp_path, {"01-01": {"phase": "01", "status": "complete"}})
+
+    def fail(root, phase, shard):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(beads.engine, "write_shard", fail)
+    with pytest.raises(LedgerError):
+        Engine(tmp_path).close_phase("01")
+    ledger = _ledger(tmp_path)
+    assert set(ledger["beads"]) == {"01-01"}
+    assert ledger["roadmap"] == [{"phase": "01", "status": "active"}]
+    assert "phase_rollup" not in ledger
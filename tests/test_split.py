@@ -0,0 +1,86 @@
+"""Tests for duration-balanced pytest sharding."""
+import json
+
+from beads.split import (
+    DURATIONS_FILE, balance, collect_files, load_durations, parse_selection, record_durations,
+    shard_commands,
+)
+
+
+def _tests(root, names):
+    (root / "tests").mkdir()
+    for name in names:
+        (root / "tests" / name).write_text("")
+
+
+def test_balance_longest_first():
+    """Files go longest-first to the least-loaded shard."""
+    durations = {"a.py": 10.0, "b.py": 6.0, "c.py": 5.0, "d.py": 1.0}
+    shards = balance(["a.py", "b.py", "c.py", "d.py"], durations, 2)
+    assert shards == [["a.py", "d.py"], ["b.py", "c.py"]]
+
+
+def test_balance_unknown_files_cost_the_mean():
+    """Files without history count as the mean known duration."""
+    shards = balance(["a.py", "new.py", "b.py"], {"a.py": 8.0, "b.py": 2.0}, 2)
+    assert shards == [["a.py"], ["b.py", "new.py"]]
+
+
+def test_balance_never_makes_empty_shards():
+    """More shards than files yields one shard per file."""
+    assert balance(["a.py", "b.py"], {}, 8) == [["a.py"], ["b.py"]]
+
+
+def test_parse_selection_and_collect(tmp_path):
+    """Options keep their values; directories expand to test files."""
+    _tests(tmp_path, ["test_a.py", "test_b.py", "helpers.py"])
+    selection = parse_selection("uv run pytest -q -k fast tests --tb short", tmp_path)
+    assert selection.launcher == ["uv", "run", "pytest"]
+    assert selection.options == ["-q", "-k", "fast", "--tb", "short"]
+    assert selection.paths == ["tests"]
+    assert collect_files(selection, tmp_path) == ["tests/test_a.py", "tests/test_b.py"]
+    assert parse_selection("make test", tmp_path) is None
+
+
+def test_no_selection_without_explicit_paths_or_with_custom_patterns(tmp_path):
+    """Collection left to pytest (testpaths, python_files) is never guessed at."""
+    _tests(tmp_path, ["test_a.py"])
+    assert parse_selection("pytest -q", tmp_path) is None
+    assert shard_commands("pytest -q", tmp_path, 2) is None
+
+    (tmp_path / "pytest.ini").write_text("[pytest]\npython_files = check_*.py\n")
+    assert parse_selection("pytest -q tests", tmp_path) is None
+
+
+def test_shard_commands(tmp_path):
+    """Each shard keeps the launcher and options and gets a disjoint set of files."""
+    _tests(tmp_path, ["test_a.py", "test_b.py", "test_c.py"])
+    (tmp_path / DURATIONS_FILE).parent.mkdir(parents=True)
+    (tmp_path / DURATIONS_FILE).write_text(json.dumps({
+        "tests/test_a.py::test_x": 5.0, "tests/test_a.py::test_y": 4.0,
+        "tests/test_b.py::test_z": 4.0, "tests/test_c.py::test_w": 4.0,
+    }))
+
+    shards = shard_commands("pytest -q tests", tmp_path, 2)
+    assert shards == {
+        "shard-1": "pytest -q tests/test_a.py",
+        "shard-2": "pytest -q tests/test_b.py tests/test_c.py",
+    }
+    assert shard_commands("pytest -q tests/test_a.py", tmp_path, 2) is None
+    assert load_durations(tmp_path)["tests/test_a.py"] == 9.0
+
+
+def test_partial_runs_keep_file_totals(tmp_path):
+    """A failed-first or -k run updates only the tests it ran, never a file's whole total."""
+    _tests(tmp_path, ["test_a.py", "test_b.py"])
+    record_durations(tmp_path, [
+        {"nodeid": "tests/test_a.py::test_x", "duration": 3.0},
+        {"nodeid": "tests/test_a.py::test_y", "duration": 2.0},
+        {"nodeid": "tests/test_b.py::test_z", "duration": 1.0},
+    ])
+    record_durations(tmp_path, [{"nodeid": "tests/test_a.py::test_x", "duration": 4.0}])
+    assert load_durations(tmp_path) == {"tests/test_a.py": 6.0, "tests/test_b.py": 1.0}
+
+    (tmp_path / "tests" / "test_b.py").unlink()
+    record_durations(tmp_path, [{"nodeid": "tests/test_a.py::test_y", "duration": 2.0}])
+    assert load_durations(tmp_path) == {"tests/test_a.py": 6.0}
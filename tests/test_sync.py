@@ -0,0 +1,146 @@
+"""Tests for framework file sync and its manifest fast path."""
+import json
+import os
+
+import beads.sync
+from beads.sync import MANIFEST_FILE, preview_sync, sync_fleet, sync_project
+
+
+def _project(root):
+    (root / ".beads").mkdir(parents=True)
+    (root / ".beads" / "ledger.json").write_text('{"beads": {}}')
+    return root
+
+
+def test_repeat_sync_is_a_no_op(tmp_path):
+    """A second sync with nothing changed updates nothing."""
+    project = _project(tmp_path)
+    updated = sync_project(project)
+    assert ".beads/bin/fsm.py" in updated
+    assert (project / MANIFEST_FILE).exists()
+    assert sync_project(project) == []
+
+
+def test_fast_path_skips_content_reads(tmp_path, monkeypatch):
+    """With the manifest current, no file content is hashed."""
+    project = _project(tmp_path)
+    sync_project(project)
+
+    def fail(path):
+        raise AssertionError(f"hashed {path}")
+
+    monkeypatch.setattr("beads.sync._hash_file", fail)
+    assert sync_project(project) == []
+
+
+def test_edited_file_is_restored(tmp_path):
+    """A project file changed on disk invalidates its manifest entry."""
+    project = _project(tmp_path)
+    sync_project(project)
+    protocol = project / ".beads" / "PROTOCOL.md"
+    original = protocol.read_text()
+    protocol.write_text("edited\n")
+
+    assert sync_project(project) == [".beads/PROTOCOL.md"]
+    assert protocol.read_text() == original
+
+
+def test_touched_but_identical_file_not_rewritten(tmp_path):
+    """A changed mtime alone forces a hash check, not a rewrite."""
+    project = _project(tmp_path)
+    sync_project(project)
+    protocol = project / ".beads" / "PROTOCOL.md"
+    st = protocol.stat()
+    os.utime(protocol, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert sync_project(project) == []
+
+
+def test_version_change_forces_full_check(tmp_path):
+    """A manifest from another package version is not trusted."""
+    project = _project(tmp_path)
+    sync_project(project)
+    manifest_path = project / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text())
+    manifest["version"] = "0.0.1"
+    manifest_path.write_text(json.dumps(manifest))
+    (project / ".beads" / "bin" / "router.py").write_text("stale\n")
+
+    assert sync_project(project) == [".beads/bin/router.py"]
+    assert json.loads(manifest_path.read_text())["version"] != "0.0.1"
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    """Dry runs report changes with line counts and leave the project alone."""
+    project = _project(tmp_path)
+    sync_project(project)
+    (project / ".beads" / "PROTOCOL.md").write_text("edited\n")
+
+    diffstat = preview_sync(project)
+    assert list(diffstat) == [".beads/PROTOCOL.md"]
+    added, removed = diffstat[".beads/PROTOCOL.md"]
+    assert added > 0 and removed == 1
+    assert (project / ".beads" / "PROTOCOL.md").read_text() == "edited\n"
+
+
+def test_fleet_sync_reports_per_project(tmp_path):
+    """Fleet sync syncs each project and records errors instead of raising."""
+    good = _project(tmp_path / "good")
+    missing = tmp_path / "missing"
+    missing.mkdir()
+
+    results = {r.project: r for r in sync_fleet([good, missing], jobs=2)}
+    assert results[good].error is None
+    assert ".beads/bin/fsm.py" in results[good].updated
+    assert results[missing].error == "Beads not initialized"
+
+
+def test_link_mode_keeps_hook_wiring_per_project(tmp_path, monkeypatch):
+    """Linking a project with the dispatcher never rewires other linked projects."""
+    monkeypatch.setattr("beads.shared.SHARED_ROOT", tmp_path / "shared")
+    plain, hooked = _project(tmp_path / "plain"), _project(tmp_path / "hooked")
+    settings_template = tmp_path / "settings.json"
+    settings_template.write_text(json.dumps({"hooks": {"PreToolUse": [{
+        "matcher": "Edit|Write",
+        "hooks": [{"type": "command", "command": ".claude/hooks/protect-files.sh"}],
+    }]}}))
+    sync_entries = beads.sync._sync_entries
+    monkeypatch.setattr(
+        "beads.sync._sync_entries",
+        lambda root: [*sync_entries(root), (".claude/settings.json", settings_template, None)],
+    )
+
+    monkeypatch.setattr("beads.sync.shutil.which", lambda name: None)
+    sync_project(plain, link=True)
+    plain_settings = (plain / ".claude" / "settings.json").read_text()
+
+    monkeypatch.setattr("beads.sync.shutil.which", lambda name: f"/usr/bin/{name}")
+    sync_project(hooked, link=True)
+    hooked_settings = hooked / ".claude" / "settings.json"
+
+    assert (hooked / ".beads" / "bin" / "fsm.py").is_symlink()
+    assert not hooked_settings.is_symlink()
+    assert "beads-hook" in hooked_settings.read_text()
+    assert "beads-hook" not in plain_settings
+    assert (plain / ".claude" / "settings.json").read_text() == plain_settings
+    assert sync_project(hooked) == []
+
+
+def test_sync_appends_missing_gitignore_entries(tmp_path):
+    """A .gitignore from an older init gains the newer entries and keeps its own lines."""
+    project = _project(tmp_path)
+    gitignore = project / ".gitignore"
+    gitignore.write_text("*.pyc\n# Beads framework runtime state\n.beads/fsm-state.json")
+
+    assert ".gitignore" in preview_sync(project)
+    assert ".gitignore" in sync_project(project)
+    lines = gitignore.read_text().splitlines()
+    assert lines[:3] == ["*.pyc", "# Beads framework runtime state", ".beads/fsm-state.json"]
+    assert lines.count("# Beads framework runtime state") == 1
+    for entry in (".beads/logs/", ".beads/results/", ".beads/jobs/", ".beads/worktrees/",
+                  ".beads/ledger.db*", ".beads/.guard-state", ".beads/telemetry/",
+                  ".beads/.sync-manifest.json"):
+        assert entry in lines
+
+    (project / MANIFEST_FILE).unlink()  # force a full re-check
+    assert ".gitignore" not in sync_project(project)
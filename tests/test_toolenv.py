@@ -0,0 +1,81 @@
+"""Tests for resolving the verification tool environment."""
+import pytest
+
+from beads.toolenv import FALLBACK, ToolEnv, fingerprint, resolve
+
+
+@pytest.fixture
+def no_uv(monkeypatch):
+    monkeypatch.setattr("shutil.which", lambda name: None)
+    monkeypatch.delenv("VIRTUAL_ENV", raising=False)
+
+
+def _venv(path):
+    (path / "bin").mkdir(parents=True)
+    (path / "bin" / "python").write_text("")
+    return path
+
+
+def test_fallback_without_environment(tmp_path, no_uv):
+    """Without uv or a virtualenv, commands keep the `uv run` prefix."""
+    env = resolve(tmp_path)
+    assert env.source == FALLBACK
+    assert not env.direct
+    assert env.is_current(tmp_path)
+
+
+def test_project_venv_beats_activated_venv(tmp_path, no_uv, monkeypatch):
+    """An unrelated activated venv never wins over the project's own .venv."""
+    other = _venv(tmp_path / "elsewhere")
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.setenv("VIRTUAL_ENV", str(other))
+    assert resolve(project).python == str(other / "bin" / "python")
+
+    _venv(project / ".venv")
+    env = resolve(project)
+    assert env.source == "venv"
+    assert env.python == str(project.resolve() / ".venv" / "bin" / "python")
+    assert env.is_current(project)
+    assert env.environ({"PATH": "/usr/bin"})["PATH"].startswith(env.bin)
+
+
+def test_fallback_goes_stale_when_venv_appears(tmp_path, no_uv):
+    """A .venv created after init is picked up on the next verify."""
+    env = resolve(tmp_path)
+    _venv(tmp_path / ".venv")
+    assert not env.is_current(tmp_path)
+    assert resolve(tmp_path).source == "venv"
+
+
+def test_fallback_goes_stale_when_uv_installed(tmp_path, no_uv, monkeypatch):
+    """Installing uv later invalidates a fallback resolved without it."""
+    env = resolve(tmp_path)
+    monkeypatch.setattr("shutil.which", lambda name: "/usr/bin/uv")
+    assert not env.is_current(tmp_path)
+
+    retried = ToolEnv(source=FALLBACK, fingerprint=fingerprint(tmp_path), uv=True)
+    assert retried.is_current(tmp_path)  # uv was already there: don't re-resolve every verify
+
+
+def test_activated_venv_goes_stale_when_project_venv_appears(tmp_path, no_uv, monkeypatch):
+    """A venv resolved from VIRTUAL_ENV yields to a later in-project .venv."""
+    monkeypatch.setenv("VIRTUAL_ENV", str(_venv(tmp_path / "elsewhere")))
+    project = tmp_path / "project"
+    project.mkdir()
+    env = resolve(project)
+    assert env.is_current(project)
+    _venv(project / ".venv")
+    assert not env.is_current(project)
+
+
+def test_fingerprint_change(tmp_path, no_uv):
+    """Editing pyproject.toml or uv.lock forces a re-resolve; a deleted interpreter too."""
+    python = _venv(tmp_path / ".venv") / "bin" / "python"
+    env = resolve(tmp_path)
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n")
+    assert not env.is_current(tmp_path)
+
+    env = resolve(tmp_path)
+    python.unlink()
+    assert not env.is_current(tmp_path)
@@ -0,0 +1,58 @@
+"""Tests for parsing and recording verification_cmd."""
+import json
+import os
+import sys
+from dataclasses import asdict
+
+from beads.engine import Engine, parse_verification_cmd
+from beads.toolenv import ToolEnv, fingerprint
+
+
+def test_single_command():
+    """One quoted command, in either quote style."""
+    assert parse_verification_cmd('verification_cmd: "pytest -q tests"\n') == "pytest -q tests"
+    assert parse_verification_cmd("verification_cmd: 'pytest -q'\n") == "pytest -q"
+    assert parse_verification_cmd("# Bead\nno command here\n") is None
+
+
+def test_inner_quotes_survive():
+    """A value ends at its own closing quote, not at the first quote of the other kind."""
+    content = 'verification_cmd: "python -c \'print(1)\'"\n'
+    assert parse_verification_cmd(content) == "python -c 'print(1)'"
+    content = "verification_cmd: 'grep -q \"ok\" out.txt'\n"
+    assert parse_verification_cmd(content) == 'grep -q "ok" out.txt'
+
+
+def test_named_checks():
+    """A block of named checks parses in file order, inner quotes included."""
+    content = (
+        "verification_cmd:  # run concurrently\n"
+        '  tests: "pytest tests/test_foo.py -q"\n'
+        "  lint: \"python -c 'print(1)'\"\n"
+        "  types: 'mypy src/foo.py'\n"
+        "\n"
+        "## Goal\n"
+    )
+    checks = parse_verification_cmd(content)
+    assert checks == {
+        "tests": "pytest tests/test_foo.py -q",
+        "lint": "python -c 'print(1)'",
+        "types": "mypy src/foo.py",
+    }
+    assert list(checks) == ["tests", "lint", "types"]
+
+
+def test_verify_records_the_command_it_ran(tmp_path):
+    """A command passed to verify (not in fsm-state.json) is what verify-all re-runs."""
+    (tmp_path / ".beads").mkdir()
+    ledger = {"version": 1, "beads": {"01-01": {"phase": "01", "status": "active"}}}
+    (tmp_path / ".beads" / "ledger.json").write_text(json.dumps(ledger))
+    env = ToolEnv(source="venv", fingerprint=fingerprint(tmp_path), python=sys.executable,
+                  bin=os.path.dirname(sys.executable))
+    state = {"bead_id": "01-01", "current_state": "execute", "retry_count": 0,
+             "initial_commit_sha": "", "tool_env": asdict(env)}
+    (tmp_path / ".beads" / "fsm-state.json").write_text(json.dumps(state))
+
+    engine = Engine(tmp_path)
+    assert engine.verify("python -c pass").passed
+    assert engine.load_ledger()["beads"]["01-01"]["verification_cmd"] == "python -c pass"
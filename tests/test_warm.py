@@ -0,0 +1,46 @@
+"""Tests for routing verification commands through warm servers."""
+import os
+import sys
+
+from beads import warm
+
+
+def _dmypy_up(root):
+    (root / warm.WARM_DIR).mkdir(parents=True)
+    (root / warm.DMYPY_STATUS).write_text("{}")
+
+
+def test_mypy_module_routes_to_daemon_module(tmp_path):
+    """`python -m mypy` becomes `python -m mypy.dmypy`, never the missing `-m dmypy`."""
+    _dmypy_up(tmp_path)
+    cmd, tool = warm.route("python -m mypy src", tmp_path)
+    assert tool == "mypy"
+    assert cmd == "python -m mypy.dmypy --status-file .beads/warm/dmypy.json run -- src"
+
+
+def test_mypy_executable_routes_to_dmypy(tmp_path):
+    """A bare or path-qualified mypy executable is swapped for dmypy beside it."""
+    _dmypy_up(tmp_path)
+    assert warm.route("mypy --strict src", tmp_path) == (
+        "dmypy --status-file .beads/warm/dmypy.json run -- --strict src", "mypy",
+    )
+    assert warm.route(".venv/bin/mypy src", tmp_path)[0].startswith(".venv/bin/dmypy ")
+
+
+def test_cold_without_servers(tmp_path):
+    """Without a running server, or for shell pipelines, commands run unchanged."""
+    assert warm.route("mypy src", tmp_path) == ("mypy src", None)
+    assert warm.route("pytest -q", tmp_path) == ("pytest -q", None)
+    _dmypy_up(tmp_path)
+    assert warm.route("mypy src && ruff check .", tmp_path) == ("mypy src && ruff check .", None)
+
+
+def test_pytest_routes_to_forkserver_client(tmp_path):
+    """A live pytest server with its socket turns pytest into the warm client."""
+    (tmp_path / warm.WARM_DIR).mkdir(parents=True)
+    (tmp_path / warm.PYTEST_PID).write_text(f"{os.getpid()}\n")
+    (tmp_path / warm.PYTEST_SOCKET).write_text("")
+    cmd, tool = warm.route("uv run pytest -q tests", tmp_path)
+    assert tool == "pytest"
+    assert cmd.startswith(sys.executable)
+    assert cmd.endswith(".beads/warm/pytest.sock pytest -q tests")
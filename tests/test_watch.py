@@ -0,0 +1,52 @@
+"""Tests for watch-mode test selection."""
+from beads.watch import affected_tests
+
+TESTS = ["tests/test_core.py", "tests/test_helpers.py", "tests/test_cli.py"]
+SOURCES = ["src/pkg/__init__.py", "src/pkg/core.py", "src/pkg/helpers.py", "src/pkg/cli.py",
+           "tests/conftest.py", *TESTS]
+
+
+def _project(root):
+    files = {
+        "src/pkg/__init__.py": "",
+        "src/pkg/core.py": "from .helpers import slugify\n",
+        "src/pkg/helpers.py": "def slugify(s):\n    return s\n",
+        "src/pkg/cli.py": "from pkg import core\n",
+        "src/pkg/orphan.py": "",
+        "tests/conftest.py": "",
+        "tests/test_core.py": "from pkg.core import run\n",
+        "tests/test_helpers.py": "import pkg.helpers\n",
+        "tests/test_cli.py": "from pkg import cli\n",
+    }
+    for path, text in files.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text(text)
+    return root
+
+
+def test_changed_test_file_runs_alone(tmp_path):
+    """An edited test file re-runs just that file."""
+    root = _project(tmp_path)
+    assert affected_tests(["tests/test_cli.py"], TESTS, root, SOURCES) == ["tests/test_cli.py"]
+
+
+def test_changed_module_follows_imports(tmp_path):
+    """helpers is imported by core, core by cli: every test above it re-runs."""
+    root = _project(tmp_path)
+    assert affected_tests(["src/pkg/helpers.py"], TESTS, root, SOURCES) == TESTS
+    assert affected_tests(["src/pkg/cli.py"], TESTS, root, SOURCES) == ["tests/test_cli.py"]
+
+
+def test_without_sources_only_direct_importers(tmp_path):
+    """With no other modules to follow, only tests importing the module itself run."""
+    root = _project(tmp_path)
+    assert affected_tests(["src/pkg/helpers.py"], TESTS, root) == ["tests/test_helpers.py"]
+
+
+def test_unmapped_changes_run_everything(tmp_path):
+    """conftest, non-Python files and modules no test reaches fall back to the full command."""
+    root = _project(tmp_path)
+    assert affected_tests(["tests/conftest.py"], TESTS, root, SOURCES) is None
+    assert affected_tests(["data/fixture.json"], TESTS, root, SOURCES) is None
+    assert affected_tests(["src/pkg/orphan.py"], TESTS, root, SOURCES) is None
+    assert affected_tests(["src/pkg/cli.py", "src/pkg/orphan.py"], TESTS, root, SOURCES) is None